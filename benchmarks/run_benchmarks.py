@@ -0,0 +1,353 @@
+# This file is part of Zoom Autojoiner GUI.
+
+# Zoom Autojoiner GUI is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# Zoom Autojoiner GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with Zoom Autojoiner GUI.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Zoom Autojoiner benchmark suite
+
+Seeds a temporary SQLite database with N meetings for every size asked
+for, times the scheduler, database and table-render hot paths against
+it, and writes the results as JSON so that runs on different commits
+can be compared.
+
+Usage:
+    python benchmarks/run_benchmarks.py --output before.json
+    python benchmarks/run_benchmarks.py --output after.json \\
+        --compare before.json
+
+The Tk benchmarks need a display. If DISPLAY is not set, a virtual X
+display is started with PyVirtualDisplay (and Xvfb), when installed;
+otherwise the Tk benchmarks are skipped.
+"""
+
+import os
+import sys
+import gc
+import json
+import random
+import tempfile
+import platform
+import argparse
+import subprocess
+import statistics
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Optional
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE_DIR = os.path.join(ROOT_DIR, "zoom_autojoiner_gui")
+
+#: list : The default table sizes.
+DEFAULT_SIZES = [10, 1000, 100000, 1000000]
+
+
+def start_virtual_display() -> Optional[Any]:
+    """start_virtual_display
+
+    Start a virtual X display if there is no display.
+
+    Returns:
+        The display object to stop at the end, or None.
+    """
+    if os.environ.get("DISPLAY") or platform.system() != "Linux":
+        return None
+    try:
+        from pyvirtualdisplay import Display
+        display = Display(visible=False, size=(1280, 1024))
+        display.start()
+        return display
+    except Exception as e:
+        print("No virtual display (%s), Tk benchmarks will be skipped" % e,
+            file=sys.stderr)
+        return None
+
+
+def time_it(func: Callable[[], Any], min_runs: int,
+        max_seconds: float) -> dict[str, Any]:
+    """time_it
+
+    Run a function at least `min_runs` times, and more while the total
+    is below `max_seconds`.
+
+    Returns:
+        dict: runs, min, median, mean and max, in seconds.
+    """
+    samples = []
+    total = 0.0
+    gc.collect()
+    while len(samples) < min_runs or total < max_seconds:
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        samples.append(elapsed)
+        total += elapsed
+        if len(samples) >= 1000:
+            break
+    return {
+        "runs" : len(samples),
+        "min" : min(samples),
+        "median" : statistics.median(samples),
+        "mean" : statistics.fmean(samples),
+        "max" : max(samples)
+    }
+
+
+def seed(dbh: Any, size: int, now: datetime) -> None:
+    """Fill the database with `size` meetings spread over a year."""
+    rng = random.Random(size)
+    chunk = []
+    for i in range(size):
+        chunk.append({
+            "mtg_id" : str(10 ** 9 + i),
+            "mtg_password" : "pw%d" % i,
+            "mtg_time" : now + timedelta(minutes=rng.randrange(-262800,
+                262800))
+        })
+        if len(chunk) == 10000:
+            dbh.add_mtgs(chunk)
+            chunk = []
+    dbh.add_mtgs(chunk)
+    dbh.commit_changes()
+
+
+def run_size(size: int, args: argparse.Namespace,
+        tk_root: Optional[Any]) -> list[dict[str, Any]]:
+    """run_size
+
+    Run every benchmark against a table of `size` meetings.
+
+    Returns:
+        list: One result dict per benchmark.
+    """
+    from zoom_autojoiner_gui.controllers import (DatabaseHandler, Autojoiner,
+        MeetingCache)
+    from zoom_autojoiner_gui.scheduler import MeetingScheduler
+
+    results = []
+
+    def record(name: str, func: Callable[[], Any]) -> None:
+        timing = time_it(func, args.min_runs, args.max_seconds)
+        timing.update({"benchmark" : name, "size" : size})
+        results.append(timing)
+        print("%-54s %9d  median %10.6f s  (%d runs)" % (name, size,
+            timing["median"], timing["runs"]), file=sys.stderr)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_uri = "sqlite:///" + os.path.join(tmp_dir, "bench.db")
+        # The read cache is off, so the reads hit the database every run.
+        dbh = DatabaseHandler(db_uri, cache_size=0)
+        now = datetime.now()
+
+        start = time.perf_counter()
+        seed(dbh, size, now)
+        results.append({"benchmark" : "seed", "size" : size, "runs" : 1,
+            "min" : time.perf_counter() - start})
+        results[-1].update({key: results[-1]["min"] for key in
+            ("median", "mean", "max")})
+
+        ids = [mtg["id"] for mtg in dbh.get_next_mtgs(now, 100)] or [1]
+        rng = random.Random(0)
+
+        autojoiner = Autojoiner(dbh=dbh)
+        scheduler = MeetingScheduler(dbh)
+
+        record("Autojoiner.check_for_meeting", autojoiner.check_for_meeting)
+        record("DatabaseHandler.get_mtg_data_to_list",
+            dbh.get_mtg_data_to_list)
+        record("DatabaseHandler.get_single_mtg_data_to_list",
+            lambda: dbh.get_single_mtg_data_to_list(rng.choice(ids)))
+        record("DatabaseHandler.get_next_mtgs",
+            lambda: dbh.get_next_mtgs(now, 64))
+        record("MeetingScheduler.reload", scheduler.reload)
+
+        # The same reads served from a warm cache, as separate series.
+        DatabaseHandler.caches[db_uri] = MeetingCache()
+        cached_dbh = DatabaseHandler(db_uri)
+        cached_dbh.get_mtg_data_to_list()
+        for record_id in ids:
+            cached_dbh.get_single_mtg_data_to_list(record_id)
+        record("DatabaseHandler.get_mtg_data_to_list (cached)",
+            cached_dbh.get_mtg_data_to_list)
+        record("DatabaseHandler.get_single_mtg_data_to_list (cached)",
+            lambda: cached_dbh.get_single_mtg_data_to_list(rng.choice(ids)))
+
+        if tk_root is not None:
+            from zoom_autojoiner_gui.views import MeetingListFrame
+            # No snapshot: it would replace the user's, and its JSON 
+            # dump is not part of a render.
+            frame = MeetingListFrame(tk_root, autojoiner_handle=autojoiner,
+                dbh=dbh, snapshot_file=None)
+            frame.grid(row=0, column=0)
+
+            def populate() -> None:
+                frame.populate_table_from_db()
+                tk_root.update_idletasks()
+
+            record("MeetingListFrame.populate_table_from_db", populate)
+            frame.destroy()
+            tk_root.update()
+
+        # Release the pooled connections before the file goes away.
+        from zoom_autojoiner_gui.models import get_session, get_engine
+        get_session(db_uri).remove()
+        get_engine(db_uri).dispose()
+        DatabaseHandler.caches.pop(db_uri, None)
+
+    return results
+
+
+def run_join(args: argparse.Namespace) -> list[dict[str, Any]]:
+    """run_join
+
+    Time Autojoiner.join_zm_mtg against the fake Zoom client of
+    FakeDriver, with no latencies, so the join logic itself is measured,
+    in the GUI and the URI join modes. No display or Zoom client is
+    needed.
+
+    Returns:
+        list: One result dict per join mode.
+    """
+    from zoom_autojoiner_gui.controllers import DatabaseHandler, Autojoiner
+    from zoom_autojoiner_gui.drivers import FakeDriver
+    from zoom_autojoiner_gui.tracing import TraceRing
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_uri = "sqlite:///" + os.path.join(tmp_dir, "bench.db")
+        autojoiner = Autojoiner("pics", type_interval=0.0, poll_interval=0.0,
+            dbh=DatabaseHandler(db_uri), driver=FakeDriver.zoom_client(),
+            join_mode="gui")
+        # Keep the benchmark's joins out of the real traces.
+        autojoiner.traces = TraceRing(os.path.join(tmp_dir, "traces"))
+
+        def join() -> None:
+            if not autojoiner.join_zm_mtg("1234567890", "pw"):
+                raise RuntimeError("The fake join failed")
+
+        results = []
+        for join_mode in autojoiner.JOIN_MODES:
+            autojoiner.join_mode = join_mode
+            timing = time_it(join, args.min_runs, args.max_seconds)
+            timing.update({"benchmark" : "Autojoiner.join_zm_mtg (fake, %s)"
+                % join_mode, "size" : 0})
+            print("%-54s %9s  median %10.6f s  (%d runs)" % (
+                timing["benchmark"], "-", timing["median"], timing["runs"]),
+                file=sys.stderr)
+            results.append(timing)
+
+        from zoom_autojoiner_gui.models import get_session, get_engine
+        get_session(db_uri).remove()
+        get_engine(db_uri).dispose()
+
+    return results
+
+
+def git_commit() -> Optional[str]:
+    """The current git commit of the repository, if any."""
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"],
+            cwd=ROOT_DIR, stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+
+def compare(results: list[dict], baseline_file: str) -> None:
+    """Print the median of every benchmark against a baseline run."""
+    with open(baseline_file, "r") as handle:
+        baseline = {(res["benchmark"], res["size"]): res
+            for res in json.load(handle)["results"]}
+    print("\n%-54s %9s %12s %12s %8s" % ("benchmark", "size", "baseline",
+        "current", "ratio"), file=sys.stderr)
+    for res in results:
+        old = baseline.get((res["benchmark"], res["size"]))
+        if old:
+            print("%-54s %9d %12.6f %12.6f %7.2fx" % (res["benchmark"],
+                res["size"], old["median"], res["median"],
+                res["median"] / old["median"] if old["median"] else 0),
+                file=sys.stderr)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+        help="Comma separated table sizes (default: %(default)s)")
+    parser.add_argument("--min-runs", type=int, default=3,
+        help="Runs per benchmark at least (default: %(default)s)")
+    parser.add_argument("--max-seconds", type=float, default=1.0,
+        help="Keep repeating a benchmark until this much time was spent "
+            "(default: %(default)s)")
+    parser.add_argument("--no-tk", action="store_true",
+        help="Skip the Tk benchmarks")
+    parser.add_argument("--output", default="-",
+        help="JSON output file, - for stdout (default)")
+    parser.add_argument("--compare", metavar="BASELINE",
+        help="A previous JSON output to compare against")
+    args = parser.parse_args()
+
+    display = None if args.no_tk else start_virtual_display()
+
+    # Paths are relative to where we were started.
+    if args.output != "-":
+        args.output = os.path.abspath(args.output)
+    if args.compare:
+        args.compare = os.path.abspath(args.compare)
+
+    # The package reads its config relative to the working directory.
+    os.chdir(PACKAGE_DIR)
+    sys.path.insert(0, ROOT_DIR)
+
+    tk_root = None
+    if not args.no_tk:
+        try:
+            import tkinter as tk
+            tk_root = tk.Tk()
+        except Exception as e:
+            print("Tk unavailable (%s), Tk benchmarks will be skipped" % e,
+                file=sys.stderr)
+
+    results = []
+    try:
+        for size in (int(size) for size in args.sizes.split(",")):
+            results.extend(run_size(size, args, tk_root))
+        results.extend(run_join(args))
+    finally:
+        if tk_root is not None:
+            tk_root.destroy()
+        if display is not None:
+            display.stop()
+
+    import sqlalchemy
+    output = {
+        "meta" : {
+            "commit" : git_commit(),
+            "date" : datetime.now().isoformat(timespec="seconds"),
+            "python" : platform.python_version(),
+            "sqlalchemy" : sqlalchemy.__version__,
+            "platform" : platform.platform(),
+            "tk" : tk_root is not None
+        },
+        "results" : results
+    }
+    if args.output == "-":
+        json.dump(output, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, "w") as handle:
+            json.dump(output, handle, indent=2)
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
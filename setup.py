@@ -4,6 +4,7 @@ setup(
     name='zoom_autojoiner_gui',
     packages=['zoom_autojoiner_gui'],
     include_package_data=True,
+    python_requires='>=3.10',
     install_requires=[
 		'sqlalchemy',
 		'pyautogui',
@@ -0,0 +1,54 @@
+# This file is part of Zoom Autojoiner GUI.
+
+# Zoom Autojoiner GUI is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# Zoom Autojoiner GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with Zoom Autojoiner GUI.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+import sys
+
+import pytest
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The package reads its config relative to the working directory.
+sys.path.insert(0, ROOT_DIR)
+os.chdir(os.path.join(ROOT_DIR, "zoom_autojoiner_gui"))
+
+
+@pytest.fixture
+def db_uri(tmp_path):
+    """The URI of an empty SQLite database file, which is forgotten by
+    the process-wide registries afterwards."""
+    from zoom_autojoiner_gui.controllers import DatabaseHandler
+    from zoom_autojoiner_gui.models import get_engine, get_session
+
+    uri = "sqlite:///" + str(tmp_path / "test.db")
+    yield uri
+    get_session(uri).remove()
+    get_engine(uri).dispose()
+    DatabaseHandler.caches.pop(uri, None)
+    DatabaseHandler.synced_revisions.pop(uri, None)
+    DatabaseHandler.pruned_at.pop(uri, None)
+
+
+@pytest.fixture
+def changes():
+    """The (action, record_id) pairs passed to the change listeners."""
+    from zoom_autojoiner_gui.controllers import DatabaseHandler
+
+    seen = []
+    listener = lambda action, record_id: seen.append((action, record_id))
+    DatabaseHandler.add_change_listener(listener)
+    yield seen
+    DatabaseHandler.remove_change_listener(listener)
@@ -0,0 +1,64 @@
+# This file is part of Zoom Autojoiner GUI.
+
+# Zoom Autojoiner GUI is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# Zoom Autojoiner GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with Zoom Autojoiner GUI.  If not, see <https://www.gnu.org/licenses/>.
+
+import pytest
+
+from zoom_autojoiner_gui.controllers import ATLError, ATLParser, Autojoiner
+
+
+def script(*operations) -> dict:
+    """A script with one step doing `operations`."""
+    return {"steps" : [{"step" : "join", "do" : list(operations)}]}
+
+
+def test_compile():
+    plan = ATLParser.compile(script(["click", "a.png", 2], ["wait", "b.png"],
+        ["write", "{mtg_id} {{x}}"], ["hotkey", "ctrl", "a"]))
+    assert plan.images == ("a.png", "b.png")
+    click, wait, write, hotkey = plan.steps[0].instructions
+    assert click.args == ("a.png", 2.0)
+    assert write.args == ((("", "mtg_id"), (" {", None), ("x}", None)),)
+    assert hotkey.args == ("ctrl", "a")
+
+
+def test_packaged_script_compiles():
+    assert ATLParser.load(Autojoiner.DEFAULT_SCRIPT).steps
+
+
+@pytest.mark.parametrize("source", [
+    "{not json",
+    {"steps" : []},
+    ["click", "a.png"],
+    {"steps" : [{"do" : []}]},
+    script(["drag", "a.png"]),
+    script(["click"]),
+    script(["press", "a", "b"]),
+    script(["click", "a.png", -1]),
+    script(["sleep", True]),
+    script(["write", ""]),
+    script(["write", "{meeting}"]),
+    script(["write", "{mtg_id!r}"]),
+    script(["write", "{mtg_id:>5}"]),
+    script(["write", "{mtg_id"]),
+])
+def test_invalid_scripts(source):
+    with pytest.raises(ATLError):
+        ATLParser.compile(source)
+
+
+def test_load_caches_by_content(tmp_path):
+    path = tmp_path / "join.atl"
+    path.write_text('{"steps": [{"step": "s", "do": [["press", "a"]]}]}')
+    assert ATLParser.load(str(path)) is ATLParser.load(str(path))
@@ -0,0 +1,73 @@
+# This file is part of Zoom Autojoiner GUI.
+
+# Zoom Autojoiner GUI is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# Zoom Autojoiner GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with Zoom Autojoiner GUI.  If not, see <https://www.gnu.org/licenses/>.
+
+from datetime import datetime
+
+import pytest
+
+from zoom_autojoiner_gui.controllers import DatabaseHandler, MeetingCache
+
+
+def test_lru_eviction():
+    cache = MeetingCache(2)
+    for key in ("a", "b", "a", "c"):
+        cache.get(key, lambda: key.upper())
+    assert cache.get("b", lambda: "reloaded") == "reloaded"
+    assert cache.info() == {"hits" : 1, "misses" : 4, "size" : 2, 
+        "max_size" : 2}
+
+
+def test_value_loaded_during_invalidation_is_not_kept():
+    cache = MeetingCache()
+
+    def load():
+        cache.invalidate("key") # E.g. a commit on another thread
+        return "stale"
+
+    assert cache.get("key", load) == "stale"
+    assert cache.get("key", lambda: "fresh") == "fresh"
+
+
+def test_commit_invalidates(db_uri):
+    dbh = DatabaseHandler(db_uri)
+    dbh.add_mtg("1", "pw", datetime(2026, 1, 1))
+    assert dbh.get_single_mtg_data_to_list(1).mtg_id == "1"
+    assert len(dbh.get_mtg_data_to_list()) == 1
+
+    dbh.update_mtg(1, "2", "pw", datetime(2026, 1, 1), auto_commit=False)
+    # Uncommitted writes bypass the cache.
+    assert dbh.get_single_mtg_data_to_list(1).mtg_id == "2"
+    dbh.commit_changes()
+    assert dbh.get_single_mtg_data_to_list(1).mtg_id == "2"
+    dbh.add_mtg("3", "pw", datetime(2026, 1, 2))
+    assert [mtg.mtg_id for mtg in dbh.get_mtg_data_to_list()] == ["2", "3"]
+
+
+def test_rollback_clears(db_uri):
+    dbh = DatabaseHandler(db_uri)
+    dbh.add_mtg("1", "pw", datetime(2026, 1, 1))
+    dbh.get_mtg_data_to_list()
+    dbh.delete_mtg(1, auto_commit=False)
+    assert dbh.get_mtg_data_to_list() == []
+    dbh.rollback_changes()
+    assert len(dbh.get_mtg_data_to_list()) == 1
+
+
+def test_failed_write_rolls_back(db_uri):
+    dbh = DatabaseHandler(db_uri)
+    with pytest.raises(Exception):
+        dbh.delete_mtg(42)
+    dbh.add_mtg("1", "pw", datetime(2026, 1, 1))
+    assert len(dbh.get_mtg_data_to_list()) == 1
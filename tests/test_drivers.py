@@ -0,0 +1,79 @@
+# This file is part of Zoom Autojoiner GUI.
+
+# Zoom Autojoiner GUI is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# Zoom Autojoiner GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with Zoom Autojoiner GUI.  If not, see <https://www.gnu.org/licenses/>.
+
+import pytest
+
+from zoom_autojoiner_gui.drivers import FakeDriver, make_driver
+
+
+def test_shown_images_are_located():
+    driver = FakeDriver()
+    driver.show("a.png", (10, 20, 30, 40))
+    assert driver.locate("a.png") == (10, 20, 30, 40)
+    assert driver.locate("b.png") is None
+    driver.hide("a.png")
+    assert driver.locate("a.png") is None
+
+
+def test_locate_inside_region():
+    driver = FakeDriver()
+    driver.show("a.png", (10, 20, 30, 40))
+    assert driver.locate("a.png", region=(0, 0, 100, 100)) is not None
+    assert driver.locate("a.png", region=(20, 0, 100, 100)) is None
+
+
+def test_images_shown_after_a_delay():
+    driver = FakeDriver()
+    driver.show("a.png", (0, 0, 10, 10), delay=60.0)
+    assert driver.locate("a.png") is None
+
+
+def test_click_shows_the_next_screen():
+    driver = FakeDriver()
+    driver.show("a.png", (0, 0, 10, 10))
+    driver.on_click("a.png", "b.png", (50, 50, 10, 10))
+    driver.click(50, 50)
+    assert driver.locate("b.png") is None
+    driver.click(5, 5)
+    assert driver.locate("b.png") == (50, 50, 10, 10)
+    assert driver.actions == [("click", 50, 50), ("click", 5, 5)]
+
+
+def test_latencies_are_slept():
+    slept = []
+    driver = FakeDriver(locate_latency=0.1, click_latency=0.2,
+        key_latency=0.01, sleep=slept.append)
+    driver.locate("a.png")
+    driver.click(0, 0)
+    driver.write("abc", interval=0.05)
+    driver.press("enter")
+    assert slept == [0.1, 0.2, pytest.approx(0.15), 0.01]
+
+
+def test_open_uri_is_recorded():
+    driver = FakeDriver()
+    assert driver.open_uri("zoommtg://x")
+    driver.uri_handled = False
+    assert not driver.open_uri("zoommtg://y")
+    assert driver.actions == [("open_uri", "zoommtg://x"),
+        ("open_uri", "zoommtg://y")]
+
+
+def test_make_driver():
+    driver = make_driver("fake")
+    assert isinstance(driver, FakeDriver)
+    assert driver.locate(driver.load_template("pics/zoom_taskbar.png"))
+    with pytest.raises(ValueError):
+        make_driver("nope")
@@ -0,0 +1,70 @@
+# This file is part of Zoom Autojoiner GUI.
+
+# Zoom Autojoiner GUI is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# Zoom Autojoiner GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with Zoom Autojoiner GUI.  If not, see <https://www.gnu.org/licenses/>.
+
+import pytest
+
+from zoom_autojoiner_gui import constants
+from zoom_autojoiner_gui.controllers import Autojoiner, DatabaseHandler
+from zoom_autojoiner_gui.drivers import FakeDriver
+from zoom_autojoiner_gui.tracing import TraceRing
+
+
+@pytest.fixture
+def autojoiner(db_uri, tmp_path):
+    """An Autojoiner on the fake Zoom client, with the packaged script."""
+    autojoiner = Autojoiner("pics", type_interval=0.0, poll_interval=0.0,
+        step_timeout=1.0, dbh=DatabaseHandler(db_uri), 
+        driver=FakeDriver.zoom_client(), script="")
+    autojoiner.traces = TraceRing(str(tmp_path / "traces"))
+    return autojoiner
+
+
+def test_gui_is_the_default(autojoiner):
+    assert autojoiner.join_mode == "gui"
+
+
+def test_uri_join(autojoiner):
+    autojoiner.join_mode = "uri"
+    assert autojoiner.join_zm_mtg("123 456-789", "pw")
+    assert autojoiner.driver.actions == [("open_uri", 
+        autojoiner.build_join_uri("123 456-789", "pw"))]
+    assert "confno=123456789" in autojoiner.driver.actions[0][1]
+
+
+def test_uri_join_falls_back_to_gui(autojoiner):
+    autojoiner.join_mode = "uri"
+    autojoiner.driver.uri_handled = False
+    assert autojoiner.join_zm_mtg("123", "pw")
+    assert ("write", "pw") in autojoiner.driver.actions
+
+
+def test_gui_join(autojoiner):
+    autojoiner.join_mode = "gui"
+    assert autojoiner.join_zm_mtg("123", "pw")
+    actions = autojoiner.driver.actions
+    assert [action for action in actions if action[0] == "write"] == [
+        ("write", "123"), ("write", constants.MY_NAME), ("write", "pw")]
+    assert all(action[0] != "open_uri" for action in actions)
+    [trace] = autojoiner.traces.load()
+    assert trace["ok"] and [step["name"] for step in trace["steps"]][-1] \
+        == "submit_password"
+
+
+def test_gui_join_fails_without_zoom(autojoiner):
+    autojoiner.join_mode = "gui"
+    autojoiner.step_timeout = 0.05
+    autojoiner.driver.hide("zoom_taskbar.png")
+    assert not autojoiner.join_zm_mtg("123", "pw")
+    assert autojoiner.traces.load()[0]["ok"] is False
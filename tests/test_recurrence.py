@@ -0,0 +1,95 @@
+# This file is part of Zoom Autojoiner GUI.
+
+# Zoom Autojoiner GUI is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# Zoom Autojoiner GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with Zoom Autojoiner GUI.  If not, see <https://www.gnu.org/licenses/>.
+
+from datetime import datetime
+from itertools import islice
+
+import pytest
+
+from zoom_autojoiner_gui.models import SeriesRecord
+from zoom_autojoiner_gui.recurrence import (
+    check_series,
+    iter_occurrences,
+    merge_occurrences
+)
+
+
+def series(frequency="daily", start=datetime(2026, 1, 5, 9), interval=1,
+        weekdays="", until=None, exceptions="", id=1) -> SeriesRecord:
+    """A series starting on Monday, 5 January 2026, at 9:00."""
+    return SeriesRecord(id, "ZM", "123", "pw", start, frequency, interval,
+        weekdays, until, exceptions)
+
+
+def take(occurrences, count=5) -> list:
+    return list(islice(occurrences, count))
+
+
+def test_daily():
+    assert take(iter_occurrences(series(interval=2)), 3) == [
+        datetime(2026, 1, 5, 9), datetime(2026, 1, 7, 9),
+        datetime(2026, 1, 9, 9)]
+
+
+def test_daily_starts_after():
+    # 10:00 on the 7th is past that day's occurrence.
+    assert take(iter_occurrences(series(interval=2), 
+        datetime(2026, 1, 7, 10)), 2) == [datetime(2026, 1, 9, 9), 
+        datetime(2026, 1, 11, 9)]
+
+
+def test_weekly():
+    assert take(iter_occurrences(series("weekly", weekdays="0,2"), 
+        datetime(2026, 1, 6)), 3) == [datetime(2026, 1, 7, 9), 
+        datetime(2026, 1, 12, 9), datetime(2026, 1, 14, 9)]
+
+
+def test_weekly_interval_defaults_to_start_day():
+    assert take(iter_occurrences(series("weekly", interval=2)), 3) == [
+        datetime(2026, 1, 5, 9), datetime(2026, 1, 19, 9),
+        datetime(2026, 2, 2, 9)]
+
+
+def test_exceptions_are_skipped():
+    assert take(iter_occurrences(series(
+        exceptions="2026-01-06,2026-01-08")), 3) == [
+        datetime(2026, 1, 5, 9), datetime(2026, 1, 7, 9),
+        datetime(2026, 1, 9, 9)]
+
+
+@pytest.mark.parametrize("frequency", ["daily", "weekly"])
+def test_until_ends_the_series(frequency):
+    until = datetime(2026, 1, 19, 9)
+    occurrences = list(iter_occurrences(series(frequency, until=until)))
+    assert occurrences[-1] == until
+    assert len(occurrences) == (15 if frequency == "daily" else 3)
+
+
+def test_merge_skips_broken_series():
+    merged = merge_occurrences([series(id=1), series("hourly", id=2)],
+        datetime(2026, 1, 5), limit=2)
+    assert [mtg.series_id for mtg in merged] == [1, 1]
+
+
+@pytest.mark.parametrize("fields", [
+    ("hourly", 1, "", ""),
+    ("daily", 0, "", ""),
+    ("weekly", 1, "0,7", ""),
+    ("daily", 1, "0,2", ""),
+    ("daily", 1, "", "2026-02-30"),
+])
+def test_check_series_refuses(fields):
+    with pytest.raises(ValueError):
+        check_series(*fields)
@@ -0,0 +1,88 @@
+# This file is part of Zoom Autojoiner GUI.
+
+# Zoom Autojoiner GUI is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# Zoom Autojoiner GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with Zoom Autojoiner GUI.  If not, see <https://www.gnu.org/licenses/>.
+
+from datetime import datetime, timedelta
+
+from zoom_autojoiner_gui import controllers
+from zoom_autojoiner_gui.controllers import Autojoiner, DatabaseHandler
+from zoom_autojoiner_gui.drivers import FakeDriver
+from zoom_autojoiner_gui.scheduler import MeetingScheduler
+
+
+NOW = datetime(2026, 3, 2, 10)
+
+
+def test_pop_due(db_uri):
+    dbh = DatabaseHandler(db_uri)
+    for minutes in (-5, -0.5, 0, 3):
+        dbh.add_mtg(str(minutes), "pw", NOW + timedelta(minutes=minutes))
+    scheduler = MeetingScheduler(dbh)
+    scheduler.reload(NOW)
+
+    # The meeting 5 minutes ago is past the grace period, so not loaded.
+    assert scheduler.next_due() == NOW - timedelta(minutes=0.5)
+    assert [mtg.mtg_id for mtg in scheduler.pop_due(NOW)] == ["-0.5", "0"]
+    assert scheduler.pop_due(NOW) == []
+    assert scheduler.seconds_until_next(NOW) == 3 * 60
+
+
+def test_pop_due_skips_meetings_past_grace(db_uri):
+    dbh = DatabaseHandler(db_uri)
+    dbh.add_mtg("1", "pw", NOW - timedelta(minutes=1))
+    scheduler = MeetingScheduler(dbh, grace=30)
+    # Loaded while the meeting was still within the grace period.
+    scheduler.reload(NOW - timedelta(minutes=1))
+    assert scheduler.pop_due(NOW) == []
+
+
+def test_reload_does_not_fire_twice(db_uri):
+    dbh = DatabaseHandler(db_uri)
+    dbh.add_mtg("1", "pw", NOW)
+    scheduler = MeetingScheduler(dbh)
+    scheduler.reload(NOW)
+    assert len(scheduler.pop_due(NOW)) == 1
+
+    # A meeting edited inside the grace window reloads the scheduler.
+    dbh.add_mtg("2", "pw", NOW)
+    scheduler.reload(NOW + timedelta(seconds=10))
+    assert [mtg.mtg_id for mtg in scheduler.pop_due(
+        NOW + timedelta(seconds=10))] == ["2"]
+
+
+def test_recurring_meetings_fire_once_per_occurrence(db_uri):
+    dbh = DatabaseHandler(db_uri)
+    dbh.add_series("1", "pw", NOW - timedelta(days=1), "daily")
+    scheduler = MeetingScheduler(dbh)
+    scheduler.reload(NOW)
+    assert [mtg.mtg_time for mtg in scheduler.pop_due(NOW)] == [NOW]
+    scheduler.reload(NOW)
+    assert scheduler.pop_due(NOW) == []
+    assert scheduler.next_due() == NOW + timedelta(days=1)
+
+
+def test_check_for_meeting(db_uri, monkeypatch):
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return NOW + timedelta(seconds=30)
+    monkeypatch.setattr(controllers, "datetime", FrozenDatetime)
+    dbh = DatabaseHandler(db_uri)
+    autojoiner = Autojoiner("pics", dbh=dbh, driver=FakeDriver())
+    assert autojoiner.check_for_meeting() is False
+
+    # Found even when a later meeting comes after it.
+    dbh.add_mtg("1", "pw", NOW)
+    dbh.add_mtg("2", "pw", NOW + timedelta(minutes=1))
+    assert autojoiner.check_for_meeting().mtg_id == "1"
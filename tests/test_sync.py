@@ -0,0 +1,102 @@
+# This file is part of Zoom Autojoiner GUI.
+
+# Zoom Autojoiner GUI is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# Zoom Autojoiner GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with Zoom Autojoiner GUI.  If not, see <https://www.gnu.org/licenses/>.
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from zoom_autojoiner_gui.controllers import DatabaseHandler
+from zoom_autojoiner_gui.models import MeetingChanges, get_session
+
+
+@pytest.fixture
+def remote(db_uri, monkeypatch):
+    """A handler whose changes look like another process's."""
+    local = DatabaseHandler(db_uri)
+    local.sync_changes() # Records the current revision
+    
+    class Remote():
+        def __getattr__(self, name):
+            method = getattr(local, name)
+            def call(*args, **kwargs):
+                with monkeypatch.context() as patch:
+                    patch.setattr(DatabaseHandler, "CLIENT_ID", "remote")
+                    return method(*args, **kwargs)
+            return call
+    return Remote()
+
+
+def test_first_sync_only_records_the_revision(db_uri, changes):
+    dbh = DatabaseHandler(db_uri)
+    dbh.add_mtg("1", "pw", datetime(2026, 1, 1))
+    changes.clear()
+    assert dbh.sync_changes() == 0
+    assert changes == []
+
+
+def test_own_changes_are_not_passed_twice(db_uri, remote, changes):
+    dbh = DatabaseHandler(db_uri)
+    dbh.add_mtg("1", "pw", datetime(2026, 1, 1))
+    assert changes == [("add", 1)]
+    assert dbh.sync_changes() == 0
+
+
+def test_changes_are_merged(db_uri, remote, changes):
+    remote.add_mtg("1", "pw", datetime(2026, 1, 1))
+    remote.add_mtg("2", "pw", datetime(2026, 1, 1))
+    remote.update_mtg(1, "1", "new", datetime(2026, 1, 2))
+    remote.delete_mtg(2)
+    remote.add_series("3", "pw", datetime(2026, 1, 1), "daily")
+    changes.clear()
+
+    dbh = DatabaseHandler(db_uri)
+    assert dbh.sync_changes() == 3
+    assert changes == [("update", 1), ("delete", 2), ("series_add", 1)]
+    assert dbh.get_single_mtg_data_to_list(1).mtg_password == "new"
+
+
+def test_truncate_drops_earlier_meeting_changes(db_uri, remote, changes):
+    remote.add_series("3", "pw", datetime(2026, 1, 1), "daily")
+    remote.add_mtg("1", "pw", datetime(2026, 1, 1))
+    remote.truncate_table()
+    remote.add_mtg("2", "pw", datetime(2026, 1, 1))
+    changes.clear()
+
+    DatabaseHandler(db_uri).sync_changes()
+    assert [action for action, _ in changes] == ["series_add", "truncate",
+        "add"]
+
+
+def test_too_many_changes_reload_everything(db_uri, remote, changes):
+    for number in range(3):
+        remote.add_mtg(str(number), "pw", datetime(2026, 1, 1))
+    changes.clear()
+    assert DatabaseHandler(db_uri).sync_changes(limit=2) == 1
+    assert changes == [("truncate", None)]
+
+
+def test_pruned_changes_reload_everything(db_uri, remote, changes):
+    dbh = DatabaseHandler(db_uri)
+    for number in range(3):
+        remote.add_mtg(str(number), "pw", datetime(2026, 1, 1))
+    session = get_session(db_uri)
+    session.query(MeetingChanges).update({"changed_at" : datetime.now()
+        - timedelta(days=90)})
+    session.commit()
+    assert dbh.prune_changes(30) == 2 # The newest one is kept
+    changes.clear()
+
+    assert dbh.sync_changes() == 1
+    assert changes == [("truncate", None)]
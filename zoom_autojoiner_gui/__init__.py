@@ -1,31 +1,68 @@
+import sys
 import logging
-from datetime import datetime
+import argparse
 # from multiprocessing import Process
 
-# I am here because the ZAJ module has some logging work to do..
-# Check that my level is set to logging.INFO
-logging.basicConfig(filename='logs/%s.log' % (datetime.now().strftime("%Y%m"
-    "%d-%H%M%S")), filemode='w', format=('[%(asctime)s] [%(name)s:%(levelna'
-    'me)s] [pid:%(process)d, tid:%(thread)d] %(message)s'), datefmt='%c', 
-    level=logging.DEBUG)
-
-from zoom_autojoiner_gui.views import MainWindow
-from zoom_autojoiner_gui.extensions import ExtensionHandler
-from zoom_autojoiner_gui.constants import EXTENSIONS
+# Imported first, so that start-up is timed from here.
+from zoom_autojoiner_gui.startup import TIMER
 
 logger = logging.getLogger(__name__) # This creates logger for this file.
 
+_process_set_up = False # Set once the log file and metrics are set up.
+
+
+def configure_logging() -> None:
+    """configure_logging
+
+    Set up the log file, with the level from application.ini. Done in
+    setup_process() rather than at import, so that importing the package
+    does not create a log file.
+    """
+    from zoom_autojoiner_gui import constants
+    from zoom_autojoiner_gui.logsetup import configure_logging as configure
+    configure(constants.LOG_LEVEL, constants.LOG_DIR, 
+        constants.LOG_RATE_LIMIT)
+
+
+def start_metrics():
+    """start_metrics
+
+    Export the metrics as configured in the [metrics] section.
+    """
+    from zoom_autojoiner_gui import constants
+    from zoom_autojoiner_gui.metrics import start_exporter
+    start_exporter(constants.METRICS_PORT, constants.METRICS_FILE,
+        constants.METRICS_INTERVAL)
+
+
+def setup_process() -> None:
+    """setup_process
+
+    Set up logging and the metrics exporter, once per process. Every
+    entry point calls this: main(), and MainWindow for the scripts that
+    build the window directly.
+    """
+    global _process_set_up
+    if _process_set_up:
+        return
+    _process_set_up = True
+    configure_logging()
+    start_metrics()
+
+
 def load_window():
     """load_window
 
     Load the Main Window
 
-    Load the main Tk window. The reason this is here 
+    Load the main Tk window. The reason this is here
     is because a new process will be started to
     launch the Tk window.
     """
     try:
         # logger.info('Attempting to initialise Window')
+        from zoom_autojoiner_gui.views import MainWindow
+        TIMER.mark("views imported")
         window = MainWindow() # Launch the Main Window.
     except:
         logger.error("Failed to initialise window, exiting...", exc_info=True)
@@ -36,12 +73,52 @@ def load_window():
     window.mainloop()
 
 
+def parse_args(argv: list = None) -> argparse.Namespace:
+    """parse_args
+
+    Parse the command line.
+
+    Args:
+        argv: The arguments. Defaults to sys.argv[1:].
+
+    Returns:
+        The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(prog="zoom_autojoiner_gui",
+        description="Zoom Autojoiner GUI")
+    parser.add_argument("--startup-report", action="store_true",
+        help="print how long each phase of start-up took")
+    parser.add_argument("--daemon", action="store_true",
+        help="run the autojoiner without a window (see daemon.py)")
+    parser.add_argument("--join-report", action="store_true",
+        help="print how long each join step took in the recent joins")
+    return parser.parse_args(sys.argv[1:] if argv is None else argv)
+
+
 def main():
     """
     Main Function
-    
+
     Inspired by C/C++ main() function, that looks neat
     """
+    args = parse_args()
+    TIMER.report_requested = args.startup_report
+
+    if args.join_report:
+        from zoom_autojoiner_gui import constants
+        from zoom_autojoiner_gui.tracing import TraceRing, format_report
+        print(format_report(TraceRing(constants.JOIN_TRACE_DIR, 
+            constants.JOIN_TRACE_KEEP).load()))
+        return
+
+    setup_process()
+
+    if args.daemon:
+        # Headless: no window, and no Tk import.
+        from zoom_autojoiner_gui.daemon import run_daemon
+        run_daemon()
+        return
+
     try:
         # logger.info('Attempting to initialise High DPI awareness') # Don't clutter the log
         from ctypes import windll
@@ -61,6 +138,22 @@ def main():
     except:
         pass
         # logger.critical("Failed to start child process!!!", exc_info=True)
-    
+
+
+def __getattr__(name: str):
+    """Import the names this package used to import eagerly, on first
+    use (PEP 562), so that importing the package stays cheap."""
+    if name == "MainWindow":
+        from zoom_autojoiner_gui.views import MainWindow
+        return MainWindow
+    if name == "ExtensionHandler":
+        from zoom_autojoiner_gui.extensions import ExtensionHandler
+        return ExtensionHandler
+    if name == "EXTENSIONS":
+        from zoom_autojoiner_gui.constants import EXTENSIONS
+        return EXTENSIONS
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
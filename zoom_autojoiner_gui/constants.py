@@ -1,41 +1,106 @@
 import json, logging, configparser
 
 logger = logging.getLogger(__name__)
-try:
-    logger.info("Attempting to load config...")
-    # with open("config/config.json", "r") as cfg_file:
-    #     cfg = json.loads(cfg_file.read())
-    #     ICON_FILE = cfg["ICON_FILE"]
-    #     DB_URL = cfg["DB_URL"]
-    #     PYAG_PICS_DIR = cfg["PYAG_PICS_DIR"]
-    #     MY_NAME = cfg["MY_NAME"]
-    #     THEME_FILE = "themes/" + cfg["THEME_FILE"]
-
-    # Parse the config file.
-    config = configparser.ConfigParser()
-    
-
-    # read it
-    config.read("config/application.ini")
-    # Tkinter configuration
-    ICON_FILE = config["tkinter"]["icon"]
-    THEME_FILE = "themes/" + config["tkinter"]["theme"] + ".thm.json"
-
-    # Database configuration
-    DB_URL = config["database"]["uri"]
-
-    # Autojoiner configuration
-    PYAG_PICS_DIR = config["autojoiner"]["pictures_dir"]
-    MY_NAME = config["autojoiner"]["name"]
-
-    """The Extensions Config Variable"""
-    EXTENSIONS = config["extensions"]
-    
-except Exception as e:
-    logger.error("Failed to load config, exiting...", exc_info=True)
-    exit(1)
-else:
-    logger.info("Config loaded.")
+
+#: bool : Whether the config files have been parsed.
+_loaded = False
+
+
+def _load_config() -> None:
+    """_load_config
+
+    Parse the config files and set the module's constants. Called on
+    first access to a constant, so importing this module is free.
+    """
+    global _loaded, config, ICON_FILE, THEME_FILE, STARTUP_BUDGET_MS, \
+        DB_URL, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_SYNC_INTERVAL, \
+        DB_CACHE_SIZE, DB_CHANGE_RETENTION_DAYS, PYAG_PICS_DIR, MY_NAME, \
+        JOIN_STEP_TIMEOUT, JOIN_POLL_INTERVAL, JOIN_TYPE_INTERVAL, \
+        JOIN_TRACE_DIR, JOIN_TRACE_KEEP, JOIN_DRIVER, JOIN_SCRIPT, \
+        JOIN_MODE, LOG_LEVEL, LOG_DIR, LOG_RATE_LIMIT, \
+        METRICS_PORT, METRICS_FILE, METRICS_INTERVAL, EXTENSIONS
+    try:
+        logger.info("Attempting to load config...")
+        # with open("config/config.json", "r") as cfg_file:
+        #     cfg = json.loads(cfg_file.read())
+        #     ICON_FILE = cfg["ICON_FILE"]
+        #     DB_URL = cfg["DB_URL"]
+        #     PYAG_PICS_DIR = cfg["PYAG_PICS_DIR"]
+        #     MY_NAME = cfg["MY_NAME"]
+        #     THEME_FILE = "themes/" + cfg["THEME_FILE"]
+
+        # Parse the config file.
+        config = configparser.ConfigParser()
+        
+
+        # read it
+        config.read("config/application.ini")
+        # Tkinter configuration
+        ICON_FILE = config["tkinter"]["icon"]
+        THEME_FILE = "themes/" + config["tkinter"]["theme"] + ".thm.json"
+        STARTUP_BUDGET_MS = config["tkinter"].getfloat("startup_budget_ms",
+            fallback=1500.0)
+
+        # Database configuration
+        DB_URL = config["database"]["uri"]
+        DB_POOL_SIZE = config["database"].getint("pool_size", fallback=5)
+        DB_MAX_OVERFLOW = config["database"].getint("max_overflow", 
+            fallback=2)
+        DB_SYNC_INTERVAL = config["database"].getfloat("sync_interval",
+            fallback=10.0)
+        DB_CACHE_SIZE = config["database"].getint("cache_size", 
+            fallback=1024)
+        DB_CHANGE_RETENTION_DAYS = config["database"].getfloat(
+            "change_retention_days", fallback=30.0)
+
+        # Autojoiner configuration
+        PYAG_PICS_DIR = config["autojoiner"]["pictures_dir"]
+        MY_NAME = config["autojoiner"]["name"]
+        JOIN_STEP_TIMEOUT = config["autojoiner"].getfloat("step_timeout", 
+            fallback=15.0)
+        JOIN_POLL_INTERVAL = config["autojoiner"].getfloat("poll_interval", 
+            fallback=0.25)
+        JOIN_TYPE_INTERVAL = config["autojoiner"].getfloat("type_interval", 
+            fallback=0.25)
+        JOIN_TRACE_DIR = config["autojoiner"].get("trace_dir", 
+            fallback="cache/join_traces/")
+        JOIN_TRACE_KEEP = config["autojoiner"].getint("trace_keep", 
+            fallback=100)
+        JOIN_DRIVER = config["autojoiner"].get("driver", 
+            fallback="pyautogui")
+        JOIN_SCRIPT = config["autojoiner"].get("script", fallback="")
+        JOIN_MODE = config["autojoiner"].get("join_mode", fallback="gui")
+
+        # Logging configuration
+        LOG_LEVEL = config.get("logging", "level", fallback="INFO").upper()
+        LOG_DIR = config.get("logging", "dir", fallback="logs/")
+        LOG_RATE_LIMIT = config.getfloat("logging", "rate_limit", 
+            fallback=10.0)
+
+        # Metrics configuration
+        METRICS_PORT = config.getint("metrics", "port", fallback=0)
+        METRICS_FILE = config.get("metrics", "file", fallback="")
+        METRICS_INTERVAL = config.getfloat("metrics", "interval", 
+            fallback=15.0)
+
+        """The Extensions Config Variable"""
+        EXTENSIONS = config["extensions"]
+        
+    except Exception as e:
+        logger.error("Failed to load config, exiting...", exc_info=True)
+        exit(1)
+    else:
+        _loaded = True
+        logger.info("Config loaded.")
+
+
+def __getattr__(name: str):
+    """Load the config the first time a constant is used (PEP 562)."""
+    if not _loaded and not name.startswith("__"):
+        _load_config()
+        if name in globals():
+            return globals()[name]
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
 
 # from datetime import datetime
 
@@ -13,19 +13,58 @@
 # You should have received a copy of the GNU General Public License
 # along with Zoom Autojoiner GUI.  If not, see <https://www.gnu.org/licenses/>.
 
+import os
 import json
+import string
+import hashlib
 import time
+import uuid
+import queue
 import platform
 import logging
-from datetime import datetime
-from typing import Any, Union
-
-import pyautogui
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Query
-
-from zoom_autojoiner_gui.models import Meetings
-from zoom_autojoiner_gui.constants import DB_URL, MY_NAME
+import heapq
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from itertools import islice
+from urllib.parse import quote, urlencode
+from operator import attrgetter
+from typing import (
+    Any, 
+    Callable, 
+    Iterable, 
+    Iterator, 
+    NamedTuple, 
+    Optional, 
+    Union
+)
+
+from sqlalchemy import delete, insert, select, func, or_
+from sqlalchemy.orm import Query
+
+from zoom_autojoiner_gui import constants
+from zoom_autojoiner_gui.models import (
+    Meetings,
+    MeetingChanges,
+    MeetingRecord,
+    MEETING_RECORD_COLUMNS,
+    RecurringMeetings,
+    SeriesRecord,
+    SERIES_RECORD_COLUMNS,
+    get_engine,
+    get_session
+)
+from zoom_autojoiner_gui.recurrence import (
+    check_series,
+    merge_occurrences,
+    parse_exceptions
+)
+from zoom_autojoiner_gui.logsetup import LazyMessage
+from zoom_autojoiner_gui.hooks import HOOKS
+from zoom_autojoiner_gui.metrics import DB_CACHE, JOIN_STEP, JOINS
+from zoom_autojoiner_gui.tracing import JoinTrace, TraceRing
+from zoom_autojoiner_gui.drivers import AutomationDriver, make_driver
 
 
 logger = logging.getLogger(__name__)
@@ -46,10 +85,13 @@ class TkinterTheme():
     DEFAULT_THEME str (or docstring to be more 
     specific.)
 
-    There are a few bugs in this class, which
-    occur when there is a space in the font name.
-    I am not sure how to fix the same, hence 
-    leaving as is.
+    Each style of the theme is compiled once into a named font and a
+    ttk style (see `style`). Widgets reference them by name, so when the
+    theme file changes (see `watch`) the running UI is re-skinned without
+    recreating any widget.
+
+    Args:
+        theme_file_uri: The path of the `.thm.json` file.
     """
     DEFAULT_THEME: str = """
             {
@@ -109,9 +151,25 @@ class TkinterTheme():
                 }
             }
             """
+    #: int : How often (ms) `watch` checks the theme file for changes.
+    WATCH_INTERVAL: int = 1000
+
     def __init__(self, theme_file_uri:str) -> None:
+        self.theme_file_uri = theme_file_uri
+        self.__mtime = None     # mtime of the loaded theme file
+        self.__styling = {}     # Style name: compiled Tk options
+        self.__masters = []     # Tk widgets the styles were applied for
+        self.load()
+
+    def load(self) -> None:
+        """load
+
+        (Re)read the theme file and compile its styles. Falls back to 
+        DEFAULT_THEME if the file cannot be read.
+        """
         try:
-            with open(theme_file_uri, "r") as file_handle:
+            self.__mtime = os.stat(self.theme_file_uri).st_mtime
+            with open(self.theme_file_uri, "r") as file_handle:
                 self.json = json.loads(file_handle.read())
         except:
             logger.warning("Failed to load theme file, using default...", 
@@ -120,10 +178,86 @@ class TkinterTheme():
         else:
             logger.info("Loaded theme file")
 
+        self.__styling = {style_name: self.__compile(style_name, style) 
+            for style_name, style in self.json.items()}
+        for master in self.__masters:
+            self.__apply(master)
+
+    @staticmethod
+    def __compile(style_name: str, style: dict) -> dict:
+        """Turn a theme style into the Tk options of a widget."""
+        font_words = (style["font"].get("style") or "").split()
+        return {
+            "fg" : style["fg"],
+            "bg" : style["bg"],
+            "padx" : style["padding"]["x"],
+            "pady" : style["padding"]["y"],
+            "borderwidth" : style["border"]["width"] or 0,
+            "relief" : style["border"]["relief"] or "flat",
+            "font" : {
+                "family" : style["font"]["name"],
+                "size" : int(style["font"]["size"]),
+                "weight" : "bold" if "bold" in font_words else "normal",
+                "slant" : "italic" if "italic" in font_words else "roman",
+                "underline" : "underline" in font_words,
+                "overstrike" : "overstrike" in font_words
+            }
+        }
+
+    @staticmethod
+    def font_name(style_name: str) -> str:
+        """The name of the Tk named font of a style."""
+        return "ZajTheme_%s" % style_name
+
+    @staticmethod
+    def style_name(style_name: str) -> str:
+        """The name of the ttk Label style of a style."""
+        return "Zaj_%s.TLabel" % style_name
+
+    def __apply(self, master: Any) -> None:
+        """Create or update the named fonts and ttk styles for the Tk 
+        interpreter of `master`."""
+        import tkinter.font as tkFont
+        from tkinter import ttk
+
+        ttk_style = ttk.Style(master)
+        font_names = tkFont.names(master)
+        for style_name, styling in self.__styling.items():
+            font_name = self.font_name(style_name)
+            font = tkFont.Font(root=master, name=font_name, 
+                exists=font_name in font_names)
+            font.configure(**styling["font"])
+            ttk_style.configure(self.style_name(style_name), 
+                foreground=styling["fg"], background=styling["bg"],
+                padding=(styling["padx"], styling["pady"]),
+                borderwidth=styling["borderwidth"], 
+                relief=styling["relief"], font=font_name)
+
+    def style(self, style_name: str, master: Any) -> str:
+        """style
+
+        Get the ttk style to give a widget for a style name, e.g.
+        ``ttk.Label(master, style=theme.style("title", master))``.
+
+        Args:
+            style_name: The name of the style in the theme.
+            master: A widget of the Tk interpreter the style is used in.
+
+        Returns:
+            str: The name of the ttk style.
+        """
+        root = master.nametowidget(".")
+        if root not in self.__masters:
+            self.__masters.append(root)
+            self.__apply(root)
+        return self.style_name(style_name)
+
     def get_styling(self, style_name: str) -> dict:
         """get_styling 
         
-        Gets the style to be used for given style name.
+        Gets the style to be used for given style name, for widgets that
+        cannot take a ttk style. Prefer `style`; these options are copied
+        into the widget, so they do not follow changes of the theme file.
 
         Args:
             style_name: The name of the style.
@@ -131,25 +265,122 @@ class TkinterTheme():
         Returns:
             dict: The dict of TK styling to be unpacked and passed.
         """
-        if style_name in self.json:
-            the_dict = {
-                    "fg" : self.json[style_name]["fg"],
-                    "bg" : self.json[style_name]["bg"],
-                    "padx" : self.json[style_name]["padding"]["x"],
-                    "pady" : self.json[style_name]["padding"]["y"],
-                    "borderwidth" : self.json[style_name]["border"]["width"],
-                    "relief" : self.json[style_name]["border"]["relief"],
-                    "font" : (self.json[style_name]["font"]["name"] 
-                        + " " 
-                        + self.json["table_header"]["font"]["size"] 
-                        + " " 
-                        + self.json["table_header"]["font"]["style"])
-                }
+        if style_name in self.__styling:
+            the_dict = dict(self.__styling[style_name])
+            font = the_dict["font"]
+            if self.__masters:
+                the_dict["font"] = self.font_name(style_name)
+            else:
+                the_dict["font"] = (font["family"], font["size"], 
+                    font["weight"], font["slant"])
             return the_dict
         else:
             # no style available
             return {}
 
+    def watch(self, widget: Any) -> None:
+        """watch
+
+        Check the theme file every WATCH_INTERVAL ms, on the main loop 
+        of `widget`, and reload it when it changes.
+
+        Args:
+            widget: The widget whose `after` is used. Watching stops when
+                it is destroyed.
+        """
+        try:
+            mtime = os.stat(self.theme_file_uri).st_mtime
+        except OSError:
+            mtime = None
+        if mtime is not None and mtime != self.__mtime:
+            logger.info("Theme file changed, reloading")
+            self.load()
+        try:
+            widget.after(self.WATCH_INTERVAL, lambda: self.watch(widget))
+        except Exception:
+            pass # The widget has been destroyed
+
+
+class MeetingCache():
+    """MeetingCache
+
+    A bounded, thread-safe LRU cache of meeting reads, with hit and miss
+    counters, which are also counted in the DB_CACHE metric. 
+    DatabaseHandler keeps one per database and empties the affected 
+    entries on every commit.
+
+    A value loaded while entries were being dropped may be older than
+    the drop, so it is returned but not kept.
+
+    Args:
+        max_size: The most entries kept. 0 turns the cache off.
+    """
+    def __init__(self, max_size: int = 1024) -> None:
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.__entries = OrderedDict()
+        self.__generation = 0 # Bumped by every invalidate and clear
+        self.__lock = threading.Lock()
+
+    def get(self, key: Any, load: Callable[[], Any]) -> Any:
+        """get
+
+        Get an entry, calling `load` to create it when it is missing.
+
+        Args:
+            key: The key of the entry.
+            load: Returns the value to cache.
+
+        Returns:
+            The cached or loaded value.
+        """
+        with self.__lock:
+            hit = key in self.__entries
+            if hit:
+                self.hits += 1
+                self.__entries.move_to_end(key)
+                value = self.__entries[key]
+            else:
+                self.misses += 1
+                generation = self.__generation
+        DB_CACHE.inc(result="hit" if hit else "miss")
+        if hit:
+            return value
+        value = load()
+        if self.max_size > 0:
+            with self.__lock:
+                if generation != self.__generation:
+                    return value
+                self.__entries[key] = value
+                self.__entries.move_to_end(key)
+                while len(self.__entries) > self.max_size:
+                    self.__entries.popitem(last=False)
+        return value
+
+    def invalidate(self, *keys: Any) -> None:
+        """Drop the given entries, if cached."""
+        with self.__lock:
+            self.__generation += 1
+            for key in keys:
+                self.__entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry. The counters are kept."""
+        with self.__lock:
+            self.__generation += 1
+            self.__entries.clear()
+
+    def info(self) -> dict[str, int]:
+        """info
+
+        Returns:
+            dict: hits, misses, size and max_size.
+        """
+        with self.__lock:
+            return {"hits" : self.hits, "misses" : self.misses, 
+                "size" : len(self.__entries), "max_size" : self.max_size}
+
 
 class DatabaseHandler():
     """DatabaseHandler
@@ -159,15 +390,383 @@ class DatabaseHandler():
     and the cook (database). In technical terms, it is a controller in
     the MVC architecture.
 
+    All DatabaseHandlers of the same database share one engine and,
+    within a thread, one session, so creating a handler is cheap. A
+    write that fails rolls the session back before re-raising, so the
+    other handlers of the thread can go on using it.
+
+    Meetings are read with Core selects into immutable MeetingRecords.
+    `get_mtg_data_to_list` and `get_single_mtg_data_to_list` are served
+    from a MeetingCache shared by the handlers of the same database. 
+    Every commit empties the entries its writes affect, and so do the
+    changes of other processes, when `sync_changes` fetches them.
+
+    Every change is also written to the change log (MeetingChanges) in
+    the same transaction. `sync_changes` reads the changes other 
+    processes made to a shared database since the last call, and passes
+    them to the change listeners like local ones. It also deletes the
+    changes older than DB_CHANGE_RETENTION_DAYS, once per
+    PRUNE_INTERVAL; a process that missed some of them reloads 
+    everything.
+
     Args:
         database_uri:
             The URI of the database, in SQLAlchemy format.
+        cache_size:
+            The most reads kept in the cache of the database, if it is
+            created by this handler. Defaults to DB_CACHE_SIZE; 0 turns
+            caching off.
     """
-    def __init__(self, database_uri: str) -> None:
-        # engine = create_engine(DB_URL)
-        engine = create_engine(database_uri)
-        Session = sessionmaker(bind=engine)
-        self.__db_session = Session()
+
+    #: list : Callables notified after every committed change, on the
+    #: listener thread if one is set. They are called as 
+    #: ``callback(action, record_id)``, where action is one of "add",
+    #: "update", "delete", "truncate" or "bulk_add" (record_id is None
+    #: for the last two), or "series_add", "series_update" or 
+    #: "series_delete" for recurring meetings (record_id is the series).
+    change_listeners: list[Callable[[str, Union[int, None]], None]] = []
+
+    #: int : The thread the change listeners are called on, if set with
+    #: `set_listener_thread`.
+    listener_thread: Optional[int] = None
+
+    #: Callable : Runs a callable on `listener_thread`.
+    listener_dispatcher: Optional[Callable[[Callable[[], None]], None]] \
+        = None
+
+    #: str : Tags the change log entries written by this process.
+    CLIENT_ID: str = uuid.uuid4().hex
+
+    #: dict : The last change log revision seen, by database URI.
+    synced_revisions: dict[str, int] = {}
+
+    #: dict : The MeetingCache of each database URI.
+    caches: dict[str, MeetingCache] = {}
+
+    #: dict : When the change log was last pruned (time.monotonic()), by
+    #: database URI.
+    pruned_at: dict[str, float] = {}
+
+    #: float : The seconds between two prunes of the change log.
+    PRUNE_INTERVAL = 60 * 60
+
+    #: str : The cache key of the whole, sorted, meeting list.
+    ALL_MEETINGS = "all"
+
+    def __init__(self, database_uri: str, 
+            cache_size: Optional[int] = None) -> None:
+        self.__database_uri = database_uri
+        if database_uri not in self.caches:
+            self.caches[database_uri] = MeetingCache(constants.DB_CACHE_SIZE 
+                if cache_size is None else cache_size)
+        self.__cache = self.caches[database_uri]
+
+    @property
+    def __db_session(self):
+        """The shared session. The engine is only created when the 
+        handler is first used."""
+        return get_session(self.__database_uri)
+
+    @property
+    def __pending_changes(self) -> list:
+        """Changes waiting for commit, as (action, record_id).
+
+        Kept on the session, as handlers sharing it may commit each
+        other's changes.
+        """
+        return self.__db_session.info.setdefault("pending_changes", [])
+
+    @classmethod
+    def add_change_listener(cls, 
+            callback: Callable[[str, Union[int, None]], None]) -> None:
+        """add_change_listener
+
+        Register a callable to be notified when meetings change. Used by
+        the scheduler to re-arm itself.
+
+        Args:
+            callback: Called as ``callback(action, record_id)``.
+        """
+        cls.change_listeners.append(callback)
+
+    @classmethod
+    def remove_change_listener(cls, 
+            callback: Callable[[str, Union[int, None]], None]) -> None:
+        """remove_change_listener
+
+        Unregister a callable added with `add_change_listener`.
+
+        Args:
+            callback: The callable to remove.
+        """
+        if callback in cls.change_listeners:
+            cls.change_listeners.remove(callback)
+
+    @contextmanager
+    def __writing(self, auto_commit: bool) -> Iterator[None]:
+        """Context manager around a write: commits it if `auto_commit`.
+
+        The session is shared by every handler on the thread, so if the
+        write or its commit fails, the whole transaction is rolled back
+        and the error re-raised. Otherwise the session would refuse all
+        later reads and writes on the thread (PendingRollbackError).
+        """
+        try:
+            yield
+            if auto_commit:
+                self.commit_changes()
+        except:
+            self.rollback_changes()
+            raise
+
+    @classmethod
+    def set_listener_thread(cls, 
+            dispatch: Optional[Callable[[Callable[[], None]], None]]
+            ) -> None:
+        """set_listener_thread
+
+        Call the change listeners on the current thread, e.g. the Tk
+        thread, whichever thread the change was made on. Changes made
+        on other threads, e.g. by an import or an extension hook, are
+        passed on through `dispatch`.
+
+        Args:
+            dispatch: Called from any thread with a callable, which it
+                must run on this thread, e.g. through Tk's `after`. 
+                None calls the listeners on the changing thread again.
+        """
+        cls.listener_thread = threading.get_ident() if dispatch else None
+        cls.listener_dispatcher = dispatch
+
+    def __log_change(self, action: str, record_id: Optional[int]) -> None:
+        """Add a change log entry to the current transaction, and record
+        the change for `commit_changes`, which drops the cached reads it
+        outdates and tells the listeners."""
+        self.__db_session.add(MeetingChanges(action=action, 
+            record_id=record_id, origin=self.CLIENT_ID, 
+            changed_at=datetime.now()))
+        self.__pending_changes.append((action, record_id))
+
+    @staticmethod
+    def is_series_action(action: str) -> bool:
+        """Whether a change listener action is about a recurring 
+        meeting."""
+        return action.startswith("series_")
+
+    def __invalidate(self, record_id: Optional[int]) -> None:
+        """Drop the cached reads a change to a meeting outdates. None 
+        stands for every meeting."""
+        if record_id is None:
+            self.__cache.clear()
+        else:
+            self.__cache.invalidate(self.ALL_MEETINGS, record_id)
+
+    def __cached(self, key: Any, load: Callable[[], Any]) -> Any:
+        """Read through the cache, unless the session holds uncommitted
+        writes, which the read could see and other threads must not."""
+        if self.__has_uncommitted_writes():
+            return load()
+        return self.__cache.get(key, load)
+
+    def cache_info(self) -> dict[str, int]:
+        """cache_info
+
+        Returns:
+            dict: The hits, misses, size and max_size of the read cache.
+        """
+        return self.__cache.info()
+
+    def get_revision(self) -> int:
+        """get_revision
+
+        Returns:
+            int: The latest change log revision, 0 if there is none.
+        """
+        with get_engine(self.__database_uri).connect() as connection:
+            return connection.execute(select(func.max(
+                MeetingChanges.revision)).execution_options(
+                query_name="get_revision")).scalar() or 0
+
+    def get_changes_since(self, revision: int, limit: int = 1000
+            ) -> list[tuple[int, str, Optional[int], str]]:
+        """get_changes_since
+
+        Reads the change log after a revision. Uses the primary key, so
+        the cost depends on the number of changes, not of meetings. The
+        read runs on its own connection, outside of the session's 
+        transaction, so that it sees the latest commits.
+
+        Args:
+            revision: The last revision already seen.
+            limit: The most entries returned.
+
+        Returns:
+            list: (revision, action, record_id, origin) tuples, oldest
+            first.
+        """
+        query = select(MeetingChanges.revision, MeetingChanges.action, 
+            MeetingChanges.record_id, MeetingChanges.origin).where(
+            MeetingChanges.revision > revision).order_by(
+            MeetingChanges.revision).limit(limit).execution_options(
+            query_name="get_changes_since")
+        with get_engine(self.__database_uri).connect() as connection:
+            return [tuple(row) for row in connection.execute(query)]
+
+    def get_oldest_revision(self) -> int:
+        """get_oldest_revision
+
+        Returns:
+            int: The oldest change log revision kept, 0 if there is 
+            none.
+        """
+        with get_engine(self.__database_uri).connect() as connection:
+            return connection.execute(select(func.min(
+                MeetingChanges.revision)).execution_options(
+                query_name="get_oldest_revision")).scalar() or 0
+
+    def prune_changes(self, max_age_days: float) -> int:
+        """prune_changes
+
+        Delete the change log entries older than `max_age_days`. Only a
+        run of the oldest revisions is deleted, so that `sync_changes`
+        can tell what it missed, and the newest entry is always kept, 
+        so that the latest revision is still known.
+
+        Args:
+            max_age_days: The age, in days.
+
+        Returns:
+            int: The number of entries deleted.
+        """
+        cutoff = datetime.now() - timedelta(days=max_age_days)
+        with get_engine(self.__database_uri).begin() as connection:
+            connection = connection.execution_options(
+                query_name="prune_changes")
+            newest = connection.execute(select(func.max(
+                MeetingChanges.revision))).scalar()
+            last_old = connection.execute(select(func.max(
+                MeetingChanges.revision)).where(
+                MeetingChanges.changed_at < cutoff)).scalar()
+            if newest is None or last_old is None:
+                return 0
+            return connection.execute(delete(MeetingChanges).where(
+                MeetingChanges.revision <= min(last_old, newest - 1))
+                ).rowcount
+
+    def __prune_periodically(self) -> None:
+        """Prune the change log once per PRUNE_INTERVAL, if a retention
+        is configured. Waits while the session has uncommitted writes,
+        which could lock the table."""
+        retention = constants.DB_CHANGE_RETENTION_DAYS
+        now = time.monotonic()
+        last = self.pruned_at.get(self.__database_uri)
+        if retention <= 0 or self.__has_uncommitted_writes() or (
+                last is not None and now - last < self.PRUNE_INTERVAL):
+            return
+        self.pruned_at[self.__database_uri] = now
+        try:
+            pruned = self.prune_changes(retention)
+        except:
+            logger.warning("Failed to prune the change log", exc_info=True)
+        else:
+            if pruned:
+                logger.info("Pruned %d change log entries", pruned)
+
+    def __end_read_transaction(self) -> None:
+        """End the session's transaction if it has nothing to commit, so
+        that the next read sees the latest commits, even under 
+        REPEATABLE READ. A transaction with uncommitted writes is left
+        alone."""
+        session = self.__db_session() # The thread's Session
+        if session.in_transaction() and not self.__has_uncommitted_writes():
+            session.rollback()
+
+    def __has_uncommitted_writes(self) -> bool:
+        """Whether the session holds writes that were not committed."""
+        session = self.__db_session
+        return bool(session.new or session.dirty or session.deleted
+            or self.__pending_changes)
+
+    def sync_changes(self, limit: int = 1000) -> int:
+        """sync_changes
+
+        Pass the changes other processes made since the last call to the
+        change listeners. Changes to the same meeting are merged, so 
+        only the last one is passed. The first call only records the 
+        current revision, as the caller has just read the whole table.
+
+        If more than `limit` changes are waiting, or some were pruned
+        before this process saw them, a single "truncate" is passed 
+        instead, which makes the listeners reload everything.
+
+        The session's read transaction is ended first, so that the
+        listeners read the changed meetings as they are now.
+
+        Args:
+            limit: The most changes applied one by one.
+
+        Returns:
+            int: The number of changes passed to the listeners.
+        """
+        self.__prune_periodically()
+        last_revision = self.synced_revisions.get(self.__database_uri)
+        if last_revision is None:
+            self.synced_revisions[self.__database_uri] = self.get_revision()
+            return 0
+
+        rows = self.get_changes_since(last_revision, limit + 1)
+        if not rows:
+            return 0
+
+        # A gap after the last revision seen may be pruned changes.
+        missed = rows[0][0] > last_revision + 1 \
+            and self.get_oldest_revision() > last_revision
+        if len(rows) > limit or missed:
+            self.synced_revisions[self.__database_uri] = self.get_revision()
+            changes = [("truncate", None)]
+        else:
+            self.synced_revisions[self.__database_uri] = rows[-1][0]
+            merged = {}
+            for _, action, record_id, origin in rows:
+                if origin == self.CLIENT_ID:
+                    continue # Already passed on by commit_changes
+                is_series = self.is_series_action(action)
+                if record_id is None:
+                    # Whole-table changes outdate the ones before them.
+                    merged = {key: value for key, value in merged.items()
+                        if key[0]}
+                merged.pop((is_series, record_id), None)
+                merged[(is_series, record_id)] = action
+            changes = [(action, key[1]) for key, action in merged.items()]
+
+        for action, record_id in changes:
+            if not self.is_series_action(action):
+                self.__invalidate(record_id)
+        self.__end_read_transaction()
+        self.__notify(changes)
+        return len(changes)
+
+    def __notify(self, changes: list[tuple[str, Optional[int]]]) -> None:
+        """Call the change listeners for each (action, record_id), on
+        the listener thread, and emit the meeting_changed hook."""
+        for action, record_id in changes:
+            HOOKS.emit("meeting_changed", action=action, record_id=record_id)
+        dispatch = self.listener_dispatcher
+        if dispatch is not None \
+                and threading.get_ident() != self.listener_thread:
+            dispatch(lambda: self.__call_listeners(changes))
+        else:
+            self.__call_listeners(changes)
+
+    def __call_listeners(self, changes: list[tuple[str, Optional[int]]]
+            ) -> None:
+        """Call the change listeners for each (action, record_id)."""
+        for action, record_id in changes:
+            for callback in list(self.change_listeners):
+                try:
+                    callback(action, record_id)
+                except:
+                    logger.error("Change listener failed", exc_info=True)
 
     def add_mtg(self, meeting_id: str, meeting_password: str, 
             meeting_time: datetime, meeting_provider: str = "ZM",
@@ -183,11 +782,13 @@ class DatabaseHandler():
             meeting_provider: Meeting Provider. Defaults to "ZM".
             auto_commit: Whether to autosave changes. Defaults to True.
         """
-        mtg = Meetings(mtg_provider=meeting_provider, mtg_id=meeting_id, 
-            mtg_password=meeting_password, mtg_time=meeting_time)
-        self.__db_session.add(mtg)
-        if auto_commit:
-            self.commit_changes()
+        with self.__writing(auto_commit):
+            mtg = Meetings(mtg_provider=meeting_provider, 
+                mtg_id=meeting_id, mtg_password=meeting_password, 
+                mtg_time=meeting_time)
+            self.__db_session.add(mtg)
+            self.__db_session.flush() # Get the ID for the change log
+            self.__log_change("add", mtg.id)
 
     def delete_mtg(self, rec_id: int, auto_commit: bool = True) -> None:
         """delete_mtg 
@@ -199,11 +800,11 @@ class DatabaseHandler():
             auto_commit:
                 Whether to auto commit changes. Defaults to True.
         """
-        to_delete = self.__db_session.query(Meetings).filter_by(id=
-            rec_id).one()
-        self.__db_session.delete(to_delete)
-        if auto_commit:
-            self.commit_changes()
+        with self.__writing(auto_commit):
+            to_delete = self.__db_session.query(Meetings).filter_by(id=
+                rec_id).execution_options(query_name="delete_mtg").one()
+            self.__db_session.delete(to_delete)
+            self.__log_change("delete", rec_id)
 
     def update_mtg(self, db_id: int, meeting_id: str, meeting_password: str,
             meeting_time: datetime, meeting_provider: str = "ZM",
@@ -222,44 +823,32 @@ class DatabaseHandler():
             auto_commit (bool, optional):
                 Whether to autosave changes. Defaults to True.
         """
-        to_update = self.__db_session.query(Meetings).filter_by(id=
-            db_id).one()
-        to_update.mtg_provider = meeting_provider
-        to_update.mtg_id = meeting_id
-        to_update.mtg_password = meeting_password
-        to_update.mtg_time = meeting_time
-        if auto_commit:
-            self.commit_changes()
-
-    def get_mtg_data_to_list(self) -> list[dict[str, Any]]:
+        with self.__writing(auto_commit):
+            to_update = self.__db_session.query(Meetings).filter_by(id=
+                db_id).execution_options(query_name="update_mtg").one()
+            to_update.mtg_provider = meeting_provider
+            to_update.mtg_id = meeting_id
+            to_update.mtg_password = meeting_password
+            to_update.mtg_time = meeting_time
+            self.__log_change("update", db_id)
+
+    def get_mtg_data_to_list(self) -> list[MeetingRecord]:
         """get_mtg_data_to_list 
         
         Queries meeting data from SQL database and outputs it as a
-        list cum dict
+        list of records.
 
         Returns:
-            list: List with dict of mtg data.
+            list: List of MeetingRecords, ordered by time.
         """
-        output_list = [] # Output list
-        query = self.__db_session.query(Meetings).order_by(
-            Meetings.mtg_time)
-        for record in query:
-            mtg_data = {
-                "id" : record.id,
-                "mtg_provider" : record.mtg_provider, 
-                "mtg_id" : record.mtg_id, 
-                "mtg_password" : record.mtg_password,
-                "mtg_time": record.mtg_time 
-            }
-            # print(type(record.mtg_time))
-            output_list.append(mtg_data)
-        return output_list
+        return list(self.__cached(self.ALL_MEETINGS, lambda: 
+            self.__select_records(self.__select_mtgs(), "get_mtgs")))
 
-    def get_single_mtg_data_to_list(self, record_id: str) -> dict[str, Any]:
+    def get_single_mtg_data_to_list(self, record_id: str) -> MeetingRecord:
         """get_single_mtg_data_to_list
 
         Queries only one meeting from SQL database and outputs it as a
-        dict
+        record.
 
         Note:
             The method name is redundant, as it was imported from 
@@ -272,23 +861,242 @@ class DatabaseHandler():
             record_id (str): ID of record in database.
 
         Returns:
-            dict[str, Any]: Dict containing meeting data of record ID.
+            MeetingRecord: The meeting data of record ID.
+
+        Raises:
+            sqlalchemy.exc.NoResultFound: There is no such meeting.
 
         .. _cryptocurrency-portfolio: https://tinyurl.com/48a7y5cw
         """
         # output_list = [] # Output list
-        record = self.__db_session.query(Meetings).filter_by(id=record_id) \
-            .one()
-        output_list = {
-            "id" : record.id,
-            "mtg_provider" : record.mtg_provider, # mtg_provider
-            "mtg_id" : record.mtg_id, # No. of mtg owned
-            "mtg_password" : record.mtg_password,
-            "mtg_time": record.mtg_time # Price per mtg at time of purchase
-        }
-        # output_list.append(mtg_data)
-        return output_list
+        return self.__cached(int(record_id), lambda: MeetingRecord._make(
+            self.__db_session.execute(select(*MEETING_RECORD_COLUMNS).where(
+            Meetings.id == record_id).execution_options(
+            query_name="get_single_mtg")).one()))
+
+    def get_mtgs_between(self, start: datetime, 
+            end: datetime) -> list[MeetingRecord]:
+        """get_mtgs_between
+
+        Queries the meetings with start <= mtg_time < end. Uses the 
+        index on mtg_time, so only the matching rows are read.
+
+        Args:
+            start: The start of the range (inclusive).
+            end: The end of the range (exclusive).
+
+        Returns:
+            list: List of MeetingRecords, ordered by time.
+        """
+        return self.__select_records(self.__select_mtgs().where(
+            Meetings.mtg_time >= start, Meetings.mtg_time < end),
+            "get_mtgs_between")
+
+    def get_next_mtgs(self, after: datetime, 
+            limit: int = 1) -> list[MeetingRecord]:
+        """get_next_mtgs
+
+        Queries the next `limit` meetings at or after a time. Uses the
+        index on mtg_time, so only `limit` rows are read.
+
+        Args:
+            after: Meetings at or after this time are returned.
+            limit: The maximum number of meetings. Defaults to 1.
+
+        Returns:
+            list: List of MeetingRecords, ordered by time.
+        """
+        return self.__select_records(self.__select_mtgs().where(
+            Meetings.mtg_time >= after).limit(limit), "get_next_mtgs")
+
+    @staticmethod
+    def __select_mtgs():
+        """A Core select of the MeetingRecord columns, ordered by time.
+
+        Core selects skip the ORM: no Meetings objects are built and 
+        nothing is added to the session's identity map.
+        """
+        return select(*MEETING_RECORD_COLUMNS).order_by(Meetings.mtg_time, 
+            Meetings.id)
+
+    def __select_records(self, statement, 
+            query_name: str) -> list[MeetingRecord]:
+        """Run a select of the MeetingRecord columns, named `query_name`
+        in the DB_QUERY metric."""
+        return list(map(MeetingRecord._make, self.__db_session.execute(
+            statement.execution_options(query_name=query_name))))
     
+    # Recurring meetings
+    def add_series(self, meeting_id: str, meeting_password: str,
+            start_time: datetime, frequency: str, weekdays: str = "",
+            interval: int = 1, until: Optional[datetime] = None,
+            meeting_provider: str = "ZM", auto_commit: bool = True) -> None:
+        """add_series
+
+        Adds a recurring meeting. Only the definition is stored; the 
+        occurrences are generated when they are needed.
+
+        Args:
+            meeting_id: The Meeting ID
+            meeting_password: Mtg. passcode
+            start_time: Datetime of the first occurrence.
+            frequency: "daily" or "weekly".
+            weekdays: For weekly meetings, the days as stored (see
+                recurrence.parse_weekdays). Defaults to the day of 
+                `start_time`.
+            interval: Every how many days or weeks. Defaults to 1.
+            until: No occurrences after this time. Defaults to never.
+            meeting_provider: Meeting Provider. Defaults to "ZM".
+            auto_commit: Whether to autosave changes. Defaults to True.
+
+        Raises:
+            ValueError: The frequency, interval or weekdays are not 
+                valid (see recurrence.check_series).
+        """
+        check_series(frequency, interval, weekdays, "")
+        with self.__writing(auto_commit):
+            series = RecurringMeetings(mtg_provider=meeting_provider, 
+                mtg_id=meeting_id, mtg_password=meeting_password, 
+                start_time=start_time, frequency=frequency, 
+                interval=interval, weekdays=weekdays, until=until, 
+                exceptions="")
+            self.__db_session.add(series)
+            self.__db_session.flush() # Get the ID for the change log
+            self.__log_change("series_add", series.id)
+
+    def update_series(self, series_id: int, auto_commit: bool = True,
+            **fields: Any) -> None:
+        """update_series
+
+        Change fields of a recurring meeting, e.g.
+        ``update_series(1, until=datetime(2025, 6, 1))``.
+
+        Args:
+            series_id: The ID of the series.
+            auto_commit: Whether to autosave changes. Defaults to True.
+            **fields: RecurringMeetings columns and their new values.
+
+        Raises:
+            AttributeError: A field is not a column.
+            ValueError: The frequency, interval, weekdays or exceptions
+                are not valid (see recurrence.check_series). Nothing is
+                changed.
+        """
+        for name in fields:
+            if name == "id" or not hasattr(RecurringMeetings, name):
+                raise AttributeError("Unknown series field %r" % name)
+        with self.__writing(auto_commit):
+            series = self.__db_session.query(RecurringMeetings).filter_by(
+                id=series_id).execution_options(query_name="update_series"
+                ).one()
+            check_series(*(fields.get(name, getattr(series, name)) 
+                for name in ("frequency", "interval", "weekdays", 
+                "exceptions")))
+            for name, value in fields.items():
+                setattr(series, name, value)
+            self.__log_change("series_update", series_id)
+
+    def skip_occurrence(self, series_id: int, occurrence: date,
+            auto_commit: bool = True) -> None:
+        """skip_occurrence
+
+        Add an exception to a recurring meeting, so that it does not
+        take place on a date.
+
+        Args:
+            series_id: The ID of the series.
+            occurrence: The date to skip.
+            auto_commit: Whether to autosave changes. Defaults to True.
+        """
+        series = self.get_series(series_id)
+        exceptions = sorted(parse_exceptions(series.exceptions) 
+            | {occurrence})
+        self.update_series(series_id, auto_commit=auto_commit, 
+            exceptions=",".join(day.isoformat() for day in exceptions))
+
+    def delete_series(self, series_id: int, auto_commit: bool = True) -> None:
+        """delete_series
+
+        Deletes a recurring meeting, with all its occurrences.
+
+        Args:
+            series_id: The ID of the series.
+            auto_commit: Whether to autosave changes. Defaults to True.
+        """
+        with self.__writing(auto_commit):
+            self.__db_session.query(RecurringMeetings).filter_by(
+                id=series_id).execution_options(query_name="delete_series"
+                ).delete()
+            self.__log_change("series_delete", series_id)
+
+    def get_series(self, series_id: int) -> SeriesRecord:
+        """get_series
+
+        Args:
+            series_id: The ID of the series.
+
+        Returns:
+            SeriesRecord: The recurring meeting.
+        """
+        return SeriesRecord._make(self.__db_session.execute(select(
+            *SERIES_RECORD_COLUMNS).where(RecurringMeetings.id 
+            == series_id).execution_options(query_name="get_series")).one())
+
+    def get_series_list(self, active_after: Optional[datetime] = None
+            ) -> list[SeriesRecord]:
+        """get_series_list
+
+        Args:
+            active_after: Only return the series that have not ended by
+                this time.
+
+        Returns:
+            list: The recurring meetings, as SeriesRecords.
+        """
+        statement = select(*SERIES_RECORD_COLUMNS).order_by(
+            RecurringMeetings.id).execution_options(
+            query_name="get_series_list")
+        if active_after is not None:
+            statement = statement.where(or_(RecurringMeetings.until == None,
+                RecurringMeetings.until >= active_after))
+        return list(map(SeriesRecord._make, 
+            self.__db_session.execute(statement)))
+
+    def get_next_occurrences(self, after: datetime, 
+            limit: int = 1) -> list[MeetingRecord]:
+        """get_next_occurrences
+
+        Like `get_next_mtgs`, but also with the occurrences of recurring
+        meetings. The occurrences are generated, not read, so the cost
+        depends on the number of series and not on their length.
+
+        Args:
+            after: Meetings at or after this time are returned.
+            limit: The maximum number of meetings. Defaults to 1.
+
+        Returns:
+            list: MeetingRecords, ordered by time.
+        """
+        return list(islice(heapq.merge(self.get_next_mtgs(after, limit), 
+            merge_occurrences(self.get_series_list(after), after, 
+            limit=limit), key=attrgetter("mtg_time", "id")), limit))
+
+    def get_occurrences_between(self, start: datetime, 
+            end: datetime) -> list[MeetingRecord]:
+        """get_occurrences_between
+
+        Generates the occurrences of the recurring meetings with 
+        start <= time < end.
+
+        Args:
+            start: The start of the range (inclusive).
+            end: The end of the range (exclusive).
+
+        Returns:
+            list: MeetingRecords, ordered by time.
+        """
+        return merge_occurrences(self.get_series_list(start), start, end)
+
     def get_mtg_with_time(self, time: datetime) -> list[Query]:
         """get_mtg_with_time 
 
@@ -296,13 +1104,9 @@ class DatabaseHandler():
         Used for checking if it is time to join the meeting.
 
         Note:
-            This API is not used and is kept for the future. The reason 
-            is that this heavily depends on the seconds parameter, and
-            if the autojoiner checks for meetings every second, it will
-            consume too many resources.
-
-            If you have a solution to this problem, please fork the 
-            repo and feel free to open a PR.
+            This is an exact match, so it heavily depends on the seconds
+            parameter. Use `get_mtgs_between` or `get_next_mtgs` to 
+            look for due meetings.
 
         Args:
             time: The time filter.
@@ -313,10 +1117,60 @@ class DatabaseHandler():
                 in each an object.
         """
         query = self.__db_session.query(Meetings).filter(Meetings.mtg_time \
-            == time).order_by(Meetings.mtg_time)
+            == time).order_by(Meetings.mtg_time).execution_options(
+            query_name="get_mtg_with_time")
         # logger.debug(type(query))
         return query
 
+    def add_mtgs(self, meetings: Iterable[dict[str, Any]],
+            auto_commit: bool = False) -> int:
+        """add_mtgs
+
+        Adds many meetings with one executemany INSERT. Meant for bulk
+        imports, which call it once per chunk and commit at the end, so
+        the whole import is one transaction.
+
+        Args:
+            meetings:
+                Dicts with the keys "mtg_id", "mtg_password", "mtg_time"
+                and optionally "mtg_provider" (defaults to "ZM").
+            auto_commit: Whether to autosave changes. Defaults to False.
+
+        Returns:
+            int: The number of meetings added.
+        """
+        rows = [{
+            "mtg_provider" : mtg.get("mtg_provider") or "ZM",
+            "mtg_id" : mtg["mtg_id"],
+            "mtg_password" : mtg["mtg_password"],
+            "mtg_time" : mtg["mtg_time"]
+        } for mtg in meetings]
+        with self.__writing(auto_commit):
+            if rows:
+                self.__db_session.execute(insert(Meetings).execution_options(
+                    query_name="add_mtgs"), rows)
+                if ("bulk_add", None) not in self.__pending_changes:
+                    self.__log_change("bulk_add", None)
+        return len(rows)
+
+    def iter_mtgs(self, chunk_size: int = 1000) -> Iterator[MeetingRecord]:
+        """iter_mtgs
+
+        Streams all meetings, ordered by time, fetching `chunk_size` 
+        rows at a time instead of loading the whole table.
+
+        Args:
+            chunk_size: Rows fetched per round trip. Defaults to 1000.
+
+        Yields:
+            MeetingRecord: The meeting data.
+        """
+        result = self.__db_session.execute(self.__select_mtgs(),
+            execution_options={"yield_per" : chunk_size, 
+            "query_name" : "iter_mtgs"})
+        for partition in result.partitions():
+            yield from map(MeetingRecord._make, partition)
+
     def truncate_table(self, auto_commit: bool = True) -> None:
         """truncate_table 
         
@@ -330,34 +1184,380 @@ class DatabaseHandler():
 
         .. _cryptocurrency-portfolio: https://tinyurl.com/48a7y5cw
         """
-        # Remove all meetings
-        self.__db_session.query(Meetings).delete()
-        if auto_commit:
-            self.commit_changes()
+        with self.__writing(auto_commit):
+            # Remove all meetings
+            self.__db_session.query(Meetings).execution_options(
+                query_name="truncate_table").delete()
+            self.__log_change("truncate", None)
+
 
+    def rollback_changes(self) -> None:
+        """Throw away the changes that were not committed"""
+        self.__db_session.rollback()
+        self.__pending_changes.clear()
+        # Reads made since the last commit may show the undone changes.
+        self.__cache.clear()
 
     def commit_changes(self) -> None:
-        """Make changes reflect in database"""
-        self.__db_session.commit()
+        """Make changes reflect in database. If the commit fails, the
+        changes are rolled back, and the error re-raised."""
+        try:
+            self.__db_session.commit()
+        except:
+            self.rollback_changes()
+            raise
+
+        # Only now can other threads read the changes, so the cached reads
+        # are dropped here, not when the changes are made.
+        changes = self.__pending_changes[:]
+        self.__pending_changes.clear()
+        for action, record_id in changes:
+            if not self.is_series_action(action):
+                self.__invalidate(record_id)
+        self.__notify(changes)
+
+
+class ATLError(ValueError):
+    """An ATL script is not valid."""
+
+
+class ATLInstruction(NamedTuple):
+    """One operation of a compiled ATL step. `args` are checked and
+    converted: images are file names, timeouts floats, and text is a
+    tuple of (literal, variable or None) parts."""
+    op: str
+    args: tuple
+
+
+class ATLStep(NamedTuple):
+    """A named step of a compiled ATL script."""
+    name: str
+    instructions: tuple[ATLInstruction, ...]
+
+
+class ATLPlan(NamedTuple):
+    """A compiled ATL script: its steps, and the images they use."""
+    name: str
+    steps: tuple[ATLStep, ...]
+    images: tuple[str, ...]
+    digest: str
 
 
 class ATLParser():
     """
     AuTomation Language (ATL) parser
 
-    This class parses ATL code, wj=hick ends in the file extension
-    .atl. These are simple JSON files. For the format, see 
-    specification.atl in the 'scripts' folder.
+    This class parses ATL code, which ends in the file extension .atl.
+    These are simple JSON files, that list the steps of a join:
 
-    ATL code will be used internally by Zoom Autojoiner to enable 
-    joining of meetings on different platforms (OSes).
+        {
+            "name": "Zoom desktop client",
+            "steps": [
+                {"step": "open_zoom", "do": [["click", "zoom_taskbar.png"]]},
+                {"step": "type_mtg_id", "do": [["write", "{mtg_id}"]]},
+                ...
+            ]
+        }
 
-    Note:
-        The ATL parser will be implemented as an extension and not in
-        the ZAJ core. Infact, this idea may be DROPPED itself, as it
-        can impact performance.
+    Every step is a list of operations:
+
+        ["click", image, timeout]   Wait for an image, click its centre.
+        ["wait", image, timeout]    Wait for an image to appear.
+        ["write", text]             Type text. {mtg_id}, {password} and
+                                    {name} are replaced; {{ is a brace.
+        ["hotkey", key, key, ...]   Press keys together.
+        ["press", key]              Press one key.
+        ["sleep", seconds]          Pause.
+
+    The timeouts are optional, and default to the Autojoiner's.
+
+    ATL code lets Zoom Autojoiner join meetings on different platforms
+    (OSes) without code changes. A script is parsed and validated once,
+    into an immutable ATLPlan, which the Autojoiner runs. Plans are
+    cached by the SHA-256 of the file, so an edited script is compiled
+    once, and an unchanged one is not read again until its file changes.
     """
-    pass
+    #: dict : Operation: (argument kinds, least arguments), where a
+    #: kind ending in "*" repeats.
+    OPERATIONS = {
+        "click" : (("image", "seconds"), 1),
+        "wait" : (("image", "seconds"), 1),
+        "write" : (("text",), 1),
+        "hotkey" : (("key*",), 1),
+        "press" : (("key",), 1),
+        "sleep" : (("seconds",), 1)
+    }
+
+    #: frozenset : The variables `write` can use.
+    VARIABLES = frozenset(("mtg_id", "password", "name"))
+
+    __plans: dict[str, ATLPlan] = {}             # digest: plan
+    __files: dict[str, tuple[Any, str]] = {}     # path: (stat, digest)
+    __lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str) -> ATLPlan:
+        """load
+
+        Get the compiled plan of a script file. Costs a stat while the
+        file is unchanged, a hash if it was touched, and a compile only
+        if its content is new.
+
+        Args:
+            path: The .atl file.
+
+        Returns:
+            ATLPlan: The plan.
+
+        Raises:
+            OSError: The file cannot be read.
+            ATLError: The script is not valid.
+        """
+        stat = os.stat(path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        with cls.__lock:
+            known = cls.__files.get(path)
+            if known is not None and known[0] == version:
+                return cls.__plans[known[1]]
+
+        with open(path, "rb") as file_handle:
+            source = file_handle.read()
+        digest = hashlib.sha256(source).hexdigest()
+        with cls.__lock:
+            plan = cls.__plans.get(digest)
+        if plan is None:
+            plan = cls.compile(source.decode("utf-8"), digest=digest)
+            logger.info("ATL - Compiled %s (%d steps)", path, 
+                len(plan.steps))
+        with cls.__lock:
+            cls.__plans[digest] = plan
+            cls.__files[path] = (version, digest)
+        return plan
+
+    @classmethod
+    def compile(cls, source: Union[str, dict], digest: str = None
+            ) -> ATLPlan:
+        """compile
+
+        Parse and validate ATL code.
+
+        Args:
+            source: The JSON text, or the already parsed script.
+            digest: Stored in the plan. Defaults to the SHA-256 of the
+                JSON text.
+
+        Returns:
+            ATLPlan: The plan.
+
+        Raises:
+            ATLError: The script is not valid.
+        """
+        if isinstance(source, str):
+            if digest is None:
+                digest = hashlib.sha256(source.encode("utf-8")).hexdigest()
+            try:
+                script = json.loads(source)
+            except ValueError as e:
+                raise ATLError("Not valid JSON: %s" % e)
+        else:
+            script = source
+            if digest is None:
+                digest = hashlib.sha256(json.dumps(script, 
+                    sort_keys=True).encode("utf-8")).hexdigest()
+
+        if not isinstance(script, dict) or not isinstance(
+                script.get("steps"), list) or not script["steps"]:
+            raise ATLError("A script must be an object with a non-empty "
+                "list of steps")
+        steps = []
+        images = []
+        for number, step in enumerate(script["steps"], 1):
+            if not isinstance(step, dict) or not isinstance(
+                    step.get("step"), str) or not isinstance(
+                    step.get("do"), list):
+                raise ATLError("Step %d: needs a \"step\" name and a "
+                    "\"do\" list" % number)
+            instructions = []
+            for operation in step["do"]:
+                where = "Step %d (%s)" % (number, step["step"])
+                instruction = cls.__compile_operation(operation, where)
+                if instruction.op in ("click", "wait") \
+                        and instruction.args[0] not in images:
+                    images.append(instruction.args[0])
+                instructions.append(instruction)
+            steps.append(ATLStep(step["step"], tuple(instructions)))
+        return ATLPlan(str(script.get("name", "")), tuple(steps), 
+            tuple(images), digest)
+
+    @classmethod
+    def __compile_operation(cls, operation: Any, where: str
+            ) -> ATLInstruction:
+        """Check one operation and convert its arguments."""
+        if not isinstance(operation, list) or not operation \
+                or operation[0] not in cls.OPERATIONS:
+            raise ATLError("%s: unknown operation %r, expected one of %s" % (
+                where, operation, ", ".join(cls.OPERATIONS)))
+        op, args = operation[0], operation[1:]
+        kinds, least = cls.OPERATIONS[op]
+        repeats = kinds[-1].endswith("*")
+        if len(args) < least or (not repeats and len(args) > len(kinds)):
+            raise ATLError("%s: wrong number of arguments for %s: %d" % (
+                where, op, len(args)))
+
+        converted = []
+        for index, arg in enumerate(args):
+            kind = kinds[min(index, len(kinds) - 1)].rstrip("*")
+            if kind == "seconds":
+                if isinstance(arg, bool) or not isinstance(arg, 
+                        (int, float)) or arg < 0:
+                    raise ATLError("%s: %s needs a number of seconds, not "
+                        "%r" % (where, op, arg))
+                converted.append(float(arg))
+            elif not isinstance(arg, str) or not arg:
+                raise ATLError("%s: %s needs a %s, not %r" % (where, op, 
+                    kind, arg))
+            elif kind == "text":
+                converted.append(cls.__compile_text(arg, where))
+            else:
+                converted.append(arg)
+        return ATLInstruction(op, tuple(converted))
+
+    @classmethod
+    def __compile_text(cls, text: str, where: str) -> tuple:
+        """Split text into (literal, variable or None) parts. Variables
+        are typed as they are, so conversions ({name!r}) and format
+        specs ({name:>5}) are refused."""
+        try:
+            fields = list(string.Formatter().parse(text))
+        except ValueError as e:
+            raise ATLError("%s: %s in %r" % (where, e, text))
+        for literal, field, spec, conversion in fields:
+            if field is None:
+                continue
+            if field not in cls.VARIABLES:
+                raise ATLError("%s: unknown variable {%s}, expected one of "
+                    "%s" % (where, field, ", ".join(sorted(cls.VARIABLES))))
+            if spec or conversion:
+                raise ATLError("%s: {%s} cannot have a conversion or a "
+                    "format spec in %r" % (where, field, text))
+        return tuple((literal, field) for literal, field, spec, conversion
+            in fields)
+
+
+class ImageTemplateCache():
+    """ImageTemplateCache
+
+    Keeps the autojoiner's screenshots decoded in memory, as grayscale
+    images ready for matching, so a join does not re-read and decode
+    the PNGs at every step. An entry is reloaded when its file's
+    modification time changes.
+
+    Every entry also remembers where on the screen its button was last
+    found. The next search looks around that spot first, and only
+    searches the whole screen if the button has moved.
+
+    Args:
+        get_image_path: Callable that turns a file name into a path.
+        margin: Pixels added around the last match when searching it.
+        driver: The AutomationDriver that decodes and finds the images.
+    """
+    def __init__(self, get_image_path: Callable[[str], str], 
+            margin: int = 50, driver: AutomationDriver = None) -> None:
+        self.__get_image_path = get_image_path
+        self.margin = margin
+        self.driver = driver or make_driver()
+
+        # filename -> {"path", "mtime", "image", "last_box"}
+        self.__entries: dict[str, dict[str, Any]] = {}
+        self.__lock = threading.Lock()
+
+    def get(self, filename: str) -> dict[str, Any]:
+        """get
+
+        Get the cache entry of an image, loading it if it is not cached
+        or if the file has changed.
+
+        Args:
+            filename: The name of the image file.
+
+        Returns:
+            dict: The entry, with the decoded "image" and "last_box".
+        """
+        path = self.__get_image_path(filename)
+        mtime = self.driver.template_version(path)
+        with self.__lock:
+            entry = self.__entries.get(filename)
+            if entry is None or entry["path"] != path \
+                    or entry["mtime"] != mtime:
+                entry = {"path": path, "mtime": mtime, 
+                    "image": self.driver.load_template(path), 
+                    "last_box": None}
+                self.__entries[filename] = entry
+                logger.debug("Template %s loaded", filename)
+            return entry
+
+    def preload(self, filenames: Iterable[str]) -> None:
+        """preload
+
+        Load images into the cache. Missing files are logged and
+        skipped.
+
+        Args:
+            filenames: The names of the image files.
+        """
+        for filename in filenames:
+            try:
+                self.get(filename)
+            except:
+                logger.warning("Could not preload template %s", filename,
+                    exc_info=True)
+
+    def invalidate(self, filename: Optional[str] = None) -> None:
+        """invalidate
+
+        Drop one entry, or the whole cache.
+
+        Args:
+            filename: The entry to drop. Drops everything if None.
+        """
+        with self.__lock:
+            if filename is None:
+                self.__entries.clear()
+            else:
+                self.__entries.pop(filename, None)
+
+    def locate(self, filename: str) -> Optional[tuple[int, int, int, int]]:
+        """locate
+
+        Find an image on the screen, trying the region where it was
+        last found before searching the whole screen.
+
+        Args:
+            filename: The name of the image file.
+
+        Returns:
+            The (left, top, width, height) box, or None if not found.
+        """
+        entry = self.get(filename)
+        box = None
+        if entry["last_box"] is not None:
+            box = self.driver.locate(entry["image"], 
+                self.__search_region(entry["last_box"]))
+        if box is None:
+            box = self.driver.locate(entry["image"])
+        if box is not None:
+            entry["last_box"] = tuple(int(v) for v in box)
+        return entry["last_box"] if box is not None else None
+
+    def __search_region(self, box: tuple[int, int, int, int]
+            ) -> tuple[int, int, int, int]:
+        """The last match grown by `margin`, clipped to the screen."""
+        screen_width, screen_height = self.driver.screen_size()
+        left = max(box[0] - self.margin, 0)
+        top = max(box[1] - self.margin, 0)
+        right = min(box[0] + box[2] + self.margin, screen_width)
+        bottom = min(box[1] + box[3] + self.margin, screen_height)
+        return (left, top, right - left, bottom - top)
 
 
 class Autojoiner():
@@ -371,12 +1571,266 @@ class Autojoiner():
         This class may be moved to an extension in the next major
         release.
 
+    Each step of a join waits for its button to appear, instead of
+    sleeping for a fixed time, so joins finish as fast as the Zoom
+    client allows.
+
+    Every join is traced step by step (see tracing.py) into `traces`,
+    a ring of the last [autojoiner] trace_keep joins.
+
+    The screen, mouse and keyboard are used through an AutomationDriver
+    (see drivers.py), so that joins can run against a FakeDriver.
+
+    The steps of a join come from an ATL script (see ATLParser), so
+    they can be changed for other platforms without code changes.
+
+    In the "uri" join mode, a meeting is first joined by handing a
+    zoommtg:// URI to the system, which takes about a second and does
+    not depend on the layout of the Zoom window. The ATL script is only
+    run if no application took the URI.
+
     Args:
         image_dir: The directory where images are stored.
+        step_timeout: 
+            Seconds to wait for a button before giving up. Defaults to
+            the [autojoiner] step_timeout option.
+        poll_interval: 
+            Seconds between looks for a button. Defaults to the 
+            [autojoiner] poll_interval option.
+        type_interval: 
+            Seconds between typed characters. Defaults to the 
+            [autojoiner] type_interval option.
+        dbh: The DatabaseHandler to use. Defaults to one for DB_URL.
+        driver: 
+            The AutomationDriver to join with. Defaults to the one named
+            by the [autojoiner] driver option.
+        script:
+            The ATL script to join with. Defaults to the [autojoiner]
+            script option. "" uses DEFAULT_SCRIPT.
+        join_mode:
+            "uri" or "gui". Defaults to the [autojoiner] join_mode
+            option.
     """
-    def __init__(self, image_dir: str = "") -> None:
-        self.__dbh = DatabaseHandler(DB_URL) # dbh is DB handle
+
+    #: tuple : The join modes.
+    JOIN_MODES = ("uri", "gui")
+
+    #: str : The join URI, without the query.
+    JOIN_URI = "zoommtg://zoom.us/join"
+
+
+    #: str : The ATL script used when [autojoiner] script is empty or
+    #: cannot be loaded: the Zoom desktop client, as installed with the
+    #: package.
+    DEFAULT_SCRIPT = os.path.join(os.path.dirname(os.path.realpath(
+        __file__)), "scripts", "zoom_desktop.atl")
+
+    def __init__(self, image_dir: str = "", 
+            step_timeout: float = None,
+            poll_interval: float = None,
+            type_interval: float = None,
+            dbh: DatabaseHandler = None,
+            driver: AutomationDriver = None,
+            script: str = None,
+            join_mode: str = None) -> None:
+        # dbh is DB handle
+        self.__dbh = dbh or DatabaseHandler(constants.DB_URL)
         self.IMG_DIR = image_dir # e.g /usr/share/
+        self.step_timeout = constants.JOIN_STEP_TIMEOUT \
+            if step_timeout is None else step_timeout
+        self.poll_interval = constants.JOIN_POLL_INTERVAL \
+            if poll_interval is None else poll_interval
+        self.type_interval = constants.JOIN_TYPE_INTERVAL \
+            if type_interval is None else type_interval
+        self.script = constants.JOIN_SCRIPT if script is None else script
+        self.join_mode = join_mode or constants.JOIN_MODE
+        if self.join_mode not in self.JOIN_MODES:
+            raise ValueError("Unknown join mode %r" % self.join_mode)
+        #: AutomationDriver : Drives the screen, mouse and keyboard.
+        self.driver = driver or make_driver(constants.JOIN_DRIVER)
+        #: ImageTemplateCache : Decoded screenshots and last positions.
+        self.templates = ImageTemplateCache(self.get_image_path, 
+            driver=self.driver)
+        #: TraceRing : The traces of the last joins.
+        self.traces = TraceRing(constants.JOIN_TRACE_DIR, 
+            constants.JOIN_TRACE_KEEP)
+        self.__trace: Optional[JoinTrace] = None # Of the running join
+
+    def load_automation(self) -> None:
+        """load_automation
+
+        Import the automation libraries and decode the screenshots, so
+        the first join does not pay for it. Meant to be called on the
+        join worker thread shortly before a meeting.
+        """
+        self.driver.load()
+        self.templates.preload(self.get_plan().images)
+
+    def build_join_uri(self, mtg_id: str, password: str) -> str:
+        """build_join_uri
+
+        Args:
+            mtg_id: Meeting ID. Spaces and dashes are dropped.
+            password: Meeting Passcode. May be empty.
+
+        Returns:
+            str: The zoommtg:// URI that joins the meeting as MY_NAME.
+        """
+        query = {"action" : "join", 
+            "confno" : "".join(mtg_id.split()).replace("-", "")}
+        if password:
+            query["pwd"] = password
+        if constants.MY_NAME:
+            query["uname"] = constants.MY_NAME
+        return "%s?%s" % (self.JOIN_URI, urlencode(query, quote_via=quote))
+
+    def join_by_uri(self, mtg_id: str, password: str) -> bool:
+        """join_by_uri
+
+        Hand the meeting's join URI to the driver's URL handler.
+
+        Args:
+            mtg_id: Meeting ID
+            password: Meeting Passcode
+
+        Returns:
+            bool: Whether an application took the URI.
+        """
+        return self.driver.open_uri(self.build_join_uri(mtg_id, password))
+
+    def get_plan(self) -> ATLPlan:
+        """get_plan
+
+        Returns:
+            ATLPlan: The compiled join script. That of DEFAULT_SCRIPT if
+            there is no script, or it cannot be loaded.
+
+        Raises:
+            OSError: DEFAULT_SCRIPT cannot be read.
+            ATLError: DEFAULT_SCRIPT is not valid.
+        """
+        if self.script:
+            try:
+                return ATLParser.load(self.script)
+            except (OSError, ATLError):
+                logger.error("ATL - Cannot load %s, using the packaged "
+                    "script", self.script, exc_info=True)
+        return ATLParser.load(self.DEFAULT_SCRIPT)
+
+    def run_plan(self, plan: ATLPlan, variables: dict[str, str],
+            timings: list) -> None:
+        """run_plan
+
+        Run the steps of a compiled ATL script, timing each one.
+
+        Args:
+            plan: The plan.
+            variables: The values of {mtg_id}, {password} and {name}.
+            timings: List the (step, seconds) pairs are appended to.
+
+        Raises:
+            Exception: The error that stopped the plan.
+        """
+        driver = self.driver
+        type_interval = self.type_interval
+
+        def write(parts: tuple) -> None:
+            driver.write("".join(literal if field is None 
+                else literal + variables[field] for literal, field in parts),
+                interval=type_interval)
+
+        operations = {
+            "click" : self.click_image,
+            "wait" : self.wait_for_image,
+            "write" : write,
+            "hotkey" : driver.hotkey,
+            "press" : driver.press,
+            "sleep" : time.sleep
+        }
+        for step in plan.steps:
+            with self.timed_step(step.name, timings):
+                for op, args in step.instructions:
+                    operations[op](*args)
+
+    def wait_for_image(self, filename: str, timeout: float = None
+            ) -> tuple[int, int, int, int]:
+        """wait_for_image
+
+        Wait until an image appears on the screen, looking for it every
+        `poll_interval` seconds.
+
+        Args:
+            filename (str): The name of the image file.
+            timeout (float, optional):
+                Seconds to wait. Defaults to `step_timeout`.
+
+        Returns:
+            tuple: The (left, top, width, height) box of the image.
+
+        Raises:
+            TimeoutError: If the image did not appear in time.
+        """
+        timeout = self.step_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        searching = 0.0 # Seconds spent in locate, without the sleeps
+        attempts = 0
+        box = None
+        try:
+            while True:
+                start = time.perf_counter()
+                box = self.templates.locate(filename)
+                searching += time.perf_counter() - start
+                attempts += 1
+                if box is not None:
+                    return box
+                if time.monotonic() >= deadline:
+                    raise TimeoutError("%s did not appear within %.1f s" 
+                        % (filename, timeout))
+                time.sleep(self.poll_interval)
+        finally:
+            if self.__trace is not None:
+                self.__trace.record_locate(filename, searching, attempts,
+                    box)
+
+    def click_image(self, filename: str, timeout: float = None) -> None:
+        """click_image
+
+        Wait for an image to appear on the screen and click its centre.
+
+        Args:
+            filename (str): The name of the image file.
+            timeout (float, optional):
+                Seconds to wait. Defaults to `step_timeout`.
+
+        Raises:
+            TimeoutError: If the image did not appear in time.
+        """
+        left, top, width, height = self.wait_for_image(filename, timeout)
+        self.driver.click(left + width // 2, top + height // 2)
+
+    @contextmanager
+    def timed_step(self, name: str, timings: list) -> Iterator[None]:
+        """timed_step
+
+        Context manager that times one step of a join, observes it in
+        the JOIN_STEP metric and records it in the join's trace.
+
+        Args:
+            name: The name of the step.
+            timings: List the (name, seconds) pair is appended to.
+        """
+        start = time.perf_counter()
+        try:
+            if self.__trace is None:
+                yield
+            else:
+                with self.__trace.step(name):
+                    yield
+        finally:
+            elapsed = time.perf_counter() - start
+            timings.append((name, elapsed))
+            JOIN_STEP.observe(elapsed, step=name)
+            logger.debug("Join step %s took %.3f s", name, elapsed)
 
     def get_image_path(self, filename: str) -> str:
         """get_image_path 
@@ -412,74 +1866,204 @@ class Autojoiner():
         # Return the file directory.
         return img_directory + final_filename
 
-    def check_for_meeting(self) -> Union[dict, bool]:
+    def check_for_meeting(self) -> Union[MeetingRecord, bool]:
         """check_for_meeting 
         
-        Checks if there is a meeting at the current time.
-
-        Returns:
-            Optional[dict, bool]: 
-                Returns list of meetings, if a meeting is present at
-                that time.
-        """
-        logger.debug("Check For Meeting Block entered")
-        mtgs_list = self.__dbh.get_mtg_data_to_list()
-        logger.debug(str(mtgs_list))
-        now = datetime.now()
-        now_string = now.strftime("%d-%m-%y %H:%M")
-        logger.debug("Nowstring %s", now_string)
-        return_str = ""
-        return_dict = {}
-        for mtg_dict in mtgs_list:
-            mtg_date = mtg_dict["mtg_time"].strftime("%d-%m-%y %H:%M")
-            logger.debug("Mtg date string %s", mtg_date)
-            if mtg_date == now_string:
-                logger.debug("True")
-                return_str = True
-                return_dict = mtg_dict
-            else:
-                logger.debug("False")
-                return_str = False
-        
-        logger.debug("Return Dict %s", str(return_dict))
-        return return_dict if return_str else False
+        Checks if there is a meeting in the current minute. Only the
+        meetings of that minute are read, through the index on 
+        mtg_time.
 
-    def join_zm_mtg(self, id: str, password: str) -> None:
+        Returns:
+            Union[MeetingRecord, bool]: 
+                The first meeting of the current minute, or False if
+                there is none.
+        """
+        minute = datetime.now().replace(second=0, microsecond=0)
+        mtgs_list = self.__dbh.get_mtgs_between(minute, 
+            minute + timedelta(minutes=1))
+        if not mtgs_list:
+            return False
+        logger.debug("Meeting %s is now", mtgs_list[0].id)
+        return mtgs_list[0]
+
+    def __join_fast(self, mtg_id: str, password: str, timings: list
+            ) -> bool:
+        """Try `join_by_uri` as a traced step. Returns whether it
+        worked; errors are logged, so the caller can fall back."""
+        try:
+            with self.timed_step("open_uri", timings):
+                if self.join_by_uri(mtg_id, password):
+                    return True
+                raise RuntimeError("No application took the join URI")
+        except Exception:
+            logger.warning("Could not join through the URI, falling back "
+                "to the GUI", exc_info=True)
+            return False
+
+    def join_zm_mtg(self, id: str, password: str) -> bool:
         """join_zm_mtg
 
-        Joins a zoom meeting
+        Joins a zoom meeting, through its join URI in the "uri" mode, or
+        else (or if that fails) by running the ATL script. This can 
+        block for many seconds, so the GUI should run it through a 
+        JoinWorker.
 
         Args:
             id (str): Meeting ID
             password (str): Meeting Passcode
+
+        Returns:
+            bool: Whether the meeting was joined.
         """
+        timings = []
+        self.__trace = trace = JoinTrace(id)
         try:
-            # IMG_DIR = self.IMG_DIR
-            # (start_x, start_y) = pyautogui.center(pyautogui.locateOnScreen(IMG_DIR + "start.png"))
-            # print(start_x, start_y)
-            pyautogui.click(self.get_image_path("zoom_taskbar.png"))
-            time.sleep(0.75)
-            pyautogui.click(self.get_image_path("join_btn.png"))
-            time.sleep(0.75)
-            pyautogui.write(id, interval=0.25)
-            time.sleep(0.75)
-            pyautogui.click(self.get_image_path("name_box.png"))
-            time.sleep(0.25)
-            pyautogui.hotkey('ctrl','a')
-            time.sleep(0.25)
-            pyautogui.press('backspace')
-            time.sleep(0.25)
-            pyautogui.write(MY_NAME, interval=0.25)
-            time.sleep(0.75)
-            pyautogui.click(self.get_image_path("join_btn_after_mtg_id.png"))
-            time.sleep(5)
-            pyautogui.write(password, interval=0.25)
-            time.sleep(0.75)
-            pyautogui.click(self.get_image_path("join_meeting_btn.png"))
-        except:
+            if self.join_mode == "uri" and self.__join_fast(id, password, 
+                    timings):
+                logger.info("Joined Meeting through its URI")
+            else:
+                plan = self.get_plan()
+                self.templates.preload(plan.images)
+                self.run_plan(plan, {"mtg_id" : id, "password" : password,
+                    "name" : constants.MY_NAME}, timings)
+        except Exception as e:
             logger.error("Failed to join meeting", exc_info=True)
+            JOINS.inc(result="failed")
+            trace.finish(False, e)
+            return False
         else:
             logger.info("Joined Meeting successfully")
+            JOINS.inc(result="joined")
+            trace.finish(True)
+            return True
+        finally:
+            logger.info("Join step timings: %s", LazyMessage(lambda: 
+                ", ".join("%s=%.3fs" % timing for timing in timings)))
+            self.__trace = None
+            try:
+                self.traces.append(trace)
+            except:
+                logger.warning("Failed to save the join trace", 
+                    exc_info=True)
+
+
+class JoinWorker():
+    """JoinWorker
+
+    Runs join jobs on a background thread, so that the Tk main loop
+    stays responsive while a meeting is being joined. Jobs are taken
+    from a thread-safe queue, one at a time.
+
+    Progress is put on the `progress` queue as (event, mtg_id, ok)
+    tuples, where event is "queued", "started" or "finished" and ok is
+    the result of the join (None until it finishes). The same events
+    are emitted as the join_started and join_finished hooks. Tk widgets
+    must not be touched from the worker thread, so the GUI reads this queue
+    with `after`; submit listeners tell it when to start reading.
+
+    Args:
+        autojoiner_handle: The Autojoiner used to join meetings.
+    """
+    #: str : The job that runs Autojoiner.load_automation.
+    WARM_UP = "warm_up"
+
+    def __init__(self, autojoiner_handle: Autojoiner) -> None:
+        self.__autojoiner_handle = autojoiner_handle
+        self.jobs: queue.Queue = queue.Queue()     # (mtg_id, password)
+        self.progress: queue.Queue = queue.Queue() # (event, mtg_id, ok)
+        self.__thread = None
+        self.__thread_lock = threading.Lock()
+        self.__submit_listeners: list[Callable[[], None]] = []
+
+    def add_submit_listener(self, callback: Callable[[], None]) -> None:
+        """add_submit_listener
+
+        Register a callable that is called, on the submitting thread,
+        every time a job is submitted.
+
+        Args:
+            callback: Called with no arguments.
+        """
+        self.__submit_listeners.append(callback)
+
+    def is_busy(self) -> bool:
+        """is_busy
+
+        Returns:
+            bool: Whether jobs are queued or running.
+        """
+        return self.jobs.unfinished_tasks > 0
+
+    def submit(self, mtg_id: str, password: str) -> None:
+        """submit
+
+        Queue a meeting to be joined. Returns at once.
+
+        Args:
+            mtg_id: Meeting ID
+            password: Meeting Passcode
+        """
+        self.__ensure_thread()
+        self.jobs.put((mtg_id, password))
+        self.progress.put(("queued", mtg_id, None))
+        for callback in list(self.__submit_listeners):
+            try:
+                callback()
+            except:
+                logger.error("Join worker submit listener failed", 
+                    exc_info=True)
+
+    def warm_up(self) -> None:
+        """warm_up
+
+        Load the automation libraries on the worker thread, ahead of a
+        join. Does not report progress.
+        """
+        self.__ensure_thread()
+        self.jobs.put(self.WARM_UP)
+
+    def stop(self) -> None:
+        """stop
+
+        Ask the worker thread to exit after the queued jobs.
+        """
+        with self.__thread_lock:
+            if self.__thread is not None and self.__thread.is_alive():
+                self.jobs.put(None)
+
+    def __ensure_thread(self) -> None:
+        """Start the worker thread if it is not running."""
+        with self.__thread_lock:
+            if self.__thread is None or not self.__thread.is_alive():
+                self.__thread = threading.Thread(target=self.__run, 
+                    name="JoinWorker", daemon=True)
+                self.__thread.start()
+
+    def __run(self) -> None:
+        """The worker thread's loop."""
+        while True:
+            job = self.jobs.get()
+            try:
+                if job is None:
+                    return
+                if job == self.WARM_UP:
+                    self.__autojoiner_handle.load_automation()
+                    continue
+                mtg_id, password = job
+                logger.info("Join worker - Joining meeting %s", mtg_id)
+                self.progress.put(("started", mtg_id, None))
+                HOOKS.emit("join_started", mtg_id=mtg_id)
+                ok = False
+                try:
+                    ok = self.__autojoiner_handle.join_zm_mtg(mtg_id, 
+                        password)
+                finally:
+                    self.progress.put(("finished", mtg_id, ok))
+                    HOOKS.emit("join_finished", mtg_id=mtg_id, ok=ok)
+            except:
+                logger.error("Join worker - Job failed", exc_info=True)
+            finally:
+                self.jobs.task_done()
 
 # Todo:
 # Finish theming class
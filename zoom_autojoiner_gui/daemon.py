@@ -0,0 +1,236 @@
+# This file is part of Zoom Autojoiner GUI.
+
+# Zoom Autojoiner GUI is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# Zoom Autojoiner GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with Zoom Autojoiner GUI.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Headless mode
+
+Runs the scheduler and the Autojoiner without a window, and without
+importing Tk, for unattended machines:
+
+    python -m zoom_autojoiner_gui --daemon
+
+Meetings are managed through the database, e.g. with the GUI on another
+machine or with an import. The daemon is controlled with signals:
+
+    SIGTERM, SIGINT   Stop, after the joins already queued.
+    SIGHUP            Re-read the meetings from the database now.
+    SIGUSR1           Log the next meeting and the join worker's state.
+"""
+
+import queue
+import signal
+import logging
+import threading
+from typing import Optional
+
+from zoom_autojoiner_gui import constants
+from zoom_autojoiner_gui.controllers import (
+    DatabaseHandler,
+    Autojoiner,
+    JoinWorker
+)
+from zoom_autojoiner_gui.scheduler import MeetingScheduler
+from zoom_autojoiner_gui.metrics import SCHEDULER_TICK
+
+
+logger = logging.getLogger(__name__)
+
+
+class AutojoinerDaemon():
+    """AutojoinerDaemon
+
+    The headless counterpart of ApplicationStatusBar: sleeps until the
+    next meeting is due and hands it to a JoinWorker.
+
+    Changes re-arm it through a DatabaseHandler change listener: those
+    committed by this process at once, and those of other processes 
+    when the change log is synced, every DB_SYNC_INTERVAL seconds. If
+    syncing is turned off, the meetings are re-read every 
+    RELOAD_INTERVAL seconds instead. SIGHUP re-reads them at once.
+
+    Args:
+        dbh: The DatabaseHandler to read meetings from. Defaults to one
+            for DB_URL.
+        autojoiner_handle: The Autojoiner to join with.
+        join_worker: The JoinWorker to join meetings with.
+    """
+    #: float : Seconds between two reads of the meetings, when the 
+    #: change log is not synced.
+    RELOAD_INTERVAL: float = 60.0
+
+    #: float : Load the automation libraries this many seconds before a
+    #: meeting.
+    WARM_UP_LEAD: float = 120.0
+
+    def __init__(self, dbh: Optional[DatabaseHandler] = None,
+            autojoiner_handle: Optional[Autojoiner] = None,
+            join_worker: Optional[JoinWorker] = None) -> None:
+        self.__dbh = dbh or DatabaseHandler(constants.DB_URL)
+        self.__autojoiner_handle = autojoiner_handle or Autojoiner(
+            constants.PYAG_PICS_DIR)
+        self.__join_worker = join_worker or JoinWorker(
+            self.__autojoiner_handle)
+        self.__scheduler = MeetingScheduler(self.__dbh)
+
+        self.__wake = threading.Event()    # Set to cut a sleep short
+        self.__stopping = False
+        self.__reload_requested = True
+        self.__status_requested = False
+        self.__warmed_up = False
+
+    def install_signal_handlers(self) -> None:
+        """install_signal_handlers
+
+        Handle the control signals. Must be called from the main thread.
+        Signals the platform does not have (SIGHUP and SIGUSR1 on
+        Windows) are skipped.
+        """
+        handlers = {
+            "SIGTERM" : self.stop,
+            "SIGINT" : self.stop,
+            "SIGHUP" : self.request_reload,
+            "SIGUSR1" : self.request_status
+        }
+        for name, handler in handlers.items():
+            signum = getattr(signal, name, None)
+            if signum is not None:
+                signal.signal(signum, lambda signum, frame, handler=handler:
+                    handler())
+
+    def stop(self) -> None:
+        """Stop the loop. Joins already queued are finished first."""
+        self.__stopping = True
+        self.__wake.set()
+
+    def request_reload(self) -> None:
+        """Re-read the meetings from the database."""
+        self.__reload_requested = True
+        self.__wake.set()
+
+    def request_status(self) -> None:
+        """Log the next meeting and the join worker's state."""
+        self.__status_requested = True
+        self.__wake.set()
+
+    def on_meetings_changed(self, action: str, record_id: int) -> None:
+        """DatabaseHandler change listener."""
+        self.request_reload()
+
+    def log_status(self) -> None:
+        """log_status
+
+        Log the next meeting and whether a join is running.
+        """
+        next_due = self.__scheduler.next_due()
+        logger.info("Daemon - next meeting at %s, join worker %s",
+            next_due or "(none)",
+            "busy" if self.__join_worker.is_busy() else "idle")
+
+    def log_join_progress(self) -> None:
+        """Log, and drain, the join worker's progress queue."""
+        try:
+            while True:
+                event, mtg_id, ok = self.__join_worker.progress.get_nowait()
+                if event == "finished":
+                    if ok:
+                        logger.info("Daemon - Joined meeting %s", mtg_id)
+                    else:
+                        logger.warning("Daemon - Could not join meeting %s",
+                            mtg_id)
+        except queue.Empty:
+            pass
+
+    def poll_database(self) -> None:
+        """Pick up the changes other processes made to the database."""
+        if constants.DB_SYNC_INTERVAL <= 0:
+            self.__reload_requested = True
+            return
+        try:
+            self.__dbh.sync_changes()
+        except:
+            logger.error("Daemon - Failed to fetch meeting changes",
+                exc_info=True)
+            self.__reload_requested = True
+
+    def tick(self) -> float:
+        """tick
+
+        Do one round of work: reload if asked to, hand the due meetings
+        to the join worker and warm it up ahead of the next one.
+
+        Returns:
+            float: The seconds to sleep before the next round.
+        """
+        if self.__reload_requested:
+            self.__reload_requested = False
+            try:
+                self.__scheduler.reload()
+            except:
+                logger.error("Daemon - Failed to load meetings",
+                    exc_info=True)
+
+        for mtg in self.__scheduler.pop_due():
+            logger.info("Daemon - Meeting now. Queueing join.")
+            self.__join_worker.submit(mtg.mtg_id, mtg.mtg_password)
+
+        self.log_join_progress()
+        if self.__status_requested:
+            self.__status_requested = False
+            self.log_status()
+
+        poll_interval = constants.DB_SYNC_INTERVAL if \
+            constants.DB_SYNC_INTERVAL > 0 else self.RELOAD_INTERVAL
+        delay = self.__scheduler.seconds_until_next()
+        if delay is None:
+            return poll_interval
+        if not self.__warmed_up:
+            if delay <= self.WARM_UP_LEAD:
+                self.__warmed_up = True
+                self.__join_worker.warm_up()
+            else:
+                # Wake up in time to warm up the join worker.
+                delay = delay - self.WARM_UP_LEAD
+        return min(delay, poll_interval)
+
+    def run(self) -> None:
+        """run
+
+        Loop until `stop` is called. Blocks.
+        """
+        logger.info("Daemon - Started")
+        DatabaseHandler.add_change_listener(self.on_meetings_changed)
+        try:
+            self.poll_database() # Note the current revision
+            while not self.__stopping:
+                with SCHEDULER_TICK.time(mode="daemon"):
+                    delay = self.tick()
+                if self.__wake.wait(delay):
+                    self.__wake.clear()
+                else:
+                    self.poll_database()
+        finally:
+            DatabaseHandler.remove_change_listener(self.on_meetings_changed)
+            self.__join_worker.stop()
+            self.__join_worker.jobs.join()
+            logger.info("Daemon - Stopped")
+
+
+def run_daemon() -> None:
+    """run_daemon
+
+    Run the headless autojoiner until it is signalled to stop.
+    """
+    daemon = AutojoinerDaemon()
+    daemon.install_signal_handlers()
+    daemon.run()
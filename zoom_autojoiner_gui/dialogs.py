@@ -5,8 +5,12 @@ import datetime
 import platform
 from zoom_autojoiner_gui.controllers import DatabaseHandler
 from zoom_autojoiner_gui.constants import DB_URL
+from zoom_autojoiner_gui.recurrence import FREQUENCIES, parse_weekdays
 
 class NewMeetingDialog(tk.Toplevel):
+    #: tuple : The choices of the Repeat box.
+    REPEAT_CHOICES = ("Never", "Daily", "Weekly")
+
     def __init__(self, tk_frame_handle = None, tk_root_element = None):
         """This class shows the New Meeting Dialog box."""
         # DB handle
@@ -42,7 +46,7 @@ class NewMeetingDialog(tk.Toplevel):
         self.title("New Meeting")
         #setting window size
         width=338
-        height=200
+        height=280
         screenwidth = self.winfo_screenwidth()
         screenheight = self.winfo_screenheight()
         alignstr = '%dx%d+%d+%d' % (width, height, (screenwidth - width) / 2, (screenheight - height) / 2)
@@ -91,6 +95,32 @@ class NewMeetingDialog(tk.Toplevel):
         self.MeetingPasscodeEntry=ttk.Entry(self)
         self.MeetingPasscodeEntry.place(x=110,y=120,width=220,height=30)
 
+        # Repeat Label
+        self.RepeatLabel=ttk.Label(self)
+        self.RepeatLabel["text"] = "Repeat"
+        self.RepeatLabel.place(x=0,y=160,width=101,height=30)
+
+        # Repeat Combobox - Never, Daily or Weekly
+        self.RepeatCombobox=ttk.Combobox(self, state="readonly",
+            values=self.REPEAT_CHOICES)
+        self.RepeatCombobox.current(0)
+        self.RepeatCombobox.place(x=110,y=160,width=100,height=30)
+        self.RepeatCombobox.bind("<<ComboboxSelected>>", 
+            self.RepeatCombobox_selected)
+
+        # Weekdays Entry, for weekly meetings, e.g. "Mon, Wed"
+        self.WeekdaysEntry=ttk.Entry(self, state="disabled")
+        self.WeekdaysEntry.place(x=220,y=160,width=110,height=30)
+
+        # Repeat Until Label
+        self.UntilLabel=ttk.Label(self)
+        self.UntilLabel["text"] = "Until"
+        self.UntilLabel.place(x=0,y=200,width=101,height=30)
+
+        # Repeat Until Entry, empty for no end
+        self.UntilEntry=ttk.Entry(self)
+        self.UntilEntry.place(x=110,y=200,width=220,height=30)
+
         # Create Meeting Button
         self.CreateMtgButton=ttk.Button(self)
         # CreateMtgButton["bg"] = "#f0f0f0"
@@ -99,7 +129,7 @@ class NewMeetingDialog(tk.Toplevel):
         # CreateMtgButton["fg"] = "#000000"
         # CreateMtgButton["justify"] = "center"
         self.CreateMtgButton["text"] = "Create"
-        self.CreateMtgButton.place(x=260,y=160,width=70,height=35)
+        self.CreateMtgButton.place(x=260,y=240,width=70,height=35)
         self.CreateMtgButton["command"] = self.CreateMtgButton_command
 
         # Cancel New Meeting Button
@@ -110,24 +140,41 @@ class NewMeetingDialog(tk.Toplevel):
         # CancelButton["fg"] = "#000000"
         # CancelButton["justify"] = "center"
         self.CancelButton["text"] = "Cancel"
-        self.CancelButton.place(x=170,y=160,width=70,height=35)
+        self.CancelButton.place(x=170,y=240,width=70,height=35)
         self.CancelButton["command"] = self.CancelButton_command
 
     def CreateMtgButton_command(self):
         try:
             datetimeobj=datetime.datetime.strptime(self.DateTimeEntry.get(), "%Y-%m-%d %H:%M:%S")
-            self.__dbh.add_mtg(self.MeetingIDEntry.get(), self.MeetingPasscodeEntry.get(), datetimeobj)
+            frequency = self.RepeatCombobox.get().lower()
+            if frequency in FREQUENCIES:
+                # Recurring meeting. Until is a date, or a date and time.
+                until = self.UntilEntry.get().strip()
+                until = datetime.datetime.fromisoformat(until) if until \
+                    else None
+                if until and until.time() == datetime.time():
+                    until = until.replace(hour=23, minute=59, second=59)
+                # Only weekly meetings repeat on weekdays.
+                weekdays = parse_weekdays(self.WeekdaysEntry.get()) \
+                    if frequency == "weekly" else ""
+                self.__dbh.add_series(self.MeetingIDEntry.get(), 
+                    self.MeetingPasscodeEntry.get(), datetimeobj, frequency,
+                    weekdays=weekdays, until=until)
+            else:
+                self.__dbh.add_mtg(self.MeetingIDEntry.get(), self.MeetingPasscodeEntry.get(), datetimeobj)
         except Exception as e:
             messagebox.showerror("Error", "An exception has occured.\nError Details:\n%s" % (str(e)))
         else:
+            # The meeting list frame updates itself from the change.
             messagebox.showinfo("Information", "Meeting Added.")
-            try:
-                self.tk_frame_handle.reload_table()
-            except:
-                messagebox.showinfo("Information", "Failed to refresh table data. Please refresh manually.")
             self.destroy()
             
 
+    def RepeatCombobox_selected(self, event=None):
+        # The weekdays can only be typed for weekly meetings.
+        weekly = self.RepeatCombobox.get() == "Weekly"
+        self.WeekdaysEntry["state"] = "normal" if weekly else "disabled"
+
     def CancelButton_command(self):
         self.destroy()
 
@@ -263,11 +310,8 @@ class EditMeetingDialog(tk.Toplevel):
         except Exception as e:
             messagebox.showerror("Error", "An exception has occured.\nError Details:\n%s" % (str(e)))
         else:
+            # The meeting list frame updates itself from the change.
             messagebox.showinfo("Information", "Meeting Updated.")
-            try:
-                self.tk_frame_handle.reload_table()
-            except:
-                messagebox.showinfo("Information", "Failed to refresh table data. Please refresh manually.")
             self.destroy()
             
 
@@ -285,10 +329,6 @@ class EditMeetingDialog(tk.Toplevel):
                 messagebox.showerror("Error", "An exception has occured.\nError Details:\n%s" % (str(e)))
             else:
                 messagebox.showinfo("Information", "Meeting Deleted.")
-                try:
-                    self.tk_frame_handle.reload_table()
-                except:
-                    messagebox.showinfo("Information", "Failed to refresh table data. Please refresh manually.")
                 self.destroy()
                 
     
@@ -0,0 +1,334 @@
+# This file is part of Zoom Autojoiner GUI.
+
+# Zoom Autojoiner GUI is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# Zoom Autojoiner GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with Zoom Autojoiner GUI.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Automation drivers
+
+The Autojoiner does not drive the mouse and keyboard itself, but
+through an AutomationDriver:
+
+    pyautogui   The real screen, mouse and keyboard (the default).
+    fake        A simulated Zoom client, with configurable latencies,
+                for running joins without a display or Zoom.
+
+The driver is picked with the [autojoiner] driver option, or passed to
+Autojoiner.
+"""
+
+import os
+import time
+import logging
+import platform
+import threading
+import subprocess
+from typing import Any, Optional
+
+from zoom_autojoiner_gui.startup import lazy_import
+
+
+logger = logging.getLogger(__name__)
+
+# The automation libraries pull in Pillow and the screenshot backends,
+# so they are only loaded when a meeting is joined.
+pyautogui = lazy_import("pyautogui")
+Image = lazy_import("PIL.Image")
+
+
+class AutomationDriver():
+    """AutomationDriver
+
+    The operations the Autojoiner needs from a screen, mouse and
+    keyboard. Boxes are (left, top, width, height) tuples.
+    """
+    #: str : The name of the driver in the config.
+    name = "base"
+
+    def load(self) -> None:
+        """Import and set up whatever the driver needs, ahead of a join."""
+
+    def template_version(self, path: str) -> Any:
+        """A value that changes when the image file at `path` does."""
+        return os.stat(path).st_mtime_ns
+
+    def load_template(self, path: str) -> Any:
+        """Read an image file into what `locate` takes."""
+        raise NotImplementedError
+
+    def screen_size(self) -> tuple[int, int]:
+        """The (width, height) of the screen."""
+        raise NotImplementedError
+
+    def locate(self, template: Any, region: Optional[tuple] = None
+            ) -> Optional[tuple[int, int, int, int]]:
+        """The box of a template on the screen, inside `region` if
+        given, or None if it is not shown."""
+        raise NotImplementedError
+
+    def click(self, x: int, y: int) -> None:
+        """Click at a point."""
+        raise NotImplementedError
+
+    def write(self, text: str, interval: float = 0.0) -> None:
+        """Type text, pausing `interval` seconds between characters."""
+        raise NotImplementedError
+
+    def hotkey(self, *keys: str) -> None:
+        """Press keys together, e.g. hotkey("ctrl", "a")."""
+        raise NotImplementedError
+
+    def press(self, key: str) -> None:
+        """Press and release one key."""
+        raise NotImplementedError
+
+    def open_uri(self, uri: str) -> bool:
+        """Hand a URI, e.g. zoommtg://..., to its application. Returns
+        whether it was handed over."""
+        return open_uri(uri)
+
+
+class PyAutoGuiDriver(AutomationDriver):
+    """PyAutoGuiDriver
+
+    Drives the real screen with pyautogui. Templates are grayscale
+    Pillow images.
+    """
+    name = "pyautogui"
+
+    def load(self) -> None:
+        pyautogui.size
+        Image.open
+
+    def load_template(self, path: str) -> Any:
+        with Image.open(path) as img:
+            return img.convert("L")
+
+    def screen_size(self) -> tuple[int, int]:
+        return tuple(pyautogui.size())
+
+    def locate(self, template: Any, region: Optional[tuple] = None
+            ) -> Optional[tuple[int, int, int, int]]:
+        # Newer PyScreeze versions raise instead of returning None.
+        not_found = getattr(pyautogui, "ImageNotFoundException", None)
+        try:
+            box = pyautogui.locateOnScreen(template, grayscale=True,
+                region=region)
+        except Exception as e:
+            if not_found is not None and isinstance(e, not_found):
+                return None
+            raise
+        return tuple(int(v) for v in box) if box is not None else None
+
+    def click(self, x: int, y: int) -> None:
+        pyautogui.click(x, y)
+
+    def write(self, text: str, interval: float = 0.0) -> None:
+        pyautogui.write(text, interval=interval)
+
+    def hotkey(self, *keys: str) -> None:
+        pyautogui.hotkey(*keys)
+
+    def press(self, key: str) -> None:
+        pyautogui.press(key)
+
+
+class FakeDriver(AutomationDriver):
+    """FakeDriver
+
+    A simulated screen. Images are known by their file name, and are
+    shown at a box from a given time on. Clicking an image can show
+    others after a delay, as a real application would. Every operation
+    sleeps for its configured latency, and is recorded in `actions`.
+
+    Use `zoom_client` for a screen that behaves like the Zoom client
+    through a join.
+
+    Args:
+        screen_size: The (width, height) of the screen.
+        locate_latency: Seconds a `locate` takes.
+        click_latency: Seconds a `click` takes.
+        key_latency: Seconds a key press takes. `write` takes this, or
+            its interval if longer, per character.
+        sleep: Called to wait. Defaults to time.sleep.
+    """
+    name = "fake"
+
+    def __init__(self, screen_size: tuple[int, int] = (1920, 1080),
+            locate_latency: float = 0.0, click_latency: float = 0.0,
+            key_latency: float = 0.0, sleep=time.sleep) -> None:
+        self.size = tuple(screen_size)
+        self.locate_latency = locate_latency
+        self.click_latency = click_latency
+        self.key_latency = key_latency
+        self.sleep = sleep
+
+        #: list : ("click", x, y), ("write", text), ("hotkey", keys),
+        #: ("press", key) and ("open_uri", uri) tuples, in order.
+        self.actions: list[tuple] = []
+        #: bool : What `open_uri` returns, as if there was a handler.
+        self.uri_handled = True
+        self.__shown: dict[str, tuple] = {}      # image: (box, from time)
+        self.__on_click: dict[str, list] = {} # image: [(show, box, delay)]
+        self.__lock = threading.Lock()
+
+    def show(self, image: str, box: tuple[int, int, int, int],
+            delay: float = 0.0) -> None:
+        """Show an image at `box`, `delay` seconds from now."""
+        with self.__lock:
+            self.__shown[image] = (tuple(box), time.monotonic() + delay)
+
+    def hide(self, image: str) -> None:
+        """Stop showing an image."""
+        with self.__lock:
+            self.__shown.pop(image, None)
+
+    def on_click(self, image: str, show: str, box: tuple[int, int, int, int],
+            delay: float = 0.0) -> None:
+        """When `image` is clicked, show `show` at `box` after `delay`."""
+        with self.__lock:
+            self.__on_click.setdefault(image, []).append((show, tuple(box),
+                delay))
+
+    @classmethod
+    def zoom_client(cls, app_delay: float = 0.0, dialog_delay: float = 0.0,
+            **kwargs: Any) -> "FakeDriver":
+        """zoom_client
+
+        A FakeDriver that plays the Zoom client through a join: the
+        taskbar icon is shown, and each button shows the next screen.
+
+        Args:
+            app_delay: Seconds the client takes to come to the front.
+            dialog_delay: Seconds each dialog takes to open.
+            **kwargs: The FakeDriver arguments.
+
+        Returns:
+            FakeDriver: The driver.
+        """
+        driver = cls(**kwargs)
+        driver.show("zoom_taskbar.png", (600, 1040, 40, 40))
+        driver.on_click("zoom_taskbar.png", "join_btn.png",
+            (800, 400, 120, 120), app_delay)
+        driver.on_click("join_btn.png", "name_box.png",
+            (760, 560, 400, 40), dialog_delay)
+        driver.on_click("join_btn.png", "join_btn_after_mtg_id.png",
+            (1000, 700, 100, 40), dialog_delay)
+        driver.on_click("join_btn_after_mtg_id.png", "join_meeting_btn.png",
+            (1000, 700, 140, 40), dialog_delay)
+        return driver
+
+    def template_version(self, path: str) -> Any:
+        return 0
+
+    def load_template(self, path: str) -> Any:
+        return os.path.basename(path)
+
+    def screen_size(self) -> tuple[int, int]:
+        return self.size
+
+    def locate(self, template: Any, region: Optional[tuple] = None
+            ) -> Optional[tuple[int, int, int, int]]:
+        self.sleep(self.locate_latency)
+        with self.__lock:
+            shown = self.__shown.get(template)
+        if shown is None or shown[1] > time.monotonic():
+            return None
+        box = shown[0]
+        if region is not None and not (region[0] <= box[0]
+                and region[1] <= box[1]
+                and box[0] + box[2] <= region[0] + region[2]
+                and box[1] + box[3] <= region[1] + region[3]):
+            return None
+        return box
+
+    def click(self, x: int, y: int) -> None:
+        self.sleep(self.click_latency)
+        self.actions.append(("click", x, y))
+        now = time.monotonic()
+        with self.__lock:
+            clicked = [image for image, (box, since) in self.__shown.items()
+                if since <= now and box[0] <= x < box[0] + box[2]
+                and box[1] <= y < box[1] + box[3]]
+            for image in clicked:
+                for show, box, delay in self.__on_click.get(image, []):
+                    self.__shown[show] = (box, now + delay)
+
+    def write(self, text: str, interval: float = 0.0) -> None:
+        self.sleep(max(self.key_latency, interval) * len(text))
+        self.actions.append(("write", text))
+
+    def hotkey(self, *keys: str) -> None:
+        self.sleep(self.key_latency)
+        self.actions.append(("hotkey", keys))
+
+    def press(self, key: str) -> None:
+        self.sleep(self.key_latency)
+        self.actions.append(("press", key))
+
+    def open_uri(self, uri: str) -> bool:
+        self.sleep(self.click_latency)
+        self.actions.append(("open_uri", uri))
+        return self.uri_handled
+
+
+def open_uri(uri: str, timeout: float = 10.0) -> bool:
+    """open_uri
+
+    Open a URI with the system's handler for its scheme: os.startfile
+    on Windows, `open` on macOS and `xdg-open` elsewhere.
+
+    Args:
+        uri: The URI.
+        timeout: Seconds to wait for the opener.
+
+    Returns:
+        bool: Whether the opener accepted it.
+    """
+    system = platform.system()
+    try:
+        if system == "Windows":
+            os.startfile(uri)
+            return True
+        command = ["open" if system == "Darwin" else "xdg-open", uri]
+        return subprocess.run(command, stdout=subprocess.DEVNULL, 
+            stderr=subprocess.DEVNULL, timeout=timeout).returncode == 0
+    except (OSError, subprocess.TimeoutExpired):
+        logger.warning("Could not open a %s URI", uri.split(":", 1)[0],
+            exc_info=True)
+        return False
+
+
+#: dict : The drivers, by config name.
+DRIVERS = {driver.name: driver for driver in (PyAutoGuiDriver, FakeDriver)}
+
+
+def make_driver(name: str = "pyautogui") -> AutomationDriver:
+    """make_driver
+
+    Args:
+        name: The config name of a driver. "fake" gives
+            FakeDriver.zoom_client().
+
+    Returns:
+        AutomationDriver: A new driver.
+
+    Raises:
+        ValueError: There is no such driver.
+    """
+    if name not in DRIVERS:
+        raise ValueError("Unknown automation driver %r" % name)
+    if name == FakeDriver.name:
+        logger.warning("Using the fake automation driver, meetings will "
+            "not really be joined")
+        return FakeDriver.zoom_client()
+    return DRIVERS[name]()
@@ -2,9 +2,11 @@ import logging
 import sys
 import os
 import json
+import time
 import tkinter as tk
 from importlib import import_module
 from configparser import ConfigParser
+from typing import Any, Callable, Optional
 
 # from zoom_autojoiner_gui.views import (
 #     MainWindow,
@@ -12,6 +14,7 @@ from configparser import ConfigParser
 #     MeetingListFrame
 # )
 from zoom_autojoiner_gui.constants import EXTENSIONS
+from zoom_autojoiner_gui.hooks import HOOKS
 
 
 logger = logging.getLogger(__name__) # This creates logger for this file.
@@ -27,6 +30,22 @@ class ExtensionHandler():
     This class deals with the handling of ZAJ
     Python Extensions. 
 
+    The window loads extensions one at a time on the Tk main loop, after
+    it has been painted (see `start`), instead of inside its __init__.
+    The import and each call into an extension are timed. An extension
+    that takes longer than `budget_ms` is loaded later (`over_budget =
+    defer`) or not at all (`over_budget = skip`) from the next start on.
+    The timings are kept in TIMINGS_FILE, with when they were taken and
+    the modification time of the extension's file. A timing older than
+    `retry_days`, or taken of an older file, no longer counts, so a 
+    skipped extension is tried again then, and timed anew.
+
+    An extension that defines `register_hooks(bus)` is given `hooks`, the
+    HookBus, to subscribe to the autojoiner's events (see hooks.py).
+    Its handlers run on the bus's threads, with `hook_timeout` seconds
+    each, so they cannot hold up the window or a join. They must not
+    touch the window or its widgets.
+
     Args:
         config: The Extensions Config dict.
 
@@ -34,6 +53,12 @@ class ExtensionHandler():
         NoneType
     """
     
+    #: str : Where the timings of the last load are saved.
+    TIMINGS_FILE = os.path.join("cache", "extension_timings.json")
+
+    #: int : How long (ms) deferred extensions wait after the others.
+    DEFER_DELAY = 5000
+
     #: tuple : The tuple of permissions.
     permissions = (
         "main_window",
@@ -58,6 +83,30 @@ class ExtensionHandler():
 
         self.extensions = {}
 
+        #: dict : Name: {"import": ms, "get_prefs": ms, ...} of the 
+        #: extensions loaded in this run.
+        self.timings = {}
+
+        #: float : The time budget of an extension, in ms. 0 for none.
+        self.budget_ms = self.basic_config.getfloat("budget_ms", 
+            fallback=0.0)
+        #: str : "defer" or "skip" the extensions over budget.
+        self.over_budget = self.basic_config.get("over_budget", 
+            fallback="defer")
+        #: float : After how many days an over budget extension is tried
+        #: again.
+        self.retry_days = self.basic_config.getfloat("retry_days", 
+            fallback=7.0)
+
+        #: HookBus : The bus extensions subscribe to.
+        self.hooks = HOOKS
+        self.hooks.timeout = self.basic_config.getfloat("hook_timeout", 
+            fallback=self.hooks.timeout)
+        self.hooks.workers = self.basic_config.getint("hook_workers", 
+            fallback=self.hooks.workers)
+
+        self.__enabled_extensions = None # Parsed by get_ext
+
         logger.debug(os.path.join(dir_path, "config", 
             self.basic_config['config'] + '.ini'))
 
@@ -70,7 +119,10 @@ class ExtensionHandler():
         Returns:
             The list of enabled extensions.
         """
-        return json.loads(self.config['enabled']['extensions'])
+        if self.__enabled_extensions is None:
+            self.__enabled_extensions = json.loads(
+                self.config['enabled']['extensions'])
+        return list(self.__enabled_extensions)
 
     def get_extension_permission(self, ext_name: str, 
             permission_name: str) -> bool:
@@ -117,6 +169,186 @@ class ExtensionHandler():
 
         return all_ext_ran
 
+    def __timed(self, extension: str, step: str, 
+            func: Callable[[], Any]) -> Any:
+        """Call `func`, adding its time to the extension's timings."""
+        start = time.perf_counter()
+        try:
+            return func()
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.timings.setdefault(extension, {})[step] = elapsed
+            logger.debug("Extension %s - %s took %.1f ms", extension, step,
+                elapsed)
+
+    def load_extension(self, extension: str, main_window: tk.Tk = None, 
+            menu_bar: tk.Menu = None, 
+            meeting_list_frame: tk.Frame = None) -> bool:
+        """load_extension
+
+        Import one extension, give it its preferences and objects, and
+        run it. On the way it subscribes to hooks. Each step is timed,
+        and the steps the extension does not implement are skipped.
+
+        Args:
+            extension: The name of the extension module.
+            main_window: The Main window of the ZAJ.
+            menu_bar: Application menu Bar
+            meeting_list_frame: Meeting list frame object.
+
+        Returns:
+            True if everything went fine, False if a step failed.
+        """
+        if self.extensions_dir not in sys.path:
+            sys.path.insert(0, self.extensions_dir)
+        given = {"main_window" : main_window, "menu_bar" : menu_bar,
+            "meeting_list_frame" : meeting_list_frame}
+        try:
+            module = self.__timed(extension, "import", 
+                lambda: import_module(extension))
+            self.extensions[extension] = module
+            if hasattr(module, "get_prefs"):
+                self.__timed(extension, "get_prefs", lambda: 
+                    module.get_prefs(prefs_dict=self.config[extension]
+                    if self.config.has_section(extension) else {}))
+            if hasattr(module, "set_objects"):
+                objects = [given[permission] if 
+                    self.get_extension_permission(extension, permission) 
+                    else None for permission in self.permissions]
+                self.__timed(extension, "set_objects", 
+                    lambda: module.set_objects(*objects))
+            if hasattr(module, "register_hooks"):
+                self.__timed(extension, "register_hooks", 
+                    lambda: module.register_hooks(self.hooks))
+            if hasattr(module, "main"):
+                self.__timed(extension, "main", module.main)
+        except:
+            logger.error(f"Failed to load extension {extension}!",
+                exc_info=True)
+            return False
+        finally:
+            total = sum(self.timings.get(extension, {}).values())
+            if self.budget_ms and total > self.budget_ms:
+                logger.warning("Extension %s took %.1f ms, over the %.0f "
+                    "ms budget; it will be %s next time", extension, total,
+                    self.budget_ms, "skipped" if self.over_budget == "skip"
+                    else "deferred")
+        return True
+
+    def module_mtime(self, extension: str) -> Optional[float]:
+        """The modification time of an extension's module or package
+        file, without importing it, or None if it is not found."""
+        for path in (extension + ".py", os.path.join(extension, 
+                "__init__.py")):
+            try:
+                return os.stat(os.path.join(self.extensions_dir, path)
+                    ).st_mtime
+            except OSError:
+                pass
+        return None
+
+    def load_timings(self) -> dict:
+        """load_timings
+
+        Returns:
+            dict: The timings saved by the last starts, by extension, as
+            {"steps": {step: ms}, "saved_at": time.time(), "mtime": 
+            module_mtime}, or an empty dict.
+        """
+        try:
+            with open(self.TIMINGS_FILE, "r") as file_handle:
+                return json.load(file_handle)
+        except FileNotFoundError:
+            return {}
+        except:
+            logger.warning("Failed to read extension timings", 
+                exc_info=True)
+            return {}
+
+    def save_timings(self) -> None:
+        """Save the timings of this start, for the next one. Skipped
+        extensions keep their old timings, and when they were taken."""
+        timings = {extension: timing for extension, timing in 
+            self.load_timings().items() if extension in self.get_ext()}
+        now = time.time()
+        timings.update({extension: {"steps" : steps, "saved_at" : now,
+            "mtime" : self.module_mtime(extension)} 
+            for extension, steps in self.timings.items()})
+        try:
+            os.makedirs(os.path.dirname(self.TIMINGS_FILE), exist_ok=True)
+            with open(self.TIMINGS_FILE, "w") as file_handle:
+                json.dump(timings, file_handle, indent=1)
+        except:
+            logger.warning("Failed to save extension timings", 
+                exc_info=True)
+
+    def over_budget_extensions(self) -> set:
+        """over_budget_extensions
+
+        Returns:
+            set: The extensions that took longer than the budget when 
+            last timed, unless the timing expired (see `retry_days`) or
+            the extension's file changed since.
+        """
+        if not self.budget_ms:
+            return set()
+        oldest = time.time() - self.retry_days * 24 * 60 * 60
+        slow = set()
+        for extension, timing in self.load_timings().items():
+            try:
+                if timing["saved_at"] < oldest or timing["mtime"] \
+                        != self.module_mtime(extension):
+                    continue
+                if sum(timing["steps"].values()) > self.budget_ms:
+                    slow.add(extension)
+            except (KeyError, TypeError, AttributeError):
+                pass # Saved by an older version, so it is timed again
+        return slow
+
+    def start(self, widget: tk.Misc, main_window: tk.Tk = None, 
+            menu_bar: tk.Menu = None, 
+            meeting_list_frame: tk.Frame = None) -> None:
+        """start
+
+        Load the enabled extensions on the Tk main loop of `widget`, one
+        per idle callback, so that the window stays responsive. Those
+        that were over budget last time are loaded DEFER_DELAY ms after
+        the others, or skipped. Returns at once.
+
+        Args:
+            widget: The widget whose `after` is used.
+            main_window: The Main window of the ZAJ.
+            menu_bar: Application menu Bar
+            meeting_list_frame: Meeting list frame object.
+        """
+        slow = self.over_budget_extensions()
+        if self.over_budget == "skip":
+            for extension in slow:
+                logger.warning("Extension %s skipped, it was over budget; "
+                    "it is tried again after %g days, or once its file "
+                    "changes", extension, self.retry_days)
+        first = [extension for extension in self.get_ext() 
+            if extension not in slow]
+        deferred = [extension for extension in self.get_ext() 
+            if extension in slow and self.over_budget != "skip"]
+        objects = (main_window, menu_bar, meeting_list_frame)
+
+        def load_next(pending: list, is_deferred: bool = False) -> None:
+            if pending:
+                self.load_extension(pending[0], *objects)
+                widget.after_idle(lambda: load_next(pending[1:], 
+                    is_deferred))
+            elif deferred and not is_deferred:
+                widget.after(self.DEFER_DELAY, 
+                    lambda: load_next(deferred, True))
+            else:
+                self.save_timings()
+                logger.info("Extensions loaded: %s", ", ".join("%s %.1f ms"
+                    % (extension, sum(steps.values())) 
+                    for extension, steps in self.timings.items()))
+
+        widget.after_idle(lambda: load_next(first))
+
     def give_extensions_prefs(self) -> bool:
         """give_extensions_prefs
 
@@ -0,0 +1,307 @@
+# This file is part of Zoom Autojoiner GUI.
+
+# Zoom Autojoiner GUI is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# Zoom Autojoiner GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with Zoom Autojoiner GUI.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Extension hooks
+
+An event bus that lets extensions react to what the autojoiner does,
+without polling. An extension subscribes in its `register_hooks(bus)`
+function:
+
+    def on_join_finished(mtg_id, ok):
+        ...
+
+    def register_hooks(bus):
+        bus.subscribe("join_finished", on_join_finished)
+
+The hooks, and the keyword arguments their handlers get, are:
+
+    meeting_due       meeting (a MeetingRecord)
+    join_started      mtg_id
+    join_finished     mtg_id, ok
+    meeting_changed   action, record_id (see DatabaseHandler)
+
+Handlers run on a small pool of daemon threads, never on the thread
+that emitted the hook, so a slow or hung handler cannot stall the Tk
+main loop or a join. For the same reason, a handler must not touch Tk
+widgets, or call anything that does: pass the work to the Tk thread
+through a queue that it reads with `after`, as JoinWorker does.
+Changes a handler makes through DatabaseHandler are safe, as their
+change listeners are called on the Tk thread.
+"""
+
+import time
+import queue
+import logging
+import threading
+from collections import deque
+from typing import Any, Callable
+
+from zoom_autojoiner_gui.metrics import HOOK_CALL, HOOK_PROBLEMS
+
+
+logger = logging.getLogger(__name__)
+
+
+#: tuple : The hooks that are emitted.
+HOOK_NAMES = ("meeting_due", "join_started", "join_finished",
+    "meeting_changed")
+
+
+class HookSubscription():
+    """HookSubscription
+
+    A handler subscribed to a hook, with its latency accounting. It
+    runs one call at a time; calls emitted meanwhile wait in `pending`.
+
+    Args:
+        hook: The name of the hook.
+        handler: The callable.
+        timeout: Seconds a call may take.
+    """
+    #: int : The most calls that may wait for a handler.
+    MAX_PENDING = 64
+
+    #: int : Timeouts in a row after which the handler is disabled.
+    MAX_TIMEOUTS = 3
+
+    def __init__(self, hook: str, handler: Callable[..., Any],
+            timeout: float) -> None:
+        self.hook = hook
+        self.handler = handler
+        self.timeout = timeout
+        self.name = "%s:%s.%s" % (hook, getattr(handler, "__module__", "?"),
+            getattr(handler, "__qualname__", repr(handler)))
+
+        self.pending: deque = deque()
+        self.running_since = None  # perf_counter of the running call
+        self.stuck = False         # The running call is past its timeout
+        self.disabled = False
+        self.timeouts_in_row = 0
+
+        # Accounting
+        self.calls = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.dropped = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def stats(self) -> dict[str, Any]:
+        """stats
+
+        Returns:
+            dict: calls, errors, timeouts, dropped, mean_ms, max_ms and
+            disabled.
+        """
+        return {
+            "calls" : self.calls,
+            "errors" : self.errors,
+            "timeouts" : self.timeouts,
+            "dropped" : self.dropped,
+            "mean_ms" : (self.total_seconds / self.calls * 1000
+                if self.calls else 0.0),
+            "max_ms" : self.max_seconds * 1000,
+            "disabled" : self.disabled
+        }
+
+
+class HookBus():
+    """HookBus
+
+    Dispatches hooks to the subscribed handlers on a pool of daemon
+    threads, which is started on the first emit that has a subscriber.
+
+    Every handler has a timeout. A call that takes longer is counted
+    and logged. While a handler is stuck past its timeout, the calls
+    emitted for it are dropped, and after MAX_TIMEOUTS timeouts in a row
+    it is disabled.
+
+    A handler runs one call at a time, so a hung handler holds at most
+    one thread, and it may never return. When an emit finds a handler
+    stuck, an extra thread is started in place of the one it holds,
+    which exits when the call returns. There are always `workers`
+    threads free for the other handlers.
+
+    Args:
+        workers: The number of threads.
+        timeout: The default timeout of a handler, in seconds.
+    """
+    def __init__(self, workers: int = 4, timeout: float = 5.0) -> None:
+        self.workers = workers
+        self.timeout = timeout
+        self.__subscriptions: dict[str, list[HookSubscription]] = {}
+        self.__lock = threading.Lock()
+        self.__ready: queue.Queue = queue.Queue() # Subscriptions to run
+        self.__threads: list[threading.Thread] = []
+        self.__stuck = 0 # Threads held by stuck handlers
+
+    def subscribe(self, hook: str, handler: Callable[..., Any],
+            timeout: float = None) -> HookSubscription:
+        """subscribe
+
+        Call `handler` with the hook's keyword arguments every time the
+        hook is emitted.
+
+        Args:
+            hook: One of HOOK_NAMES.
+            handler: The callable.
+            timeout: Seconds a call may take. Defaults to the bus's.
+
+        Returns:
+            HookSubscription: Pass it to `unsubscribe` to stop.
+
+        Raises:
+            ValueError: The hook does not exist.
+        """
+        if hook not in HOOK_NAMES:
+            raise ValueError("Unknown hook %r" % hook)
+        subscription = HookSubscription(hook, handler,
+            self.timeout if timeout is None else timeout)
+        with self.__lock:
+            self.__subscriptions.setdefault(hook, []).append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: HookSubscription) -> None:
+        """Stop calling a handler."""
+        with self.__lock:
+            subscriptions = self.__subscriptions.get(subscription.hook, [])
+            if subscription in subscriptions:
+                subscriptions.remove(subscription)
+            subscription.disabled = True
+
+    def emit(self, hook: str, **kwargs: Any) -> None:
+        """emit
+
+        Queue a call of every handler of a hook. Returns at once; costs
+        a dict lookup when nobody is subscribed.
+
+        Args:
+            hook: One of HOOK_NAMES.
+            **kwargs: The arguments of the handlers.
+        """
+        subscriptions = self.__subscriptions.get(hook)
+        if not subscriptions:
+            return
+        now = time.perf_counter()
+        with self.__lock:
+            self.__ensure_threads()
+            for subscription in subscriptions:
+                if subscription.disabled:
+                    continue
+                if subscription.running_since is not None \
+                        and now - subscription.running_since \
+                        > subscription.timeout:
+                    # Stuck: do not pile calls up behind it.
+                    if not subscription.stuck:
+                        self.__replace_stuck_thread(subscription)
+                    subscription.dropped += 1
+                    HOOK_PROBLEMS.inc(hook=hook, problem="dropped")
+                    continue
+                if len(subscription.pending) >= subscription.MAX_PENDING:
+                    subscription.dropped += 1
+                    HOOK_PROBLEMS.inc(hook=hook, problem="dropped")
+                    continue
+                subscription.pending.append(kwargs)
+                if subscription.running_since is None \
+                        and len(subscription.pending) == 1:
+                    self.__ready.put(subscription)
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """stats
+
+        Returns:
+            dict: The HookSubscription.stats of every handler, by name.
+        """
+        with self.__lock:
+            return {subscription.name: subscription.stats()
+                for subscriptions in self.__subscriptions.values()
+                for subscription in subscriptions}
+
+    def __ensure_threads(self) -> None:
+        """Start the worker threads, if not yet. Called with the lock."""
+        while len(self.__threads) < self.workers + self.__stuck:
+            thread = threading.Thread(target=self.__run, daemon=True,
+                name="HookBus-%d" % len(self.__threads))
+            thread.start()
+            self.__threads.append(thread)
+
+    def __replace_stuck_thread(self, subscription: HookSubscription
+            ) -> None:
+        """Start a thread in place of the one a stuck handler holds.
+        Called with the lock."""
+        subscription.stuck = True
+        self.__stuck += 1
+        logger.warning("Hook handler %s is stuck, over its %.2f s timeout",
+            subscription.name, subscription.timeout)
+        self.__ensure_threads()
+
+    def __run(self) -> None:
+        """A worker thread: runs the pending calls of a subscription."""
+        while True:
+            subscription = self.__ready.get()
+            with self.__lock:
+                if not subscription.pending or subscription.disabled:
+                    subscription.pending.clear()
+                    continue
+                kwargs = subscription.pending.popleft()
+                subscription.running_since = time.perf_counter()
+
+            try:
+                subscription.handler(**kwargs)
+            except:
+                subscription.errors += 1
+                HOOK_PROBLEMS.inc(hook=subscription.hook, problem="error")
+                logger.error("Hook handler %s failed", subscription.name,
+                    exc_info=True)
+
+            with self.__lock:
+                elapsed = time.perf_counter() - subscription.running_since
+                HOOK_CALL.observe(elapsed, hook=subscription.hook)
+                subscription.running_since = None
+                # A thread was started in place of this one: exit.
+                exit_thread = subscription.stuck
+                if exit_thread:
+                    subscription.stuck = False
+                    self.__stuck -= 1
+                    self.__threads.remove(threading.current_thread())
+                subscription.calls += 1
+                subscription.total_seconds += elapsed
+                subscription.max_seconds = max(subscription.max_seconds,
+                    elapsed)
+                if elapsed > subscription.timeout:
+                    subscription.timeouts += 1
+                    HOOK_PROBLEMS.inc(hook=subscription.hook,
+                        problem="timeout")
+                    subscription.timeouts_in_row += 1
+                    logger.warning("Hook handler %s took %.2f s, over its "
+                        "%.2f s timeout", subscription.name, elapsed,
+                        subscription.timeout)
+                    if subscription.timeouts_in_row \
+                            >= subscription.MAX_TIMEOUTS:
+                        subscription.disabled = True
+                        logger.error("Hook handler %s disabled after %d "
+                            "timeouts", subscription.name,
+                            subscription.timeouts_in_row)
+                else:
+                    subscription.timeouts_in_row = 0
+                if subscription.pending and not subscription.disabled:
+                    self.__ready.put(subscription)
+            if exit_thread:
+                return
+
+
+#: HookBus : The bus of this process. Extensions get it as
+#: ExtensionHandler.hooks.
+HOOKS = HookBus()
@@ -0,0 +1,477 @@
+# This file is part of Zoom Autojoiner GUI.
+
+# Zoom Autojoiner GUI is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# Zoom Autojoiner GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with Zoom Autojoiner GUI.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+import re
+import csv
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterator, Optional, TextIO, Union
+
+from zoom_autojoiner_gui.controllers import DatabaseHandler
+
+
+logger = logging.getLogger(__name__)
+
+
+#: tuple : The columns of exported files, in order.
+FIELDS = ("mtg_provider", "mtg_id", "mtg_password", "mtg_time")
+
+#: tuple : Time formats accepted when importing. The first one is the
+#: format used by the Add Meeting dialog.
+TIME_FORMATS = (
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%dT%H:%M",
+)
+
+
+def get_format(filename: str) -> str:
+    """get_format
+
+    Get the file format from a file name.
+
+    Args:
+        filename: The name of the file.
+
+    Returns:
+        str: "csv", "json", "jsonl" or "ics".
+
+    Raises:
+        ValueError: If the extension is not supported.
+    """
+    extension = os.path.splitext(filename)[1].lower().lstrip(".")
+    if extension == "ical":
+        extension = "ics"
+    if extension not in ("csv", "json", "jsonl", "ics"):
+        raise ValueError("Unsupported file type: .%s" % extension)
+    return extension
+
+
+def parse_time(value: Any) -> datetime:
+    """parse_time
+
+    Parse a meeting time from an imported file.
+
+    Args:
+        value: A datetime, or a string in one of TIME_FORMATS.
+
+    Returns:
+        datetime: The meeting time.
+
+    Raises:
+        ValueError: If the time cannot be parsed.
+    """
+    if isinstance(value, datetime):
+        return value
+    value = str(value).strip()
+    for time_format in TIME_FORMATS:
+        try:
+            return datetime.strptime(value, time_format)
+        except ValueError:
+            pass
+    raise ValueError("Invalid meeting time %r" % value)
+
+
+class MeetingImporter():
+    """MeetingImporter
+
+    Streams meetings from CSV, JSON, JSON Lines or iCalendar files into
+    the database. Rows are validated one by one and inserted in chunks
+    with `DatabaseHandler.add_mtgs`, and the whole import is committed
+    once at the end, so it is a single transaction.
+
+    Rows that fail validation are skipped and reported in the result,
+    they do not abort the import.
+
+    Args:
+        dbh: The DatabaseHandler to import into.
+        chunk_size: Rows inserted per batch. Defaults to 1000.
+        progress:
+            Called as ``progress(rows_read, errors)`` after each chunk.
+        max_errors: How many row errors to keep in the result.
+    """
+    def __init__(self, dbh: DatabaseHandler, chunk_size: int = 1000,
+            progress: Callable[[int, int], None] = None,
+            max_errors: int = 1000) -> None:
+        self.__dbh = dbh
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.max_errors = max_errors
+
+    def import_file(self, filename: str,
+            file_format: Optional[str] = None) -> dict[str, Any]:
+        """import_file
+
+        Import meetings from a file.
+
+        Args:
+            filename: The file to read.
+            file_format:
+                "csv", "json", "jsonl" or "ics". Guessed from the file
+                extension if not given.
+
+        Returns:
+            dict: "imported" (int), "failed" (int) and "errors", a list
+            of (row number, message) of the first `max_errors` errors.
+        """
+        file_format = file_format or get_format(filename)
+        with open(filename, "r", encoding="utf-8", newline="") as handle:
+            return self.import_stream(handle, file_format)
+
+    def import_stream(self, handle: TextIO,
+            file_format: str) -> dict[str, Any]:
+        """import_stream
+
+        Import meetings from an open text file.
+
+        Args:
+            handle: The file to read.
+            file_format: "csv", "json", "jsonl" or "ics".
+
+        Returns:
+            dict: See `import_file`.
+        """
+        readers = {
+            "csv" : self.read_csv,
+            "json" : self.read_json,
+            "jsonl" : self.read_jsonl,
+            "ics" : self.read_ics
+        }
+        result = {"imported": 0, "failed": 0, "errors": []}
+        chunk = []
+        rows_read = 0
+        try:
+            for row_no, row in readers[file_format](handle):
+                rows_read += 1
+                try:
+                    if isinstance(row, Exception):
+                        raise row # The reader could not parse the row
+                    chunk.append(self.validate(row))
+                except (KeyError, TypeError, ValueError) as e:
+                    result["failed"] += 1
+                    if len(result["errors"]) < self.max_errors:
+                        result["errors"].append((row_no, str(e)))
+                if len(chunk) >= self.chunk_size:
+                    result["imported"] += self.__dbh.add_mtgs(chunk)
+                    chunk = []
+                    self.__report(rows_read, result["failed"])
+            result["imported"] += self.__dbh.add_mtgs(chunk)
+            self.__dbh.commit_changes()
+        except:
+            self.__dbh.rollback_changes()
+            raise
+        self.__report(rows_read, result["failed"])
+
+        logger.info("Imported %d meeting(s), %d row(s) failed",
+            result["imported"], result["failed"])
+        return result
+
+    def __report(self, rows_read: int, errors: int) -> None:
+        """Call the progress callback, if any."""
+        if self.progress:
+            self.progress(rows_read, errors)
+
+    @staticmethod
+    def validate(row: dict[str, Any]) -> dict[str, Any]:
+        """validate
+
+        Check an imported row and convert it for `add_mtgs`.
+
+        Args:
+            row: The row, with at least "mtg_id" and "mtg_time".
+
+        Returns:
+            dict: The meeting.
+
+        Raises:
+            KeyError, ValueError: If the row is invalid.
+        """
+        mtg_id = str(row.get("mtg_id") or "").strip()
+        password = row.get("mtg_password")
+        if not mtg_id:
+            raise ValueError("Missing mtg_id")
+        if not row.get("mtg_time"):
+            raise ValueError("Missing mtg_time")
+        return {
+            "mtg_provider" : str(row.get("mtg_provider") or "ZM").strip(),
+            "mtg_id" : mtg_id,
+            "mtg_password" : "" if password is None else str(password),
+            "mtg_time" : parse_time(row["mtg_time"])
+        }
+
+    # Readers yield (row number, row dict), or (row number, exception)
+    # for rows that could not be parsed.
+    @staticmethod
+    def read_csv(handle: TextIO) -> Iterator[tuple[int, dict]]:
+        """Read a CSV file with a header row of FIELDS."""
+        reader = csv.DictReader(handle)
+        for row in reader:
+            yield reader.line_num, row
+
+    @staticmethod
+    def read_jsonl(handle: TextIO) -> Iterator[tuple[int, dict]]:
+        """Read a JSON Lines file, one meeting object per line."""
+        for line_no, line in enumerate(handle, 1):
+            if line.strip():
+                try:
+                    row = json.loads(line)
+                except ValueError as e:
+                    row = ValueError("Invalid JSON: %s" % e)
+                if not isinstance(row, (dict, Exception)):
+                    row = ValueError("Not a JSON object")
+                yield line_no, row
+
+    @staticmethod
+    def read_json(handle: TextIO) -> Iterator[tuple[int, dict]]:
+        """Read a JSON array of meeting objects.
+
+        The array has to be parsed as a whole; use JSON Lines for files
+        too big for memory.
+        """
+        for index, row in enumerate(json.load(handle), 1):
+            if not isinstance(row, dict):
+                row = ValueError("Not a JSON object")
+            yield index, row
+
+    @staticmethod
+    def read_ics(handle: TextIO) -> Iterator[tuple[int, dict]]:
+        """Read the VEVENTs of an iCalendar file.
+
+        The meeting comes from the X-ZAJ-* properties written by the
+        exporter or, failing that, from a Zoom join link in the URL,
+        LOCATION or DESCRIPTION. Recurring events (with an RRULE) are
+        reported as errors, as they cannot be imported yet.
+        """
+        event = None
+        event_no = 0
+        for line in _unfold(handle):
+            name, _, value = line.partition(":")
+            name, _, params = name.partition(";")
+            name = name.upper()
+            if name == "BEGIN" and value.upper() == "VEVENT":
+                event = {}
+                event_no += 1
+            elif name == "END" and value.upper() == "VEVENT" and event:
+                yield event_no, _event_to_row(event)
+                event = None
+            elif event is not None:
+                event.setdefault(name, (params, _unescape(value)))
+
+
+class MeetingExporter():
+    """MeetingExporter
+
+    Streams the meetings table to CSV, JSON, JSON Lines or iCalendar
+    files, reading it `chunk_size` rows at a time.
+
+    Args:
+        dbh: The DatabaseHandler to export from.
+        chunk_size: Rows fetched per round trip. Defaults to 1000.
+        progress: Called as ``progress(rows_written, 0)`` per chunk.
+    """
+    def __init__(self, dbh: DatabaseHandler, chunk_size: int = 1000,
+            progress: Callable[[int, int], None] = None) -> None:
+        self.__dbh = dbh
+        self.chunk_size = chunk_size
+        self.progress = progress
+
+    def export_file(self, filename: str,
+            file_format: Optional[str] = None) -> int:
+        """export_file
+
+        Export all meetings to a file.
+
+        Args:
+            filename: The file to write.
+            file_format:
+                "csv", "json", "jsonl" or "ics". Guessed from the file
+                extension if not given.
+
+        Returns:
+            int: The number of meetings written.
+        """
+        file_format = file_format or get_format(filename)
+        with open(filename, "w", encoding="utf-8", newline="") as handle:
+            return self.export_stream(handle, file_format)
+
+    def export_stream(self, handle: TextIO, file_format: str) -> int:
+        """export_stream
+
+        Export all meetings to an open text file.
+
+        Args:
+            handle: The file to write.
+            file_format: "csv", "json", "jsonl" or "ics".
+
+        Returns:
+            int: The number of meetings written.
+        """
+        writers = {
+            "csv" : self.write_csv,
+            "json" : self.write_json,
+            "jsonl" : self.write_jsonl,
+            "ics" : self.write_ics
+        }
+        count = writers[file_format](handle, self.__counted(
+            self.__dbh.iter_mtgs(self.chunk_size)))
+        if self.progress:
+            self.progress(count, 0)
+        logger.info("Exported %d meeting(s)", count)
+        return count
+
+    def __counted(self, meetings: Iterator[dict]) -> Iterator[dict]:
+        """Pass meetings through, reporting progress every chunk."""
+        for count, mtg in enumerate(meetings, 1):
+            yield mtg
+            if self.progress and count % self.chunk_size == 0:
+                self.progress(count, 0)
+
+    @staticmethod
+    def __row(mtg: dict) -> dict:
+        """A meeting as a row of FIELDS, with the time as text."""
+        row = {field: mtg[field] for field in FIELDS}
+        row["mtg_time"] = mtg["mtg_time"].strftime(TIME_FORMATS[0])
+        return row
+
+    def write_csv(self, handle: TextIO, meetings: Iterator[dict]) -> int:
+        """Write a CSV file with a header row."""
+        writer = csv.DictWriter(handle, fieldnames=FIELDS)
+        writer.writeheader()
+        count = 0
+        for mtg in meetings:
+            writer.writerow(self.__row(mtg))
+            count += 1
+        return count
+
+    def write_jsonl(self, handle: TextIO, meetings: Iterator[dict]) -> int:
+        """Write a JSON Lines file, one meeting object per line."""
+        count = 0
+        for mtg in meetings:
+            handle.write(json.dumps(self.__row(mtg)) + "\n")
+            count += 1
+        return count
+
+    def write_json(self, handle: TextIO, meetings: Iterator[dict]) -> int:
+        """Write a JSON array, one element at a time."""
+        count = 0
+        handle.write("[")
+        for mtg in meetings:
+            handle.write(",\n " if count else "\n ")
+            handle.write(json.dumps(self.__row(mtg)))
+            count += 1
+        handle.write("\n]\n")
+        return count
+
+    def write_ics(self, handle: TextIO, meetings: Iterator[dict]) -> int:
+        """Write an iCalendar file, one VEVENT per meeting."""
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        handle.write("BEGIN:VCALENDAR\r\nVERSION:2.0\r\n"
+            "PRODID:-//Zoom Autojoiner GUI//EN\r\n")
+        count = 0
+        for mtg in meetings:
+            handle.write("BEGIN:VEVENT\r\n"
+                "UID:zaj-%s@zoom-autojoiner\r\n"
+                "DTSTAMP:%s\r\n"
+                "DTSTART:%s\r\n"
+                "SUMMARY:%s\r\n"
+                "X-ZAJ-MTG-PROVIDER:%s\r\n"
+                "X-ZAJ-MTG-ID:%s\r\n"
+                "X-ZAJ-MTG-PASSWORD:%s\r\n"
+                "END:VEVENT\r\n" % (
+                    mtg["id"], stamp,
+                    mtg["mtg_time"].strftime("%Y%m%dT%H%M%S"),
+                    _escape("Meeting %s" % mtg["mtg_id"]),
+                    _escape(mtg["mtg_provider"] or ""),
+                    _escape(mtg["mtg_id"] or ""),
+                    _escape(mtg["mtg_password"] or "")))
+            count += 1
+        handle.write("END:VCALENDAR\r\n")
+        return count
+
+
+# iCalendar helpers
+_ZOOM_LINK = re.compile(r"/j/(\d+)(?:\?pwd=([\w.\-]+))?")
+
+
+def _unfold(handle: TextIO) -> Iterator[str]:
+    """Join iCalendar continuation lines, which start with a space."""
+    current = None
+    for line in handle:
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield current
+        current = line
+    if current is not None:
+        yield current
+
+
+def _escape(text: str) -> str:
+    """Escape an iCalendar TEXT value."""
+    return (str(text).replace("\\", "\\\\").replace(";", "\\;")
+        .replace(",", "\\,").replace("\n", "\\n"))
+
+
+def _unescape(text: str) -> str:
+    """Undo `_escape`."""
+    return re.sub(r"\\(.)", lambda match: "\n" if match.group(1) in "nN"
+        else match.group(1), text)
+
+
+def _parse_ics_time(params: str, value: str) -> datetime:
+    """Parse a DTSTART into a local, naive datetime."""
+    value = value.strip()
+    if "VALUE=DATE" in params.upper() and "DATE-TIME" not in params.upper():
+        return datetime.strptime(value, "%Y%m%d")
+    if value.endswith("Z"):
+        utc = datetime.strptime(value, "%Y%m%dT%H%M%SZ").replace(
+            tzinfo=timezone.utc)
+        return utc.astimezone().replace(tzinfo=None)
+    # Floating or TZID times are taken as local time.
+    return datetime.strptime(value, "%Y%m%dT%H%M%S")
+
+
+def _event_to_row(event: dict[str, tuple[str, str]]
+        ) -> Union[dict[str, Any], Exception]:
+    """Turn the properties of a VEVENT into an importable row, or the
+    error that stops it from being imported."""
+    if "RRULE" in event:
+        # Importing only the first occurrence would lose the others.
+        return ValueError("Recurring events (RRULE) cannot be imported "
+            "yet")
+    row = {
+        "mtg_provider" : event.get("X-ZAJ-MTG-PROVIDER", ("", "ZM"))[1],
+        "mtg_id" : event.get("X-ZAJ-MTG-ID", ("", ""))[1],
+        "mtg_password" : event.get("X-ZAJ-MTG-PASSWORD", ("", ""))[1],
+        "mtg_time" : None
+    }
+    if not row["mtg_id"]:
+        for name in ("URL", "LOCATION", "DESCRIPTION"):
+            match = _ZOOM_LINK.search(event.get(name, ("", ""))[1])
+            if match:
+                row["mtg_id"] = match.group(1)
+                row["mtg_password"] = match.group(2) or ""
+                break
+    if "DTSTART" in event:
+        try:
+            row["mtg_time"] = _parse_ics_time(*event["DTSTART"])
+        except ValueError:
+            row["mtg_time"] = event["DTSTART"][1] # reported by validate
+    return row
@@ -0,0 +1,191 @@
+# This file is part of Zoom Autojoiner GUI.
+
+# Zoom Autojoiner GUI is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# Zoom Autojoiner GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with Zoom Autojoiner GUI.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+import copy
+import time
+import queue
+import atexit
+import logging
+import threading
+import logging.handlers
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+
+#: str : The format of every line of the log file.
+LOG_FORMAT = ('[%(asctime)s] [%(name)s:%(levelname)s] [pid:%(process)d, '
+    'tid:%(thread)d] %(message)s')
+
+#: logging.handlers.QueueListener : The writer thread, once started.
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class LazyMessage():
+    """LazyMessage
+
+    A log argument that is only built if the record is written, e.g.
+
+        logger.debug("Meetings: %s", LazyMessage(lambda: dump(mtgs)))
+
+    Args:
+        build: Returns the text of the argument.
+    """
+    __slots__ = ("build",)
+
+    def __init__(self, build: Callable[[], Any]) -> None:
+        self.build = build
+
+    def __str__(self) -> str:
+        return str(self.build())
+
+
+class RateLimitFilter(logging.Filter):
+    """RateLimitFilter
+
+    Drops repeats of a debug message (same logger, line and format
+    string) that come within `interval` seconds of the last one that was
+    let through. The next one that is let through says how many were
+    dropped. Records at INFO and above are never dropped.
+
+    Args:
+        interval: The number of seconds. 0 lets everything through.
+    """
+    def __init__(self, interval: float = 10.0) -> None:
+        super().__init__()
+        self.interval = interval
+        self.__last_seen: dict[tuple, list] = {} # key: [time, dropped]
+        self.__lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.interval <= 0 or record.levelno > logging.DEBUG:
+            return True
+        key = (record.name, record.lineno, record.msg)
+        now = time.monotonic()
+        with self.__lock:
+            seen = self.__last_seen.get(key)
+            if seen is not None and now - seen[0] < self.interval:
+                seen[1] += 1
+                return False
+            dropped = seen[1] if seen is not None else 0
+            self.__last_seen[key] = [now, 0]
+        if dropped:
+            record.msg = "%s (%d repeats dropped)" % (record.msg, dropped)
+        return True
+
+
+class RawQueueHandler(logging.handlers.QueueHandler):
+    """RawQueueHandler
+
+    Puts records on the queue as they are, so that the message, the
+    traceback and LazyMessage arguments are formatted by the writer
+    thread, not by the thread that logged them. The stock QueueHandler
+    formats them before queueing.
+
+    An argument that is not a plain value is turned into its text at
+    once, as it could change before the writer gets to it. LazyMessage
+    arguments are left to the writer, so their builders run on its
+    thread, and must only read what stays the same.
+    """
+    #: tuple : The argument types that are queued as they are.
+    PLAIN_TYPES = (str, bytes, int, float, complex, bool, type(None),
+        datetime, LazyMessage)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        if isinstance(record.args, tuple):
+            record.args = tuple(self.__freeze(arg) for arg in record.args)
+        elif isinstance(record.args, dict):
+            record.args = {key: self.__freeze(arg) for key, arg
+                in record.args.items()}
+        return record
+
+    def __freeze(self, arg: Any) -> Any:
+        """An argument as it is now: the argument itself, if it is a
+        plain value, else its str and repr."""
+        if isinstance(arg, self.PLAIN_TYPES):
+            return arg
+        try:
+            return _FrozenArgument(str(arg), repr(arg))
+        except Exception as e:
+            return _FrozenArgument("<unprintable %s: %s>" % (
+                type(arg).__name__, e), "<unprintable %s>" % (
+                type(arg).__name__))
+
+
+class _FrozenArgument():
+    """The str and repr of a log argument, taken when it was logged."""
+    __slots__ = ("text", "representation")
+
+    def __init__(self, text: str, representation: str) -> None:
+        self.text = text
+        self.representation = representation
+
+    def __str__(self) -> str:
+        return self.text
+
+    def __repr__(self) -> str:
+        return self.representation
+
+
+def configure_logging(level: str = "INFO", log_dir: str = "logs/",
+        rate_limit: float = 10.0) -> logging.handlers.QueueListener:
+    """configure_logging
+
+    Send all logging through a queue to a thread that formats the
+    records and writes the log file, so that logging calls do not wait
+    for either.
+
+    Args:
+        level: The lowest level that is logged.
+        log_dir: The directory the log file is created in.
+        rate_limit: See RateLimitFilter.
+
+    Returns:
+        The started QueueListener. It is stopped, and the queue flushed,
+        at exit.
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    os.makedirs(log_dir, exist_ok=True)
+    file_handler = logging.FileHandler(os.path.join(log_dir, "%s.log" % (
+        datetime.now().strftime("%Y%m%d-%H%M%S"))), mode='w')
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT, datefmt='%c'))
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = RawQueueHandler(log_queue)
+    queue_handler.addFilter(RateLimitFilter(rate_limit))
+
+    root = logging.getLogger()
+    root.setLevel(getattr(logging, level.upper(), logging.INFO))
+    root.addHandler(queue_handler)
+
+    _listener = logging.handlers.QueueListener(log_queue, file_handler)
+    _listener.start()
+    atexit.register(stop_logging)
+    return _listener
+
+
+def stop_logging() -> None:
+    """stop_logging
+
+    Write out what is left in the queue and stop the writer thread.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,347 @@
+# This file is part of Zoom Autojoiner GUI.
+
+# Zoom Autojoiner GUI is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# Zoom Autojoiner GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with Zoom Autojoiner GUI.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Metrics
+
+Counters and latency histograms, kept in memory and exported in the
+Prometheus text format, at http://127.0.0.1:<port>/metrics and/or to a
+file (see the [metrics] section of application.ini). The GUI shows a
+summary when the status bar is double-clicked.
+"""
+
+import os
+import time
+import logging
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+#: tuple : The default histogram buckets, in seconds.
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _label_key(labels: dict) -> tuple:
+    """The labels of a series, in a hashable, sorted form."""
+    return tuple(sorted((name, str(value)) for name, value in
+        labels.items()))
+
+
+def _format_labels(key: tuple, extra: tuple = ()) -> str:
+    """Labels in the Prometheus text format, e.g. {step="open_zoom"}."""
+    pairs = key + extra
+    if not pairs:
+        return ""
+    return "{%s}" % ",".join('%s="%s"' % (name, value.replace("\\", "\\\\")
+        .replace('"', '\\"').replace("\n", "\\n")) for name, value in pairs)
+
+
+class Counter():
+    """Counter
+
+    A number that only goes up, per set of labels.
+
+    Args:
+        name: The metric's name.
+        help: What it counts.
+    """
+    type = "counter"
+
+    def __init__(self, name: str, help: str) -> None:
+        self.name = name
+        self.help = help
+        self.__values: dict[tuple, float] = {}
+        self.__lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Add `amount` to the series of `labels`."""
+        key = _label_key(labels)
+        with self.__lock:
+            self.__values[key] = self.__values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        """The count of the series of `labels`."""
+        return self.__values.get(_label_key(labels), 0.0)
+
+    def samples(self) -> list[tuple[str, str, float]]:
+        """The (name, labels, value) lines of the metric."""
+        with self.__lock:
+            return [(self.name, _format_labels(key), value)
+                for key, value in sorted(self.__values.items())]
+
+    def summary(self) -> list[str]:
+        """One readable line per series."""
+        return ["%s%s  %g" % sample for sample in self.samples()]
+
+
+class Histogram():
+    """Histogram
+
+    Counts observations, e.g. durations in seconds, in buckets, per set
+    of labels.
+
+    Args:
+        name: The metric's name.
+        help: What it measures.
+        buckets: The upper bounds of the buckets, ascending.
+    """
+    type = "histogram"
+
+    def __init__(self, name: str, help: str,
+            buckets: tuple = DEFAULT_BUCKETS) -> None:
+        self.name = name
+        self.help = help
+        self.buckets = tuple(buckets)
+        # labels: [count per bucket (and +Inf), sum]
+        self.__series: dict[tuple, list] = {}
+        self.__lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Count one observation in the series of `labels`."""
+        key = _label_key(labels)
+        index = bisect_left(self.buckets, value)
+        with self.__lock:
+            series = self.__series.get(key)
+            if series is None:
+                series = self.__series[key] = [
+                    [0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Context manager that observes how long its block took."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels: str) -> int:
+        """The number of observations in the series of `labels`."""
+        series = self.__series.get(_label_key(labels))
+        return sum(series[0]) if series else 0
+
+    def quantile(self, q: float, **labels: str) -> Optional[float]:
+        """quantile
+
+        Estimate a quantile from the buckets, as Prometheus'
+        histogram_quantile does.
+
+        Args:
+            q: The quantile, e.g. 0.95.
+            **labels: The series.
+
+        Returns:
+            float: The estimate, or None without observations.
+        """
+        with self.__lock:
+            series = self.__series.get(_label_key(labels))
+            counts = list(series[0]) if series else []
+        return self.__quantile(q, counts)
+
+    def __quantile(self, q: float, counts: list) -> Optional[float]:
+        """Estimate a quantile from a series' bucket counts."""
+        total = sum(counts)
+        if not total:
+            return None
+        rank = q * total
+        seen = 0
+        for index, count in enumerate(counts):
+            if seen + count >= rank and count:
+                if index == len(self.buckets):
+                    return self.buckets[-1]  # In +Inf: best known bound
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index]
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+    def samples(self) -> list[tuple[str, str, float]]:
+        """The (name, labels, value) lines of the metric."""
+        lines = []
+        with self.__lock:
+            for key, (counts, total) in sorted(self.__series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),),
+                        counts):
+                    cumulative += count
+                    lines.append((self.name + "_bucket", _format_labels(key,
+                        (("le", "+Inf" if bound == float("inf")
+                        else repr(bound)),)), cumulative))
+                lines.append((self.name + "_sum", _format_labels(key),
+                    total))
+                lines.append((self.name + "_count", _format_labels(key),
+                    cumulative))
+        return lines
+
+    def summary(self) -> list[str]:
+        """One readable line per series: count, mean, p50 and p95."""
+        with self.__lock:
+            series = [(key, list(counts), total) for key, (counts, total)
+                in sorted(self.__series.items())]
+        return ["%s%s  n=%d  mean=%.1f ms  p50=%.1f ms  p95=%.1f ms" % (
+            self.name, _format_labels(key), sum(counts),
+            total / sum(counts) * 1000,
+            self.__quantile(0.5, counts) * 1000,
+            self.__quantile(0.95, counts) * 1000)
+            for key, counts, total in series if sum(counts)]
+
+
+class MetricsRegistry():
+    """MetricsRegistry
+
+    Holds the metrics of the process and renders them.
+    """
+    def __init__(self) -> None:
+        self.__metrics: dict[str, object] = {}
+        self.__lock = threading.Lock()
+
+    def __register(self, metric):
+        """Add a metric, or return the one already registered."""
+        with self.__lock:
+            return self.__metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help: str) -> Counter:
+        """Get or create a Counter."""
+        return self.__register(Counter(name, help))
+
+    def histogram(self, name: str, help: str,
+            buckets: tuple = DEFAULT_BUCKETS) -> Histogram:
+        """Get or create a Histogram."""
+        return self.__register(Histogram(name, help, buckets))
+
+    def render(self) -> str:
+        """render
+
+        Returns:
+            str: Every metric, in the Prometheus text format (0.0.4).
+        """
+        lines = []
+        for metric in list(self.__metrics.values()):
+            lines.append("# HELP %s %s" % (metric.name, metric.help))
+            lines.append("# TYPE %s %s" % (metric.name, metric.type))
+            lines.extend("%s%s %s" % (name, labels, repr(float(value)))
+                for name, labels, value in metric.samples())
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> str:
+        """summary
+
+        Returns:
+            str: The metrics that have data, one series per line, for
+            people to read.
+        """
+        lines = []
+        for metric in list(self.__metrics.values()):
+            lines.extend(metric.summary())
+        return "\n".join(lines) or "No metrics yet."
+
+    def write_file(self, filename: str) -> None:
+        """Write `render()` to a file, replacing it atomically."""
+        temp_name = filename + ".tmp"
+        with open(temp_name, "w") as file_handle:
+            file_handle.write(self.render())
+        os.replace(temp_name, filename)
+
+
+#: MetricsRegistry : The metrics of this process.
+REGISTRY = MetricsRegistry()
+
+SCHEDULER_TICK = REGISTRY.histogram("zaj_scheduler_tick_seconds",
+    "Time spent handling one scheduler wake-up.")
+DB_QUERY = REGISTRY.histogram("zaj_db_query_seconds",
+    "Time spent in database statements, by statement type and query.")
+DB_CACHE = REGISTRY.counter("zaj_db_cache_reads_total",
+    "Meeting reads served by the read cache, by result (hit or miss).")
+TABLE_RENDER = REGISTRY.histogram("zaj_table_render_seconds",
+    "Time spent rendering the meeting table.")
+JOIN_STEP = REGISTRY.histogram("zaj_join_step_seconds",
+    "Time spent in each step of a join.", DEFAULT_BUCKETS + (60.0,))
+JOINS = REGISTRY.counter("zaj_joins_total",
+    "Joins attempted, by result.")
+HOOK_CALL = REGISTRY.histogram("zaj_hook_seconds",
+    "Time spent in extension hook handlers, by hook.")
+HOOK_PROBLEMS = REGISTRY.counter("zaj_hook_problems_total",
+    "Extension hook calls that failed, timed out or were dropped.")
+
+
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+    """Serves REGISTRY at /metrics."""
+    def do_GET(self) -> None:
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type",
+            "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        logger.debug("Metrics - " + format, *args)
+
+
+def start_exporter(port: int = 0, filename: Optional[str] = None,
+        interval: float = 15.0) -> Optional[ThreadingHTTPServer]:
+    """start_exporter
+
+    Export REGISTRY on daemon threads: serve it on 127.0.0.1:`port`,
+    and/or write it to `filename` every `interval` seconds.
+
+    Args:
+        port: The port. 0 does not serve.
+        filename: The file. None or "" does not write.
+        interval: Seconds between two writes of the file.
+
+    Returns:
+        The HTTP server, if one was started.
+    """
+    server = None
+    if port:
+        try:
+            server = ThreadingHTTPServer(("127.0.0.1", port),
+                _MetricsRequestHandler)
+        except OSError:
+            logger.error("Metrics - Cannot listen on port %d", port,
+                exc_info=True)
+        else:
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, daemon=True,
+                name="MetricsServer").start()
+            logger.info("Metrics - Serving on http://127.0.0.1:%d/metrics",
+                port)
+
+    if filename:
+        def write_periodically() -> None:
+            while True:
+                try:
+                    REGISTRY.write_file(filename)
+                except:
+                    logger.warning("Metrics - Failed to write %s",
+                        filename, exc_info=True)
+                time.sleep(interval)
+        threading.Thread(target=write_periodically, daemon=True,
+            name="MetricsWriter").start()
+
+    return server
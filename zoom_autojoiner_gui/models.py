@@ -1,3 +1,8 @@
+import time
+import threading
+from datetime import datetime
+from typing import Any, NamedTuple, Optional
+
 from sqlalchemy import create_engine
 from sqlalchemy import (
     Column,
@@ -6,19 +11,20 @@ from sqlalchemy import (
     REAL,
     DateTime
 )
+from sqlalchemy import null, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, scoped_session
 
-from zoom_autojoiner_gui.constants import DB_URL
+from zoom_autojoiner_gui import constants
+from zoom_autojoiner_gui.metrics import DB_QUERY
 
 
-engine = create_engine(DB_URL)
-# Session = sessionmaker(bind=engine)
 Base = declarative_base()
 
 class Meetings(Base):
-    """Meetings 
-    
+    """Meetings
+
     Class containing the Meetings table.
     """
     __tablename__ = 'meetings'
@@ -27,11 +33,228 @@ class Meetings(Base):
     mtg_provider = Column(String)
     mtg_id = Column(String)
     mtg_password = Column(String)
-    mtg_time = Column(DateTime)
+    mtg_time = Column(DateTime, index=True)
     def __repr__(self):
         return "<Meeting(mtg_provider='%s', mtg_id='%s', mtg_password='%s')>" \
             % (self.mtg_provider, self.mtg_id, self.mtg_password)
 
-Base.metadata.create_all(engine)
+
+class MeetingRecord(NamedTuple):
+    """MeetingRecord
+
+    A read-only meeting, as returned by the DatabaseHandler read
+    methods. A named tuple takes a fraction of the memory of a Meetings
+    object or a dict, and is not tracked by the session.
+
+    An occurrence of a recurring meeting has the ID of its series in
+    both `id` and `series_id`; `series_id` is None for other meetings.
+
+    For code written against the old dicts, it can also be read like a
+    mapping: ``record["mtg_id"]``, ``record.get("mtg_id")`` and 
+    ``dict(record)`` all work.
+    """
+    id: int
+    mtg_provider: Optional[str]
+    mtg_id: str
+    mtg_password: str
+    mtg_time: datetime
+    series_id: Optional[int] = None
+
+    def __getitem__(self, key: Any) -> Any:
+        if isinstance(key, str):
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        return tuple.__getitem__(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """The value of a field, or `default` if there is no such field."""
+        return getattr(self, key, default) if key in self._fields \
+            else default
+
+    def keys(self) -> tuple[str, ...]:
+        """The field names, so that ``dict(record)`` works."""
+        return self._fields
+
+
+#: tuple : The Meetings columns a MeetingRecord is made of, in order.
+MEETING_RECORD_COLUMNS = (Meetings.id, Meetings.mtg_provider, 
+    Meetings.mtg_id, Meetings.mtg_password, Meetings.mtg_time, 
+    null().label("series_id"))
+
+
+class RecurringMeetings(Base):
+    """RecurringMeetings
+
+    Class containing the RecurringMeetings table: one row per series of
+    meetings. The occurrences are not stored, they are generated when
+    needed (see the recurrence module).
+
+    `frequency` is "daily" or "weekly", repeated every `interval` days
+    or weeks. `weekdays` lists the days of a weekly series, as numbers
+    separated by commas (0 is Monday). `exceptions` lists the skipped
+    dates, as YYYY-MM-DD separated by commas.
+    """
+    __tablename__ = 'recurring_meetings'
+
+    id = Column(Integer, primary_key=True)
+    mtg_provider = Column(String)
+    mtg_id = Column(String)
+    mtg_password = Column(String)
+    start_time = Column(DateTime)
+    frequency = Column(String)
+    interval = Column(Integer, default=1)
+    weekdays = Column(String)
+    until = Column(DateTime)
+    exceptions = Column(String, default="")
+    def __repr__(self):
+        return "<RecurringMeeting(mtg_id='%s', frequency='%s')>" \
+            % (self.mtg_id, self.frequency)
+
+
+class SeriesRecord(NamedTuple):
+    """SeriesRecord
+
+    A read-only recurring meeting definition, see RecurringMeetings.
+    """
+    id: int
+    mtg_provider: Optional[str]
+    mtg_id: str
+    mtg_password: str
+    start_time: datetime
+    frequency: str
+    interval: int
+    weekdays: Optional[str]
+    until: Optional[datetime]
+    exceptions: Optional[str]
+
+
+#: tuple : The RecurringMeetings columns of a SeriesRecord, in order.
+SERIES_RECORD_COLUMNS = (RecurringMeetings.id, RecurringMeetings.mtg_provider,
+    RecurringMeetings.mtg_id, RecurringMeetings.mtg_password,
+    RecurringMeetings.start_time, RecurringMeetings.frequency,
+    RecurringMeetings.interval, RecurringMeetings.weekdays,
+    RecurringMeetings.until, RecurringMeetings.exceptions)
 
 
+class MeetingChanges(Base):
+    """MeetingChanges
+
+    The change log of the Meetings table. Every change gets a new, 
+    increasing revision, so clients sharing a database can fetch just
+    the changes made since the last revision they saw.
+    """
+    __tablename__ = 'meeting_changes'
+    # Never reuse the revision of a deleted row.
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    revision = Column(Integer, primary_key=True)
+    action = Column(String)
+    record_id = Column(Integer)
+    origin = Column(String)
+    changed_at = Column(DateTime)
+    def __repr__(self):
+        return "<MeetingChange(revision=%s, action='%s', record_id=%s)>" \
+            % (self.revision, self.action, self.record_id)
+
+
+# One engine and one session registry per database URI, shared by the
+# whole process.
+_engines: dict[str, Engine] = {}
+_sessions: dict[str, scoped_session] = {}
+_registry_lock = threading.RLock()
+
+
+def _time_queries(engine: Engine) -> None:
+    """Observe every statement run on `engine` in the DB_QUERY metric,
+    labelled by its type (SELECT, INSERT...) and by the `query_name`
+    execution option, which DatabaseHandler sets on its statements.
+    Statements without one, e.g. the ORM's flushes, are named 
+    "other"."""
+    @event.listens_for(engine, "before_cursor_execute")
+    def before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        options = context.execution_options if context is not None else {}
+        DB_QUERY.observe(elapsed, statement=statement.lstrip().split(
+            None, 1)[0].upper() if statement.strip() else "OTHER",
+            query=options.get("query_name", "other"))
+
+
+def get_engine(database_uri: Optional[str] = None) -> Engine:
+    """get_engine
+
+    Get the process-wide engine for a database, creating it (and the
+    tables) on first use.
+
+    Args:
+        database_uri:
+            The URI of the database, in SQLAlchemy format. Defaults to
+            the configured DB_URL.
+
+    Returns:
+        The shared SQLAlchemy engine.
+    """
+    database_uri = database_uri or constants.DB_URL
+    with _registry_lock:
+        if database_uri in _engines:
+            return _engines[database_uri]
+
+        url = make_url(database_uri)
+        kwargs = {"pool_pre_ping": True}
+        if not (url.get_backend_name() == "sqlite"
+                and url.database in (None, "", ":memory:")):
+            # In-memory SQLite uses a one connection pool.
+            kwargs["pool_size"] = constants.DB_POOL_SIZE
+            kwargs["max_overflow"] = constants.DB_MAX_OVERFLOW
+        new_engine = create_engine(database_uri, **kwargs)
+        _time_queries(new_engine)
+        Base.metadata.create_all(new_engine)
+
+        # create_all skips the indexes of tables that already exist, so
+        # databases made by older versions would never get them.
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(new_engine, checkfirst=True)
+
+        _engines[database_uri] = new_engine
+        return new_engine
+
+
+def get_session(database_uri: Optional[str] = None) -> scoped_session:
+    """get_session
+
+    Get the session registry of a database. Every caller in the same
+    thread gets the same session, so they share one identity map.
+
+    Args:
+        database_uri:
+            The URI of the database, in SQLAlchemy format. Defaults to
+            the configured DB_URL.
+
+    Returns:
+        The shared scoped session.
+    """
+    database_uri = database_uri or constants.DB_URL
+    with _registry_lock:
+        if database_uri not in _sessions:
+            _sessions[database_uri] = scoped_session(sessionmaker(
+                bind=get_engine(database_uri)))
+        return _sessions[database_uri]
+
+
+
+def __getattr__(name: str):
+    """Create `engine` and `Session` of DB_URL on first use (PEP 562).
+
+    Nothing touches the database when this module is imported.
+    """
+    if name == "engine":
+        return get_engine()
+    if name == "Session":
+        return get_session()
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
@@ -0,0 +1,216 @@
+# This file is part of Zoom Autojoiner GUI.
+
+# Zoom Autojoiner GUI is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# Zoom Autojoiner GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with Zoom Autojoiner GUI.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Recurring meetings
+
+Generates the occurrences of a recurring meeting (a SeriesRecord) on
+demand. The generators start at the asked-for time by arithmetic, so
+getting the next occurrences of a series costs the same however long
+the series is.
+"""
+
+import heapq
+import logging
+from datetime import date, datetime, timedelta
+from itertools import islice
+from typing import Iterable, Iterator, Optional
+
+from zoom_autojoiner_gui.models import MeetingRecord, SeriesRecord
+
+
+logger = logging.getLogger(__name__)
+
+#: tuple : The frequencies a series can have.
+FREQUENCIES = ("daily", "weekly")
+
+#: tuple : Short weekday names, Monday first, as used by `parse_weekdays`.
+WEEKDAY_NAMES = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+
+
+def parse_weekdays(text: str) -> str:
+    """parse_weekdays
+
+    Turn weekdays typed by the user, e.g. "Mon, Wed, Fri" or "0,2,4",
+    into the stored form.
+
+    Args:
+        text: Weekday names or numbers (0 is Monday), comma separated.
+
+    Returns:
+        str: The weekday numbers, sorted and comma separated.
+
+    Raises:
+        ValueError: A weekday was not understood.
+    """
+    days = set()
+    for part in text.split(","):
+        part = part.strip().lower()
+        if not part:
+            continue
+        if part[:3] in WEEKDAY_NAMES:
+            days.add(WEEKDAY_NAMES.index(part[:3]))
+        elif part.isdigit() and int(part) < 7:
+            days.add(int(part))
+        else:
+            raise ValueError("Unknown weekday %r" % part)
+    return ",".join(str(day) for day in sorted(days))
+
+
+def parse_exceptions(text: Optional[str]) -> frozenset[date]:
+    """The skipped dates of a series, from their stored form."""
+    return frozenset(date.fromisoformat(part) for part in
+        (text or "").split(",") if part)
+
+
+def check_series(frequency: str, interval: Optional[int],
+        weekdays: Optional[str], exceptions: Optional[str]) -> None:
+    """check_series
+
+    Check the recurrence fields of a series, as they are stored.
+
+    Args:
+        frequency: One of FREQUENCIES.
+        interval: Every how many days or weeks, at least 1. None is 1.
+        weekdays: Weekday numbers, as returned by `parse_weekdays`. 
+            Only weekly series have them.
+        exceptions: Skipped dates, as read by `parse_exceptions`.
+
+    Raises:
+        ValueError: A field is not valid.
+    """
+    if frequency not in FREQUENCIES:
+        raise ValueError("Unknown frequency %r" % frequency)
+    if interval is not None and (not isinstance(interval, int) 
+            or isinstance(interval, bool) or interval < 1):
+        raise ValueError("The interval must be a whole number from 1 on, "
+            "not %r" % interval)
+    if weekdays and frequency != "weekly":
+        raise ValueError("Only weekly meetings repeat on weekdays")
+    for day in (weekdays or "").split(","):
+        if day and not (day.isdigit() and int(day) < 7):
+            raise ValueError("Unknown weekday %r in %r" % (day, weekdays))
+    try:
+        parse_exceptions(exceptions)
+    except (TypeError, ValueError):
+        raise ValueError("The exceptions %r are not ISO dates" 
+            % exceptions) from None
+
+
+def iter_occurrences(series: SeriesRecord,
+        after: Optional[datetime] = None) -> Iterator[datetime]:
+    """iter_occurrences
+
+    Generate the times of a series, in order, from `after` on. Dates
+    listed in the exceptions are skipped. Endless if the series has no
+    end date.
+
+    Args:
+        series: The series.
+        after: The first time that may be returned. Defaults to the
+            start of the series.
+
+    Yields:
+        datetime: The time of each occurrence.
+    """
+    start = series.start_time
+    after = max(after or start, start)
+    interval = max(series.interval or 1, 1)
+    exceptions = parse_exceptions(series.exceptions)
+
+    if series.frequency == "daily":
+        step = timedelta(days=interval)
+        # Skip to the first occurrence at or after `after`.
+        steps = -((start - after) // step)
+        occurrence = start + steps * step
+        while series.until is None or occurrence <= series.until:
+            if occurrence.date() not in exceptions:
+                yield occurrence
+            occurrence += step
+
+    elif series.frequency == "weekly":
+        weekdays = [int(day) for day in (series.weekdays or "").split(",")
+            if day] or [start.weekday()]
+        # Weeks are counted from the Monday of the first week.
+        first_monday = datetime.combine(start.date() - timedelta(
+            days=start.weekday()), start.time())
+        week = (after - first_monday) // timedelta(weeks=1)
+        week -= week % interval
+        while True:
+            monday = first_monday + timedelta(weeks=week)
+            for weekday in weekdays:
+                occurrence = monday + timedelta(days=weekday)
+                if series.until is not None and occurrence > series.until:
+                    return
+                if occurrence >= after \
+                        and occurrence.date() not in exceptions:
+                    yield occurrence
+            week += interval
+
+    else:
+        raise ValueError("Unknown frequency %r" % series.frequency)
+
+
+def iter_occurrence_records(series: SeriesRecord,
+        after: Optional[datetime] = None) -> Iterator[MeetingRecord]:
+    """Like `iter_occurrences`, but yields MeetingRecords."""
+    for occurrence in iter_occurrences(series, after):
+        yield MeetingRecord(series.id, series.mtg_provider, series.mtg_id,
+            series.mtg_password, occurrence, series.id)
+
+
+def merge_occurrences(series_list: Iterable[SeriesRecord], after: datetime,
+        end: Optional[datetime] = None, limit: Optional[int] = None
+        ) -> list[MeetingRecord]:
+    """merge_occurrences
+
+    The occurrences of many series, merged in time order. A series
+    whose occurrences cannot be generated, e.g. because of a bad field
+    written by an older version, is logged and left out.
+
+    Args:
+        series_list: The series.
+        after: The first time that may be returned.
+        end: Only occurrences before this time are returned.
+        limit: The most occurrences returned.
+
+    Returns:
+        list: MeetingRecords, ordered by time.
+    """
+    merged = heapq.merge(*(_skip_if_broken(series, after)
+        for series in series_list), key=lambda mtg: (mtg.mtg_time, mtg.id))
+    if end is not None:
+        # The merge is ordered, so it can stop at the first one after.
+        merged = _take_until(merged, end)
+    return list(islice(merged, limit))
+
+
+def _skip_if_broken(series: SeriesRecord,
+        after: Optional[datetime]) -> Iterator[MeetingRecord]:
+    """`iter_occurrence_records`, ending with an error logged if the
+    series is broken."""
+    try:
+        yield from iter_occurrence_records(series, after)
+    except (TypeError, ValueError, OverflowError):
+        logger.error("Skipping the broken recurring meeting %s", series.id,
+            exc_info=True)
+
+
+def _take_until(records: Iterator[MeetingRecord],
+        end: datetime) -> Iterator[MeetingRecord]:
+    """Yield records until one is at or after `end`."""
+    for mtg in records:
+        if mtg.mtg_time >= end:
+            return
+        yield mtg
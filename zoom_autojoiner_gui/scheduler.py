@@ -0,0 +1,165 @@
+# This file is part of Zoom Autojoiner GUI.
+
+# Zoom Autojoiner GUI is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# Zoom Autojoiner GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with Zoom Autojoiner GUI.  If not, see <https://www.gnu.org/licenses/>.
+
+import heapq
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Optional
+
+from zoom_autojoiner_gui.controllers import DatabaseHandler
+from zoom_autojoiner_gui.hooks import HOOKS
+from zoom_autojoiner_gui.models import MeetingRecord
+
+
+logger = logging.getLogger(__name__)
+
+
+class MeetingScheduler():
+    """MeetingScheduler
+
+    Keeps the upcoming meetings in a min-heap keyed on the meeting time,
+    so that finding the next meeting is a peek and not a table scan. The
+    owner of the scheduler sleeps for `seconds_until_next` seconds, then
+    calls `pop_due` to get the meetings that have to be joined.
+
+    The heap is only rebuilt when `reload` is called, i.e. when a
+    meeting is added, edited or deleted, and when the loaded batch has
+    been used up. Only the next `batch_size` meetings are read, through
+    the mtg_time index, merged with the next occurrences of the 
+    recurring meetings, which are generated.
+
+    Args:
+        dbh: The DatabaseHandler to load meetings from.
+        grace:
+            A meeting that started less than `grace` seconds ago is
+            still joined. Defaults to 60, the old one minute window.
+        batch_size: How many upcoming meetings to load at once.
+    """
+
+    #: float : Longest time (in seconds) the owner should sleep at once.
+    #: Keeps the scheduler honest if the system clock jumps.
+    MAX_SLEEP: float = 300.0
+
+    def __init__(self, dbh: DatabaseHandler, grace: float = 60,
+            batch_size: int = 64) -> None:
+        self.__dbh = dbh
+        self.grace = timedelta(seconds=grace)
+        self.batch_size = batch_size
+
+        # Whether the last reload read every upcoming meeting
+        self.__exhausted = True
+
+        # Heap of (mtg_time, record id, series id or 0, meeting)
+        self.__heap: list[tuple[datetime, int, int, MeetingRecord]] = []
+
+        # (series id, record id, mtg_time) of meetings already handed 
+        # out, so that a reload inside the grace window does not join 
+        # them again.
+        self.__fired: set[tuple[Optional[int], int, datetime]] = set()
+
+        self.__lock = threading.Lock()
+
+    def reload(self, now: Optional[datetime] = None) -> None:
+        """reload
+
+        Rebuild the heap from the database. Call this whenever meetings
+        are added, edited or deleted.
+
+        Args:
+            now: The current time. Defaults to datetime.now().
+        """
+        now = now or datetime.now()
+        cutoff = now - self.grace
+        # Fired meetings are still in the table, so ask for enough rows
+        # to fill the batch after skipping them.
+        limit = self.batch_size + len(self.__fired)
+        mtgs = self.__dbh.get_next_occurrences(cutoff, limit)
+        heap = []
+        for mtg in mtgs:
+            if (mtg.series_id, mtg.id, mtg.mtg_time) not in self.__fired:
+                heap.append((mtg.mtg_time, mtg.id, mtg.series_id or 0, mtg))
+        heapq.heapify(heap)
+
+        with self.__lock:
+            self.__heap = heap
+            self.__exhausted = len(mtgs) < limit
+            # Forget meetings that can no longer be due.
+            self.__fired = {key for key in self.__fired if key[2] >= cutoff}
+
+        logger.debug("Scheduler reloaded, %d upcoming meeting(s)", len(heap))
+
+    def next_due(self) -> Optional[datetime]:
+        """next_due
+
+        Get the time of the next meeting.
+
+        Returns:
+            The datetime of the next meeting, or None if there is none.
+        """
+        with self.__lock:
+            return self.__heap[0][0] if self.__heap else None
+
+    def seconds_until_next(self, now: Optional[datetime] = None
+            ) -> Optional[float]:
+        """seconds_until_next
+
+        Get how long the owner can sleep before the next meeting.
+
+        Args:
+            now: The current time. Defaults to datetime.now().
+
+        Returns:
+            Seconds to sleep (never negative, capped at MAX_SLEEP), or
+            None if there are no upcoming meetings.
+        """
+        next_time = self.next_due()
+        if next_time is None:
+            return None
+        delay = (next_time - (now or datetime.now())).total_seconds()
+        return min(max(delay, 0.0), self.MAX_SLEEP)
+
+    def pop_due(self, now: Optional[datetime] = None) -> list[MeetingRecord]:
+        """pop_due
+
+        Remove and return every meeting that is due, emitting the
+        meeting_due hook for each.
+
+        Args:
+            now: The current time. Defaults to datetime.now().
+
+        Returns:
+            The list of due MeetingRecords, earliest first.
+        """
+        now = now or datetime.now()
+        cutoff = now - self.grace
+        due = []
+        with self.__lock:
+            while self.__heap and self.__heap[0][0] <= now:
+                mtg_time, rec_id, _, mtg = heapq.heappop(self.__heap)
+                self.__fired.add((mtg.series_id, rec_id, mtg_time))
+                if mtg_time >= cutoff:
+                    due.append(mtg)
+                else:
+                    logger.warning("Skipping meeting %d, it is more than %s"
+                        " late", rec_id, self.grace)
+            refill = not self.__heap and not self.__exhausted
+
+        for mtg in due:
+            HOOKS.emit("meeting_due", meeting=mtg)
+        if refill:
+            # The batch is used up, but the table has more meetings.
+            self.reload(now)
+        return due
@@ -0,0 +1,157 @@
+# This file is part of Zoom Autojoiner GUI.
+
+# Zoom Autojoiner GUI is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# Zoom Autojoiner GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with Zoom Autojoiner GUI.  If not, see <https://www.gnu.org/licenses/>.
+
+import sys
+import time
+import logging
+import importlib.util
+from types import ModuleType
+from typing import Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class _MissingModule(ModuleType):
+    """Stands in for a lazily imported module that is not installed.
+
+    Raises ImportError when used, not when imported, so that code which
+    never needs the module keeps working.
+    """
+    def __getattr__(self, attr: str):
+        raise ImportError("No module named %r" % self.__name__)
+
+
+def lazy_import(name: str) -> ModuleType:
+    """lazy_import
+
+    Import a module on first attribute access instead of now. Used for
+    heavy modules, like pyautogui and Pillow, that are only needed when
+    a meeting is joined.
+
+    Args:
+        name: The full name of the module.
+
+    Returns:
+        The module, which is loaded when it is first used.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    try:
+        spec = importlib.util.find_spec(name)
+    except ImportError:
+        spec = None
+    if spec is None:
+        return _MissingModule(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+class StartupTimer():
+    """StartupTimer
+
+    Records how long each phase of the start-up took, counted from the
+    import of the package, and checks the time to the first paint
+    against a budget.
+
+    Attributes:
+        report_requested:
+            Whether the report should be printed when start-up is done
+            (the ``--startup-report`` command line flag).
+    """
+    def __init__(self) -> None:
+        self.start = time.perf_counter()
+        self.marks: list[tuple[str, float]] = []
+        self.report_requested = False
+        self.finished = False
+
+    def mark(self, phase: str) -> float:
+        """mark
+
+        Record that a phase has ended.
+
+        Args:
+            phase: The name of the phase.
+
+        Returns:
+            float: Seconds since the package was imported.
+        """
+        elapsed = time.perf_counter() - self.start
+        self.marks.append((phase, elapsed))
+        logger.debug("Startup - %s at %.1f ms", phase, elapsed * 1000)
+        return elapsed
+
+    def elapsed(self, phase: str) -> Optional[float]:
+        """elapsed
+
+        Args:
+            phase: The name of the phase.
+
+        Returns:
+            Seconds from the import of the package to the end of the
+            phase, or None if it was not recorded.
+        """
+        for name, elapsed in self.marks:
+            if name == phase:
+                return elapsed
+        return None
+
+    def report(self) -> str:
+        """report
+
+        Returns:
+            str: A table of the phases and their times.
+        """
+        lines = ["Startup time report", "%-32s %10s %10s" % ("phase",
+            "at (ms)", "took (ms)")]
+        previous = 0.0
+        for name, elapsed in self.marks:
+            lines.append("%-32s %10.1f %10.1f" % (name, elapsed * 1000,
+                (elapsed - previous) * 1000))
+            previous = elapsed
+        return "\n".join(lines)
+
+    def finish(self, budget_ms: Optional[float] = None) -> None:
+        """finish
+
+        End start-up: log the report, print it if it was requested, and
+        warn if the first paint was later than the budget.
+
+        Args:
+            budget_ms: The first paint budget, in milliseconds.
+        """
+        if self.finished:
+            return
+        self.finished = True
+        self.mark("startup finished")
+
+        report = self.report()
+        logger.info(report)
+        if self.report_requested:
+            print(report, file=sys.stderr)
+
+        first_paint = self.elapsed("first paint")
+        if budget_ms and first_paint is not None \
+                and first_paint * 1000 > budget_ms:
+            logger.warning("Startup - first paint took %.1f ms, over the "
+                "%.0f ms budget", first_paint * 1000, budget_ms)
+
+
+#: StartupTimer : The timer of this process.
+TIMER = StartupTimer()
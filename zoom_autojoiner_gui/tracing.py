@@ -0,0 +1,259 @@
+# This file is part of Zoom Autojoiner GUI.
+
+# Zoom Autojoiner GUI is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# Zoom Autojoiner GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with Zoom Autojoiner GUI.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Join traces
+
+Every join is recorded as a JoinTrace: when each step started and
+ended, how long was spent looking for each image, where it was found,
+and the error that ended the join, if any. The last traces are kept on
+disk in a TraceRing, and
+
+    python -m zoom_autojoiner_gui --join-report
+
+prints the p50 and p95 of every step across them.
+"""
+
+import os
+import json
+import math
+import time
+import logging
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Iterator, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class JoinTrace():
+    """JoinTrace
+
+    The trace of one join. Times are in seconds from the start of the
+    join.
+
+    Args:
+        mtg_id: The meeting being joined.
+    """
+    def __init__(self, mtg_id: str) -> None:
+        self.mtg_id = mtg_id
+        self.started = datetime.now()
+        self.steps: list[dict[str, Any]] = []
+        self.ok: Optional[bool] = None
+        self.error: Optional[str] = None
+        self.__start = time.perf_counter()
+        self.__current: Optional[dict[str, Any]] = None
+
+    def now(self) -> float:
+        """Seconds since the start of the join."""
+        return time.perf_counter() - self.__start
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[dict[str, Any]]:
+        """step
+
+        Context manager that records one step. An exception raised in
+        it is recorded as the step's error, and re-raised.
+
+        Args:
+            name: The name of the step.
+
+        Yields:
+            dict: The step's record.
+        """
+        record = {"name" : name, "start" : self.now(), "end" : None,
+            "locates" : [], "error" : None}
+        self.steps.append(record)
+        self.__current = record
+        try:
+            yield record
+        except BaseException as e:
+            record["error"] = "%s: %s" % (type(e).__name__, e)
+            raise
+        finally:
+            record["end"] = self.now()
+            self.__current = None
+
+    def record_locate(self, image: str, seconds: float, attempts: int,
+            box: Optional[tuple]) -> None:
+        """record_locate
+
+        Record a search for an image in the current step.
+
+        Args:
+            image: The file name of the image.
+            seconds: The time spent looking for it, without the sleeps
+                between attempts.
+            attempts: How many screenshots were searched.
+            box: Where it was found, as (left, top, width, height), or
+                None if it was not.
+        """
+        if self.__current is not None:
+            self.__current["locates"].append({"image" : image,
+                "seconds" : seconds, "attempts" : attempts,
+                "box" : list(box) if box is not None else None})
+
+    def finish(self, ok: bool, error: Optional[BaseException] = None
+            ) -> None:
+        """Record the result of the join."""
+        self.ok = ok
+        if error is not None:
+            self.error = "%s: %s" % (type(error).__name__, error)
+
+    def to_dict(self) -> dict[str, Any]:
+        """The trace as JSON-compatible data."""
+        return {"mtg_id" : self.mtg_id,
+            "started" : self.started.isoformat(), "ok" : self.ok,
+            "error" : self.error, "duration" : self.now(),
+            "steps" : self.steps}
+
+
+class TraceRing():
+    """TraceRing
+
+    Keeps the last `capacity` traces on disk, one JSON file per slot
+    in `directory`. Writing a trace replaces the oldest one, so the
+    ring never grows.
+
+    Args:
+        directory: Where the slot files are kept.
+        capacity: How many traces are kept.
+    """
+    def __init__(self, directory: str, capacity: int = 100) -> None:
+        self.directory = directory
+        self.capacity = max(capacity, 1)
+        self.__sequence: Optional[int] = None # Of the last trace written
+
+    def __slot_path(self, slot: int) -> str:
+        """The file of a slot."""
+        return os.path.join(self.directory, "trace-%04d.json" % slot)
+
+    def __last_sequence(self) -> int:
+        """The sequence number of the newest trace on disk, or -1."""
+        if self.__sequence is None:
+            self.__sequence = max((trace.get("sequence", -1) for trace
+                in self.load()), default=-1)
+        return self.__sequence
+
+    def append(self, trace: JoinTrace) -> None:
+        """append
+
+        Write a trace to the next slot, atomically.
+
+        Args:
+            trace: The trace.
+        """
+        sequence = self.__last_sequence() + 1
+        data = trace.to_dict()
+        data["sequence"] = sequence
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.__slot_path(sequence % self.capacity)
+        with open(path + ".tmp", "w") as file_handle:
+            json.dump(data, file_handle)
+        os.replace(path + ".tmp", path)
+        self.__sequence = sequence
+
+    def load(self) -> list[dict[str, Any]]:
+        """load
+
+        Returns:
+            list: The last `capacity` traces on disk, as dicts, oldest
+            first. Unreadable slots are skipped.
+        """
+        traces = []
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        for name in names:
+            if not (name.startswith("trace-") and name.endswith(".json")):
+                continue
+            try:
+                with open(os.path.join(self.directory, name), "r"
+                        ) as file_handle:
+                    traces.append(json.load(file_handle))
+            except:
+                logger.warning("Skipping unreadable join trace %s", name,
+                    exc_info=True)
+        traces.sort(key=lambda trace: trace.get("sequence", -1))
+        return traces[-self.capacity:]
+
+
+def percentile(values: list[float], q: float) -> Optional[float]:
+    """The nearest-rank percentile `q` (0 to 1) of `values`."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(max(math.ceil(q * len(ordered)) - 1, 0),
+        len(ordered) - 1)]
+
+
+def step_report(traces: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """step_report
+
+    Summarise the steps of many traces.
+
+    Args:
+        traces: Traces, as returned by TraceRing.load.
+
+    Returns:
+        list: One dict per step, in the order the steps run: name,
+        count, errors, and the p50 and p95 of the step's duration and
+        of its time spent locating images, in seconds.
+    """
+    steps: dict[str, dict[str, list]] = {}
+    for trace in traces:
+        for step in trace.get("steps", []):
+            if step.get("end") is None:
+                continue
+            record = steps.setdefault(step["name"], {"durations" : [],
+                "locates" : [], "errors" : []})
+            record["durations"].append(step["end"] - step["start"])
+            record["locates"].append(sum(locate["seconds"]
+                for locate in step.get("locates", [])))
+            if step.get("error"):
+                record["errors"].append(step["error"])
+    return [{"name" : name, "count" : len(record["durations"]),
+        "errors" : len(record["errors"]),
+        "p50" : percentile(record["durations"], 0.5),
+        "p95" : percentile(record["durations"], 0.95),
+        "locate_p50" : percentile(record["locates"], 0.5),
+        "locate_p95" : percentile(record["locates"], 0.95)}
+        for name, record in steps.items()]
+
+
+def format_report(traces: list[dict[str, Any]]) -> str:
+    """format_report
+
+    Args:
+        traces: Traces, as returned by TraceRing.load.
+
+    Returns:
+        str: The step report as a table, with the join success rate.
+    """
+    if not traces:
+        return "No joins have been traced yet."
+    joined = sum(1 for trace in traces if trace.get("ok"))
+    totals = [trace["duration"] for trace in traces if "duration" in trace]
+    lines = ["%d joins, %d succeeded; total p50 %.2f s, p95 %.2f s" % (
+        len(traces), joined, percentile(totals, 0.5) or 0.0,
+        percentile(totals, 0.95) or 0.0), "",
+        "%-20s %5s %6s %9s %9s %10s %10s" % ("step", "n", "errors",
+            "p50 (s)", "p95 (s)", "locate p50", "locate p95")]
+    for row in step_report(traces):
+        lines.append("%-20s %5d %6d %9.3f %9.3f %10.3f %10.3f" % (
+            row["name"], row["count"], row["errors"], row["p50"],
+            row["p95"], row["locate_p50"], row["locate_p95"]))
+    return "\n".join(lines)
@@ -13,27 +13,39 @@
 # You should have received a copy of the GNU General Public License
 # along with Zoom Autojoiner GUI.  If not, see <https://www.gnu.org/licenses/>.
 
-import time
+import os
+import json
+import queue
+import heapq
+import bisect
+import operator
 import logging
 import datetime
+import threading
 import tkinter as tk
 import tkinter.font as tkFont
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 from tkinter import N, S, E, W
-from typing import Callable
+from typing import Callable, Optional
 
 from zoom_autojoiner_gui.constants import (
     ICON_FILE, 
     THEME_FILE, 
     DB_URL, 
+    DB_SYNC_INTERVAL,
     PYAG_PICS_DIR,
-    EXTENSIONS
+    EXTENSIONS,
+    STARTUP_BUDGET_MS
 )
 from zoom_autojoiner_gui.controllers import (
     TkinterTheme,
     DatabaseHandler,
-    Autojoiner
+    Autojoiner,
+    JoinWorker
 )
+from zoom_autojoiner_gui.models import MeetingRecord
+from zoom_autojoiner_gui.scheduler import MeetingScheduler
+from zoom_autojoiner_gui.importexport import MeetingImporter, MeetingExporter
 from zoom_autojoiner_gui.dialogs import (
     NewMeetingDialog,
     EditMeetingDialog
@@ -42,6 +54,9 @@ from zoom_autojoiner_gui.extensions import (
     load_extensions,
     ExtensionHandler
 )
+from zoom_autojoiner_gui import setup_process
+from zoom_autojoiner_gui.startup import TIMER
+from zoom_autojoiner_gui.metrics import REGISTRY, SCHEDULER_TICK, TABLE_RENDER
 
 
 logger = logging.getLogger(__name__)
@@ -89,6 +104,10 @@ class ApplicationMenuBar(tk.Menu):
                             self.launch_add_meeting_dialog()],
                     # ["Edit Meeting", None, None, None],
                     # ["Delete Meeting", None, None, None],
+                    ["Import Meetings…", lambda: self.launch_import_dialog(),
+                        None, None],
+                    ["Export Meetings…", lambda: self.launch_export_dialog(),
+                        None, None],
                     ],
                 ],
                 ])
@@ -164,12 +183,131 @@ class ApplicationMenuBar(tk.Menu):
             tk_frame_handle=self.__meeting_list_frame)
         # root.mainloop()
 
+    #: list : File types offered by the import and export dialogs.
+    TRANSFER_FILE_TYPES = [
+        ("CSV files", "*.csv"),
+        ("JSON files", "*.json"),
+        ("JSON Lines files", "*.jsonl"),
+        ("iCalendar files", "*.ics"),
+    ]
+
+    #: int : How often (ms) the progress of an import or export is read.
+    PROGRESS_INTERVAL = 250
+
+    def launch_import_dialog(self) -> None:
+        """launch_import_dialog
+
+        Ask for a file and import its meetings in one transaction, in 
+        the background.
+        """
+        filename = filedialog.askopenfilename(parent=self.root_element,
+            title="Import Meetings", filetypes=self.TRANSFER_FILE_TYPES + 
+                [("All files", "*.*")])
+        if not filename:
+            return
+
+        def done(result: dict) -> None:
+            message = "%d meeting(s) imported." % result["imported"]
+            if result["failed"]:
+                message += "\n%d row(s) skipped, for example:\n%s" % (
+                    result["failed"], "\n".join("Row %d: %s" % error 
+                        for error in result["errors"][:5]))
+            messagebox.showinfo("Information", message)
+
+        self.run_transfer("Importing Meetings", lambda progress: 
+            MeetingImporter(DatabaseHandler(DB_URL), progress=progress
+            ).import_file(filename), done)
+
+    def launch_export_dialog(self) -> None:
+        """launch_export_dialog
+
+        Ask for a file name and export all meetings to it, in the 
+        background.
+        """
+        filename = filedialog.asksaveasfilename(parent=self.root_element,
+            title="Export Meetings", defaultextension=".csv",
+            filetypes=self.TRANSFER_FILE_TYPES)
+        if not filename:
+            return
+        self.run_transfer("Exporting Meetings", lambda progress: 
+            MeetingExporter(DatabaseHandler(DB_URL), progress=progress
+            ).export_file(filename), lambda count: messagebox.showinfo(
+            "Information", "%d meeting(s) exported." % count))
+
+    def run_transfer(self, title: str, work: Callable, 
+            done: Callable) -> None:
+        """run_transfer
+
+        Run an import or export on a worker thread, so the window stays
+        responsive, and show its progress in a small window. Tk widgets
+        must not be touched from the worker thread, so the progress is 
+        put on a queue, which is read here with `after`, as for the 
+        JoinWorker.
+
+        Args:
+            title: The title of the progress window.
+            work: Called on the worker thread as ``work(progress)``, 
+                where ``progress(rows, errors)`` reports progress.
+            done: Called on the Tk thread with what `work` returned.
+        """
+        events = queue.Queue() # (event, value, errors)
+        window = tk.Toplevel(self.root_element)
+        window.title(title)
+        window.transient(self.root_element)
+        window.resizable(False, False)
+        label = ttk.Label(window, text="Starting…", width=40, padding=10)
+        label.pack()
+        self.root_element.config(cursor="watch")
+
+        def run() -> None:
+            try:
+                events.put(("done", work(lambda rows, errors: 
+                    events.put(("progress", rows, errors))), None))
+            except Exception as e:
+                logger.error("%s failed", title, exc_info=True)
+                events.put(("failed", e, None))
+
+        def show_progress() -> None:
+            try:
+                while True:
+                    event, value, errors = events.get_nowait()
+                    if event == "progress":
+                        label["text"] = "%d row(s) done, %d skipped" % (
+                            value, errors)
+                        continue
+                    window.destroy()
+                    self.root_element.config(cursor="")
+                    if event == "done":
+                        done(value)
+                    else:
+                        messagebox.showerror("Error", ("An exception has "
+                            "occured.\nError Details:\n%s") % (str(value)))
+                    return
+            except queue.Empty:
+                pass
+            self.root_element.after(self.PROGRESS_INTERVAL, show_progress)
+
+        threading.Thread(target=run, name="MeetingTransfer", 
+            daemon=True).start()
+        self.root_element.after(self.PROGRESS_INTERVAL, show_progress)
+
 
 class MeetingListFrame(tk.Frame):
     """MeetingListFrame
         
     This class creates the frame that displays 
     the list of meetings.
+
+    The table is virtualized: only the rows that fit in the frame have
+    widgets, and these are recycled as the user scrolls. Rendering
+    costs the same for ten meetings or ten thousand.
+
+    The frame listens to DatabaseHandler changes and patches only the
+    changed row into its list, keeping it sorted by meeting time.
+
+    Recurring meetings are shown as their occurrences in the next
+    SERIES_DAYS days, which are generated when the table is loaded and
+    again every SERIES_REFRESH ms, as the window moves on.
     
     Args:
         root_element:
@@ -179,16 +317,56 @@ class MeetingListFrame(tk.Frame):
         autojoiner_handle:
             The Autojoiner object used for Join 
             Meeting buttons.
+        join_worker:
+            The JoinWorker that runs the Join Meeting buttons in the
+            background. If not given, joins block the window.
+        dbh:
+            The DatabaseHandler to read meetings from. Defaults to one
+            for DB_URL.
+        defer_load:
+            Show the meetings saved at the last load instead of reading
+            the database. The owner calls `populate_table_from_db` once
+            the window has been painted.
+        snapshot_file:
+            Where the meeting list is saved for a fast start-up. 
+            Defaults to SNAPSHOT_FILE; None neither reads nor writes a
+            snapshot.
     """
-    __components = []        # TK/TTK widgets
-    __current_table_row = 1  # Current row of the table
+
+    #: list : The column headers of the table.
+    COLUMN_HEADERS = ["Meeting Start Time", "Meeting ID", "Meeting Password",
+        "Join Meeting", "Edit/Delete Meeting"]
+
+    #: int : Rows shown before the frame knows its real height.
+    INITIAL_ROWS = 10
+
+    #: int : Days of occurrences of recurring meetings shown.
+    SERIES_DAYS = 14
+
+    #: int : How often (ms) the occurrences are generated again.
+    SERIES_REFRESH = 60 * 60 * 1000
+
+    #: str : Where the meeting list is saved for a fast start-up, by
+    #: default.
+    SNAPSHOT_FILE = os.path.join("cache", "meetings.json")
+
+    #: int : The most meetings kept in the snapshot.
+    SNAPSHOT_ROWS = 5000
+
+    #: int : How long (ms) after a change the snapshot is saved again.
+    SNAPSHOT_DELAY = 10 * 1000
+
     def __init__(self, root_element: tk.Tk, 
             tk_theme_object: TkinterTheme = None, 
-            autojoiner_handle: Autojoiner = None) -> None:
+            autojoiner_handle: Autojoiner = None,
+            join_worker: JoinWorker = None,
+            dbh: DatabaseHandler = None,
+            defer_load: bool = False,
+            snapshot_file: Optional[str] = SNAPSHOT_FILE) -> None:
         super().__init__(root_element)
 
-        #: We create a Database Handler here.
-        self.__dbh = DatabaseHandler(DB_URL)
+        #: We create a Database Handler here, unless one is given.
+        self.__dbh = dbh or DatabaseHandler(DB_URL)
 
         self.root_element = root_element #: The root element.
 
@@ -205,22 +383,42 @@ class MeetingListFrame(tk.Frame):
         else:
             self.__autojoiner_handle = Autojoiner(PYAG_PICS_DIR)
 
-        # Sticky grid that resizes according to window size.
-        # tk.Grid.rowconfigure(root_element, row, weight=1)
-        # tk.Grid.columnconfigure(root_element, column, weight=1)
+        self.__join_worker = join_worker
+        self.snapshot_file = snapshot_file
+        self.__from_snapshot = False  # Shown rows have no passcodes
+        self.__snapshot_pending = False
 
-        # Grid
-        # self.grid(row=row, column=column, sticky=N+S+E+W)
+        self.__components = []   # TK/TTK widgets
+        self.__meetings = []     # Meeting dicts, sorted by time and ID
+        self.__meetings_by_id = {} # Meetings (not occurrences), by ID
+        self.__row_pool = []     # Widgets of each table row, for reuse
+        self.__visible_rows = self.INITIAL_ROWS
+        self.__first_row = 0     # Index of the meeting in the top row
+        self.__render_pending = False
 
         # Widgets
-        # for i in range(0, 10):
-        #     for j in range(0, 10):
-        #         self.create_ttk_button("Row:%d Column:%d" % (i, j), i, j)
-        self.create_column_headers(["Meeting Start Time", "Meeting ID", 
-                "Meeting Password", "Join Meeting", "Edit/Delete Meeting"])
+        self.create_column_headers(self.COLUMN_HEADERS)
+        self.__scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, 
+            command=self.yview)
+        self.__scrollbar.grid(row=1, column=len(self.COLUMN_HEADERS), 
+            rowspan=self.INITIAL_ROWS, sticky=N+S)
+
+        # Resize and scroll
+        self.bind("<Configure>", self.__on_configure)
+        self.__bind_mousewheel(self)
+
+        # Apply meeting changes as they are committed
+        DatabaseHandler.add_change_listener(self.apply_change)
+        self.bind("<Destroy>", lambda event: \
+            DatabaseHandler.remove_change_listener(self.apply_change))
 
         # Populate table
-        self.populate_table_from_db()
+        if defer_load:
+            self.load_snapshot()
+        else:
+            self.populate_table_from_db()
+        self.after(self.SERIES_REFRESH, 
+            self.__refresh_occurrences_periodically)
 
     def __stickify(self, row: int = 0, column: int = 0) -> None:
         """Auto resize the TK widget according to window size
@@ -261,7 +459,6 @@ class MeetingListFrame(tk.Frame):
         # Append to component list and return index
         self.__components.append(btn)
         return self.__components[-1]
-        # return len(self.__components) - 1
 
     def create_tk_label(self, text: str, row: int = 0, column: int = 0, 
             sticky :str = N+S+E+W, stickify: bool = True, 
@@ -292,7 +489,37 @@ class MeetingListFrame(tk.Frame):
         # Append to component list and return index
         self.__components.append(lbl)
         return self.__components[-1]
-        # return len(self.__components) - 1
+
+    def create_ttk_label(self, text: str, row: int = 0, column: int = 0, 
+            sticky :str = N+S+E+W, stickify: bool = True, 
+            style: str = "") -> ttk.Label:
+        """create_ttk_label
+        
+        Creates a TTK Label and adds resizing capability.
+        
+        Args:
+            text: Text of the TTK label.
+            row: The row in the TK grid system
+            column: The column in TK grid.
+            sticky: TK's sticky attribute
+            stickify:
+                Make the width adjust to that of parent container.
+            style: The name of a style in the theme.
+
+        Returns:
+            The TTK Label object, for further manipulation.
+        """
+        # Auto resize
+        if stickify: self.__stickify(row, column)
+
+        # Create component
+        lbl = ttk.Label(self, text=text, style=self.tk_theme.style(style, 
+            self) if style else "")
+        lbl.grid(row=row, column=column, sticky=sticky)
+
+        # Append to component list and return index
+        self.__components.append(lbl)
+        return self.__components[-1]
 
     # Table populating functions:
     def create_column_headers(self, col_headers: list) -> int:
@@ -308,8 +535,8 @@ class MeetingListFrame(tk.Frame):
         """
         col_no = 0
         for col_header in col_headers:
-            theme_dict = self.tk_theme.get_styling("table_header")
-            self.create_tk_label(col_header, column = col_no, **theme_dict)
+            self.create_ttk_label(col_header, column = col_no, 
+                style="table_header")
             col_no += 1
 
         return col_no
@@ -318,7 +545,8 @@ class MeetingListFrame(tk.Frame):
                          meeting_id: str, meeting_password: str) -> None:
         """create_table_row
         
-        Creates a row for the table.
+        Adds a row to the table, in time order. Widgets are only made 
+        for rows that are visible.
         
         Args:
             record_id: The ID in database. Used for edit meeting dialog.
@@ -329,19 +557,298 @@ class MeetingListFrame(tk.Frame):
         Returns:
             Nothing.
         """
-        row_no = self.__current_table_row
-        styling = self.tk_theme.get_styling("table_content")
-        self.create_tk_label(meeting_time.strftime("%a %d %B %Y %I:%M:%S %p"),
-            row=row_no, column=0, **styling)
-        self.create_tk_label(meeting_id, row=row_no, column=1, **styling)
-        self.create_tk_label(meeting_password, row=row_no, column=2, **styling)
-        self.create_ttk_button("Join meeting", row=row_no, column=3, 
-            command=lambda: self.__autojoiner_handle.join_zm_mtg(meeting_id,
-                meeting_password))
-        self.create_ttk_button("Edit/Delete meeting", row=row_no, column=4, 
-            command=lambda: EditMeetingDialog(record_id, tk_root_element = \
-                self.root_element, tk_frame_handle=self))
-        self.__current_table_row += 1
+        self.upsert_row(MeetingRecord(record_id, None, meeting_id, 
+            meeting_password, meeting_time))
+
+    def __create_pool_row(self, pool_index: int) -> list:
+        """Create the widgets of one recyclable table row.
+
+        The buttons look up their meeting when clicked, so scrolling
+        only has to change the label texts.
+        """
+        row_no = pool_index + 1 # Row 0 has the headers
+        widgets = [
+            self.create_ttk_label("", row=row_no, column=0, stickify=False,
+                style="table_content"),
+            self.create_ttk_label("", row=row_no, column=1, stickify=False,
+                style="table_content"),
+            self.create_ttk_label("", row=row_no, column=2, stickify=False,
+                style="table_content"),
+            self.create_ttk_button("Join meeting", row=row_no, column=3, 
+                stickify=False, command=lambda: self.__on_join(pool_index)),
+            self.create_ttk_button("Edit/Delete meeting", row=row_no, 
+                column=4, stickify=False, 
+                command=lambda: self.__on_edit(pool_index)),
+        ]
+        for widget in widgets:
+            self.__bind_mousewheel(widget)
+        return widgets
+
+    def __meeting_at(self, pool_index: int) -> dict:
+        """Get the meeting shown in a pooled row, or None."""
+        index = self.__first_row + pool_index
+        if index < len(self.__meetings):
+            return self.__meetings[index]
+        return None
+
+    def __on_join(self, pool_index: int) -> None:
+        """Join meeting button of a pooled row."""
+        mtg = self.__meeting_at(pool_index)
+        if mtg and self.__from_snapshot:
+            # The snapshot has no passcodes; read the database now.
+            key = (mtg.id, mtg.series_id, mtg.mtg_time)
+            self.populate_table_from_db()
+            mtg = next((row for row in self.__meetings 
+                if (row.id, row.series_id, row.mtg_time) == key), None)
+        if mtg:
+            self.join_meeting(mtg.mtg_id, mtg.mtg_password)
+
+    def __on_edit(self, pool_index: int) -> None:
+        """Edit/Delete meeting button of a pooled row."""
+        mtg = self.__meeting_at(pool_index)
+        if mtg and mtg.series_id is not None:
+            self.edit_occurrence(mtg)
+        elif mtg:
+            EditMeetingDialog(mtg.id, tk_root_element = self.root_element,
+                tk_frame_handle=self)
+
+    def edit_occurrence(self, mtg: MeetingRecord) -> None:
+        """edit_occurrence
+
+        Ask whether to skip an occurrence of a recurring meeting, or to
+        delete the whole series.
+
+        Args:
+            mtg: The occurrence.
+        """
+        answer = messagebox.askyesnocancel("Recurring meeting", 
+            "This meeting repeats. Skip only the meeting on %s?\n\n"
+            "Yes: skip this one\nNo: delete every meeting of the series"
+            % mtg.mtg_time.strftime("%a %d %B %Y"), parent=self)
+        try:
+            if answer:
+                self.__dbh.skip_occurrence(mtg.series_id, 
+                    mtg.mtg_time.date())
+            elif answer is not None and messagebox.askokcancel(
+                    "Recurring meeting", "Delete every meeting of the "
+                    "series?", parent=self):
+                self.__dbh.delete_series(mtg.series_id)
+        except Exception as e:
+            messagebox.showerror("Error", 
+                "An exception has occured.\nError Details:\n%s" % (str(e)))
+
+    def join_meeting(self, meeting_id: str, meeting_password: str) -> None:
+        """join_meeting
+
+        Join a meeting, on the join worker if there is one.
+
+        Args:
+            meeting_id: The ID of the meeting.
+            meeting_password: The meeting password.
+        """
+        if self.__join_worker:
+            self.__join_worker.submit(meeting_id, meeting_password)
+        else:
+            self.__autojoiner_handle.join_zm_mtg(meeting_id, meeting_password)
+
+    # Virtualization
+    def schedule_render(self) -> None:
+        """schedule_render
+
+        Render the visible rows when Tk is idle. Many changes in a row
+        cause only one render.
+        """
+        if not self.__render_pending:
+            self.__render_pending = True
+            self.after_idle(self.render)
+
+    def render(self) -> None:
+        """render
+
+        Show the meetings from `first_row` onwards in the pooled rows,
+        creating rows when the frame has grown and hiding the ones that
+        are not needed.
+        """
+        with TABLE_RENDER.time():
+            self.__render()
+
+    def __render(self) -> None:
+        """The body of `render`."""
+        self.__render_pending = False
+
+        # Keep the top row in range
+        max_first = max(len(self.__meetings) - self.__visible_rows, 0)
+        self.__first_row = min(max(self.__first_row, 0), max_first)
+
+        while len(self.__row_pool) < self.__visible_rows:
+            self.__row_pool.append(self.__create_pool_row(
+                len(self.__row_pool)))
+
+        for pool_index, widgets in enumerate(self.__row_pool):
+            mtg = None
+            if pool_index < self.__visible_rows:
+                mtg = self.__meeting_at(pool_index)
+            if mtg is None:
+                for widget in widgets:
+                    widget.grid_remove()
+                continue
+
+            texts = (mtg.mtg_time.strftime("%a %d %B %Y %I:%M:%S %p"),
+                mtg.mtg_id, mtg.mtg_password)
+            for widget, text in zip(widgets, texts):
+                if widget["text"] != text:
+                    widget["text"] = text
+            for widget in widgets:
+                widget.grid()
+
+        # Scrollbar
+        self.__scrollbar.grid_configure(rowspan=max(self.__visible_rows, 1))
+        if self.__meetings:
+            total = len(self.__meetings)
+            self.__scrollbar.set(self.__first_row / total, 
+                min(self.__first_row + self.__visible_rows, total) / total)
+        else:
+            self.__scrollbar.set(0.0, 1.0)
+
+    def yview(self, *args) -> None:
+        """yview
+
+        Scroll the table. Takes the arguments of a Tk scrollbar command,
+        i.e. ("moveto", fraction) or ("scroll", number, "units"/"pages").
+        """
+        if not args:
+            return
+        if args[0] == "moveto":
+            self.__first_row = int(float(args[1]) * len(self.__meetings))
+        elif args[0] == "scroll":
+            step = self.__visible_rows if args[2] == "pages" else 1
+            self.__first_row += int(args[1]) * step
+        self.render()
+
+    def __on_mousewheel(self, event: tk.Event) -> None:
+        """Scroll the table with the mouse wheel."""
+        if event.num == 4 or event.delta > 0:
+            self.yview("scroll", -1, "units")
+        else:
+            self.yview("scroll", 1, "units")
+
+    def __bind_mousewheel(self, widget: tk.Widget) -> None:
+        """Scroll the table when the mouse wheel turns over a widget."""
+        widget.bind("<MouseWheel>", self.__on_mousewheel) # Windows, macOS
+        widget.bind("<Button-4>", self.__on_mousewheel)   # X11
+        widget.bind("<Button-5>", self.__on_mousewheel)
+
+    def __on_configure(self, event: tk.Event) -> None:
+        """Fit the number of pooled rows to the frame's height."""
+        header_height = self.__components[0].winfo_reqheight()
+        if self.__row_pool:
+            row_height = max(widget.winfo_reqheight() 
+                for widget in self.__row_pool[0])
+        else:
+            row_height = header_height
+        visible_rows = max((event.height - header_height) 
+            // max(row_height, 1), 1)
+        if visible_rows != self.__visible_rows:
+            self.__visible_rows = visible_rows
+            self.schedule_render()
+
+    # Incremental updates
+    #: The order of the table: by meeting time, then record ID.
+    __sort_key = staticmethod(operator.attrgetter("mtg_time", "id"))
+
+    def upsert_row(self, mtg: MeetingRecord) -> None:
+        """upsert_row
+
+        Insert a meeting into the table, or patch it if it is already
+        there, keeping the table sorted.
+
+        Args:
+            mtg: The meeting, as given by DatabaseHandler.
+        """
+        self.remove_row(mtg.id)
+        bisect.insort(self.__meetings, mtg, key=self.__sort_key)
+        self.__meetings_by_id[mtg.id] = mtg
+        self.schedule_render()
+
+    def remove_row(self, record_id: int) -> None:
+        """remove_row
+
+        Remove a meeting from the table, if it is there.
+
+        Args:
+            record_id: The ID of the meeting in the database.
+        """
+        mtg = self.__meetings_by_id.pop(record_id, None)
+        if mtg is None:
+            return
+        key = self.__sort_key(mtg)
+        index = bisect.bisect_left(self.__meetings, key, key=self.__sort_key)
+        # An occurrence may have the same time and ID.
+        while index < len(self.__meetings) and self.__meetings[index] \
+                is not mtg and self.__sort_key(self.__meetings[index]) == key:
+            index += 1
+        if index == len(self.__meetings) or self.__meetings[index] is not mtg:
+            # The list is out of order; look for the row the slow way.
+            index = next((index for index, row in enumerate(self.__meetings)
+                if row is mtg), None)
+            if index is None:
+                return
+        del self.__meetings[index]
+        self.schedule_render()
+
+    def __get_occurrences(self) -> list:
+        """The occurrences of recurring meetings to show."""
+        now = datetime.datetime.now()
+        return self.__dbh.get_occurrences_between(now, now + 
+            datetime.timedelta(days=self.SERIES_DAYS))
+
+    def refresh_occurrences(self) -> None:
+        """refresh_occurrences
+
+        Generate the occurrences of the recurring meetings again, e.g.
+        when a series was changed. The other meetings are kept.
+        """
+        try:
+            occurrences = self.__get_occurrences()
+        except:
+            logger.error("Failed to load recurring meetings", exc_info=True)
+            return
+        self.__meetings = list(heapq.merge((mtg for mtg in self.__meetings
+            if mtg.series_id is None), occurrences, key=self.__sort_key))
+        self.schedule_render()
+        self.schedule_snapshot()
+
+    def __refresh_occurrences_periodically(self) -> None:
+        """Move the window of occurrences on, every SERIES_REFRESH ms."""
+        self.refresh_occurrences()
+        self.after(self.SERIES_REFRESH, 
+            self.__refresh_occurrences_periodically)
+
+    def apply_change(self, action: str, record_id: int) -> None:
+        """apply_change
+
+        DatabaseHandler change listener. Applies a single change to the
+        table instead of reloading all of it.
+
+        Args:
+            action: "add", "update", "delete" or "truncate".
+            record_id: The ID of the meeting in the database.
+        """
+        if action in ("add", "update"):
+            try:
+                self.upsert_row(self.__dbh.get_single_mtg_data_to_list(
+                    record_id))
+            except:
+                logger.error("Failed to load meeting %s, reloading table",
+                    record_id, exc_info=True)
+                self.reload_table()
+        elif action == "delete":
+            self.remove_row(record_id)
+        elif DatabaseHandler.is_series_action(action):
+            self.refresh_occurrences()
+        else:
+            self.reload_table()
+        self.schedule_snapshot()
 
     # Controller/View Interface
     def populate_table_from_db(self) -> None:
@@ -352,9 +859,11 @@ class MeetingListFrame(tk.Frame):
         try:
             # logger.info("Attempting to load meeting data from DB...")
             meetings = self.__dbh.get_mtg_data_to_list()
-            for mtg in meetings:
-                self.create_table_row(mtg["id"], mtg["mtg_time"], 
-                    mtg["mtg_id"], mtg["mtg_password"])
+            self.__meetings_by_id = {mtg.id: mtg for mtg in meetings}
+            self.__meetings = list(heapq.merge(meetings, 
+                self.__get_occurrences(), key=self.__sort_key))
+            self.__from_snapshot = False
+            self.save_snapshot()
         except Exception as e:
             logger.error("Failed to load meeting data, exiting...", 
                 exc_info=True)
@@ -363,19 +872,79 @@ class MeetingListFrame(tk.Frame):
             exit(1)
         else:
             logger.info("Loaded meeting data successfully.")
+        self.schedule_render()
+
+    def load_snapshot(self) -> None:
+        """load_snapshot
+
+        Show the meetings saved by `save_snapshot`, without touching 
+        the database. Does nothing if there is no snapshot. The 
+        passcodes are not saved; they are shown once the database has
+        been read.
+        """
+        self.__meetings = []
+        try:
+            if self.snapshot_file:
+                with open(self.snapshot_file, "r") as file_handle:
+                    rows = json.load(file_handle)
+                self.__meetings = [MeetingRecord(row[0], row[1], row[2],
+                    "", datetime.datetime.fromisoformat(row[3]),
+                    *row[4:]) for row in rows]
+                self.__from_snapshot = bool(self.__meetings)
+        except FileNotFoundError:
+            pass
+        except:
+            logger.warning("Failed to load the meeting list snapshot",
+                exc_info=True)
+        self.__meetings_by_id = {mtg.id: mtg for mtg in self.__meetings
+            if mtg.series_id is None}
+        self.schedule_render()
+
+    def save_snapshot(self) -> None:
+        """save_snapshot
+
+        Save the first SNAPSHOT_ROWS meetings, so that the next start
+        can show them before the database is read. The table saves it
+        after each load from the database, and `SNAPSHOT_DELAY` ms after
+        a change. Passcodes are left out, and only the user can read 
+        the file.
+        """
+        self.__snapshot_pending = False
+        if not self.snapshot_file or self.__from_snapshot:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.snapshot_file) or ".", 
+                exist_ok=True)
+            rows = [(mtg.id, mtg.mtg_provider, mtg.mtg_id,
+                mtg.mtg_time.isoformat(), mtg.series_id) 
+                for mtg in self.__meetings[:self.SNAPSHOT_ROWS]]
+            temp_file = self.snapshot_file + ".tmp"
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+            with open(os.open(temp_file, os.O_WRONLY | os.O_CREAT 
+                    | os.O_EXCL, 0o600), "w") as file_handle:
+                json.dump(rows, file_handle, separators=(",", ":"))
+            os.replace(temp_file, self.snapshot_file)
+        except:
+            logger.warning("Failed to save the meeting list snapshot",
+                exc_info=True)
+
+    def schedule_snapshot(self) -> None:
+        """schedule_snapshot
+
+        Save the snapshot `SNAPSHOT_DELAY` ms from now, unless a save is
+        already due, so that a burst of changes is saved once.
+        """
+        if self.snapshot_file and not self.__snapshot_pending:
+            self.__snapshot_pending = True
+            self.after(self.SNAPSHOT_DELAY, self.save_snapshot)
 
     def reload_table(self) -> None:
         """reload_table
 
-        Reload and rebuilt the TK Table by calling the 
-        applicable functions.
+        Reload the table data from the database. The row widgets are 
+        kept and reused.
         """
-        for cell in self.winfo_children():
-            cell.destroy()
-        self.create_column_headers(["Meeting Start Time", "Meeting ID", 
-            "Meeting Password", "Join Meeting", "Edit/Delete Meeting"])
-
-        # Populate table
         self.populate_table_from_db()
 
 
@@ -383,14 +952,36 @@ class ApplicationStatusBar(tk.Label):
     """ApplicationStatusBar
     
     Status bar is used for iteration tasks, for example, to find out if
-    it is time to join the meeting.
+    it is time to join the meeting. It sleeps until the next meeting
+    is due, as told by the MeetingScheduler, and re-arms itself when
+    meetings are added, edited or deleted.
     
+    Meetings are joined on a JoinWorker, whose progress the status bar
+    shows. The worker's progress queue is only read while it is busy.
+
+    Double-clicking it shows the metrics of the process.
+
     Args:
         root_element: the MainWindow compatible Tk class.
         autojoiner_handle: The Autojoiner class to use.
+        join_worker: The JoinWorker to join meetings with.
+        defer: Do not read the database until `rearm` is called.
     """
+
+    #: int : How often (ms) to read the join worker's progress.
+    PROGRESS_INTERVAL: int = 250
+
+    #: float : Load the automation libraries this many seconds before a
+    #: meeting.
+    WARM_UP_LEAD: float = 120.0
+
+    #: int : How often (ms) the metrics window is refreshed.
+    METRICS_INTERVAL: int = 2000
+
     def __init__(self, root_element: tk.Tk, 
-            autojoiner_handle: Autojoiner = None) -> None:
+            autojoiner_handle: Autojoiner = None,
+            join_worker: JoinWorker = None,
+            defer: bool = False) -> None:
         super().__init__(root_element, text="Loading…", bd=1, 
             relief=tk.SUNKEN, anchor=W)
 
@@ -401,7 +992,113 @@ class ApplicationStatusBar(tk.Label):
             # Create one if not supplied
             self.__autojoiner_handle = Autojoiner(PYAG_PICS_DIR)
 
-        self.iterator()
+        # Join worker
+        if join_worker:
+            self.__join_worker = join_worker
+        else:
+            self.__join_worker = JoinWorker(self.__autojoiner_handle)
+        self.__progress_after_id = None
+        self.__join_worker.add_submit_listener(self.watch_join_worker)
+
+        # Scheduler
+        self.__scheduler = MeetingScheduler(DatabaseHandler(DB_URL))
+        self.__after_id = None # ID of the pending `after` callback
+        self.__warmed_up = False # Whether the join worker was warmed up
+
+        # Re-arm when meetings change, and stop listening when destroyed.
+        DatabaseHandler.add_change_listener(self.on_meetings_changed)
+        self.bind("<Destroy>", lambda event: \
+            DatabaseHandler.remove_change_listener(self.on_meetings_changed))
+
+        self.__metrics_window = None
+        self.bind("<Double-Button-1>", lambda event: self.show_metrics())
+
+        if not defer:
+            self.rearm()
+
+    def show_metrics(self) -> None:
+        """show_metrics
+
+        Open a window with the summary of the metrics, refreshed every
+        METRICS_INTERVAL ms while it is open.
+        """
+        if self.__metrics_window is not None \
+                and self.__metrics_window.winfo_exists():
+            self.__metrics_window.lift()
+            return
+        window = self.__metrics_window = tk.Toplevel(self)
+        window.title("Metrics")
+        text = tk.Text(window, width=100, height=24, wrap="none")
+        text.pack(fill="both", expand=True)
+
+        def refresh() -> None:
+            if not window.winfo_exists():
+                return
+            text.configure(state="normal")
+            text.delete("1.0", "end")
+            text.insert("end", REGISTRY.summary())
+            text.configure(state="disabled")
+            window.after(self.METRICS_INTERVAL, refresh)
+
+        refresh()
+
+    def on_meetings_changed(self, action: str, record_id: int) -> None:
+        """on_meetings_changed
+
+        DatabaseHandler change listener. Re-arms the scheduler.
+
+        Args:
+            action: What happened to the meeting.
+            record_id: The ID of the meeting in the database.
+        """
+        logger.debug("Status Bar - Meeting %s: %s", record_id, action)
+        self.rearm()
+
+    def rearm(self) -> None:
+        """rearm
+
+        Reload the scheduler from the database and sleep until the
+        next meeting.
+        """
+        try:
+            self.__scheduler.reload()
+        except:
+            logger.error("Status Bar - Failed to load meetings", 
+                exc_info=True)
+        self.schedule_next()
+
+    def schedule_next(self) -> None:
+        """schedule_next
+
+        Cancel the pending wake-up, if any, and sleep until the next
+        meeting is due.
+        """
+        if self.__after_id is not None:
+            self.after_cancel(self.__after_id)
+            self.__after_id = None
+
+        delay = self.__scheduler.seconds_until_next()
+        if delay is not None and not self.__warmed_up:
+            # Wake up in time to warm up the join worker.
+            seconds_left = (self.__scheduler.next_due() 
+                - datetime.datetime.now()).total_seconds()
+            if seconds_left > self.WARM_UP_LEAD:
+                delay = min(delay, seconds_left - self.WARM_UP_LEAD)
+        if delay is None:
+            # Nothing to wait for, a change will re-arm us.
+            self["text"] = "Running - no upcoming meetings"
+            return
+
+        next_due = self.__scheduler.next_due()
+        self["text"] = "Running - next meeting at %s" % (
+            next_due.strftime("%a %d %B %Y %I:%M:%S %p"))
+
+        # Load the automation libraries ahead of the first join.
+        seconds_left = (next_due - datetime.datetime.now()).total_seconds()
+        if not self.__warmed_up and seconds_left <= self.WARM_UP_LEAD:
+            self.__warmed_up = True
+            self.__join_worker.warm_up()
+        self.__after_id = self.after(int(delay * 1000), self.iterator)
 
     def check_for_meeting(self) -> None:
         """check_for_meeting
@@ -409,46 +1106,86 @@ class ApplicationStatusBar(tk.Label):
         Check for meetings. If there is one now, join.
         Or else just continue.
         """
-        if self.__autojoiner_handle.check_for_meeting():
-            logger.info("Status Bar - Meeting now.")
-            self["text"] = ("There is a meeting now. Zoom Autojoiner is"
-                " initiating the joining process.")
-            mtg_id = self.__autojoiner_handle.check_for_meeting()["mtg_id"]
-            mtg_pw = self.__autojoiner_handle.check_for_meeting()["mtg_password"]
-            self["text"] = ("There is a meeting now. Zoom Autojoiner has "
-                "initiated the joining process.")
-            logger.info("Status Bar - Joining Meeting")
-            self.__autojoiner_handle.join_zm_mtg(mtg_id, mtg_pw)
-            self["text"] = ("Zoom Autojoiner has finished the joining "
-                "process. There will be a pause for 60 seconds now.")
-            logger.info("Status Bar - Sleeping")
-
-            # This line causes the program to hang. However, it prevents
-            # the Autojoiner to rejoin the meeting repeatedly.
-            time.sleep(60)
+        for mtg in self.__scheduler.pop_due():
+            logger.info("Status Bar - Meeting now. Queueing join.")
+            self.__join_worker.submit(mtg.mtg_id, mtg.mtg_password)
+
+    def watch_join_worker(self) -> None:
+        """watch_join_worker
+
+        Start reading the join worker's progress, if not already.
+        """
+        if self.__progress_after_id is None:
+            self.__progress_after_id = self.after(self.PROGRESS_INTERVAL,
+                self.show_join_progress)
+
+    def show_join_progress(self) -> None:
+        """show_join_progress
+
+        Show the join worker's progress in the status bar. Runs on the
+        Tk thread and re-schedules itself while the worker is busy.
+        """
+        self.__progress_after_id = None
+        try:
+            while True:
+                event, mtg_id, ok = self.__join_worker.progress.get_nowait()
+                if event == "queued":
+                    self["text"] = ("Meeting %s is waiting to be joined."
+                        % mtg_id)
+                elif event == "started":
+                    logger.info("Status Bar - Joining Meeting")
+                    self["text"] = ("There is a meeting now. Zoom "
+                        "Autojoiner has initiated the joining process.")
+                elif ok:
+                    self["text"] = ("Zoom Autojoiner has finished the "
+                        "joining process.")
+                else:
+                    self["text"] = ("Zoom Autojoiner could not join "
+                        "meeting %s. See the log for details." % mtg_id)
+        except queue.Empty:
+            pass
+
+        if self.__join_worker.is_busy():
+            self.watch_join_worker()
 
     def iterator(self) -> None:
         """iterator
 
-        The iterator checks for meetings every 10 seconds.
-        It calls the `check_for_meeting` method to find if
-        a meeting is present.
+        Called by Tk when the next meeting is due. It calls the 
+        `check_for_meeting` method to join the due meetings, and then
+        sleeps until the next one.
         """
-        logger.info("Status Bar - Iterating")
-        self["text"] = "Checking for meeting"
-        self.check_for_meeting()
-        self["text"] = "Running"
-        self.after(10000, self.iterator)
-        #          ^ Todo - let this value be set in config file.
+        self.__after_id = None
+        logger.info("Status Bar - Woke up")
+        with SCHEDULER_TICK.time(mode="gui"):
+            self.check_for_meeting()
+            self.schedule_next()
 
 
 class MainWindow(tk.Tk):
+    # How often the Tk thread runs the calls queued by other threads, in
+    # milliseconds.
+    TK_CALLS_INTERVAL = 100
+
     def __init__(self, *args, **kwargs):
+        # Scripts that build the window directly skip main().
+        setup_process()
         super().__init__(*args, **kwargs)
 
+        TIMER.mark("Tk initialised")
+
+        # Meeting changes made on other threads (imports, extension 
+        # hooks) reach the change listeners on the Tk thread, which 
+        # polls for them.
+        self.__tk_calls = queue.SimpleQueue()
+        DatabaseHandler.set_listener_thread(self.call_on_tk_thread)
+        self.after(self.TK_CALLS_INTERVAL, self.__poll_tk_calls)
+        self.bind("<Destroy>", self.__on_destroy, add="+")
+
         # Object instances
         self.__tk_theme = TkinterTheme(THEME_FILE)           # TK Styling object
         self.__autojoiner_handle = Autojoiner(PYAG_PICS_DIR) # Autojoiner handler
+        self.__join_worker = JoinWorker(self.__autojoiner_handle) # Joins meetings
 
         # Window Titles
         self.title('Zoom Autojoiner')
@@ -461,13 +1198,16 @@ class MainWindow(tk.Tk):
         self.__menu_bar = ApplicationMenuBar(self)
 
         # Title
-        self.create_tk_label("Zoom AutoJoiner - My Meeting List", sticky=N+E+W,
-            stickify=False, **self.__tk_theme.get_styling("title"))
+        self.create_ttk_label("Zoom AutoJoiner - My Meeting List", sticky=N+E+W,
+            stickify=False, style="title")
         
         # Window Elements
         # Meetings List
+        # It shows the meetings saved at the last start, and reads the 
+        # database after the first paint.
         self.__meeting_list_frame = MeetingListFrame(self, self.__tk_theme, 
-            autojoiner_handle=self.__autojoiner_handle)
+            autojoiner_handle=self.__autojoiner_handle, 
+            join_worker=self.__join_worker, defer_load=True)
         # Elasticity
         tk.Grid.rowconfigure(self, 1, weight=1)
         tk.Grid.columnconfigure(self, 0, weight=1)
@@ -479,7 +1219,8 @@ class MainWindow(tk.Tk):
 
         # Statusbar
         self.__statusbar = ApplicationStatusBar(self, autojoiner_handle=
-            self.__autojoiner_handle)
+            self.__autojoiner_handle, join_worker=self.__join_worker,
+            defer=True)
         
         # Elasticity
         # tk.Grid.rowconfigure(self, 2, weight=1)
@@ -487,15 +1228,83 @@ class MainWindow(tk.Tk):
         # Positioning
         self.__statusbar.grid(row=2, column=0, sticky=N+S+E+W)
 
-        # load extensions
+        # Extensions are loaded after the first paint.
+        self.__ext_class = None
         if EXTENSIONS.getboolean("enabled"):
             # if extensions are enabled
             self.__ext_class = ExtensionHandler(EXTENSIONS)
-            if self.__ext_class.load_extensions():
-                self.__ext_class.give_extensions_prefs()
-                self.__ext_class.give_extensions_objects(self, self.__menu_bar,
-                    self.__meeting_list_frame)
-                self.__ext_class.run_extensions()
+
+        TIMER.mark("window built")
+
+        # Re-skin the window when the theme file is edited.
+        self.__tk_theme.watch(self)
+
+        # Read the database once the window is on the screen.
+        self.bind("<Map>", self.__on_first_map)
+
+    def call_on_tk_thread(self, call: Callable[[], None]) -> None:
+        """call_on_tk_thread
+
+        Run a callable on the Tk thread, soon. Safe to call from any 
+        thread: it only queues the call, and never touches Tk.
+
+        Args:
+            call: Called with no arguments.
+        """
+        self.__tk_calls.put(call)
+
+    def __poll_tk_calls(self) -> None:
+        """Run the queued calls, and poll again later."""
+        self.__run_tk_calls()
+        self.after(self.TK_CALLS_INTERVAL, self.__poll_tk_calls)
+
+    def __run_tk_calls(self) -> None:
+        """Run the callables queued by `call_on_tk_thread`."""
+        while True:
+            try:
+                call = self.__tk_calls.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                call()
+            except:
+                logger.error("Queued Tk call failed", exc_info=True)
+
+    def __on_destroy(self, event: tk.Event) -> None:
+        """Stop passing meeting changes to the destroyed window."""
+        if event.widget is self:
+            DatabaseHandler.set_listener_thread(None)
+
+    def __on_first_map(self, event: tk.Event) -> None:
+        """Mark the first paint and start the deferred work."""
+        if event.widget is not self or TIMER.elapsed("first paint"):
+            return
+        self.update_idletasks()
+        TIMER.mark("first paint")
+        self.after_idle(self.__deferred_init)
+
+    def __deferred_init(self) -> None:
+        """Work that can wait until the window is shown."""
+        self.__run_tk_calls()
+        self.__meeting_list_frame.populate_table_from_db()
+        self.__statusbar.rearm()
+        self.__sync_changes()
+        if self.__ext_class:
+            self.__ext_class.start(self, self, self.__menu_bar,
+                self.__meeting_list_frame)
+        TIMER.mark("meetings loaded")
+        TIMER.finish(STARTUP_BUDGET_MS)
+
+    def __sync_changes(self) -> None:
+        """Apply the changes other users made to the database, every
+        DB_SYNC_INTERVAL seconds."""
+        if DB_SYNC_INTERVAL <= 0:
+            return
+        try:
+            DatabaseHandler(DB_URL).sync_changes()
+        except:
+            logger.error("Failed to fetch meeting changes", exc_info=True)
+        self.after(int(DB_SYNC_INTERVAL * 1000), self.__sync_changes)
 
     def __stickify(self, row = 0, column = 0):
         """Auto resize the TK widget according to window size"""
@@ -511,6 +1320,18 @@ class MainWindow(tk.Tk):
         lbl = tk.Label(self, text=text, *args, **kwargs)
         lbl.grid(row=row, column=column, sticky=sticky)
 
+    def create_ttk_label(self, text, row = 0, column = 0, sticky=N+S+E+W, 
+            stickify=True, style=""):
+        """Creates a TTK Label, styled by the theme, and adds resizing 
+        capability."""
+        # Auto resize
+        if stickify: self.__stickify(row, column)
+
+        # Create component
+        lbl = ttk.Label(self, text=text, style=self.__tk_theme.style(style, 
+            self) if style else "")
+        lbl.grid(row=row, column=column, sticky=sticky)
+
 
 if __name__ == "__main__":
     try: